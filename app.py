@@ -1,28 +1,65 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-import pandas as pd
-import numpy as np
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 import os
-import joblib
 import io
 import logging
+import threading
 from src.config import Config
-from features.feature_engineering import engineer_enterprise_features
+from src.logging_config import configure_logging, sample_request_logs
+from src.model_registry import ModelRegistry, PRODUCTION_VERSION
+from src.cpu_budget import configure_threads
+from src.profiling import profile_requested
+
+# Cap BLAS / OpenMP pools before numpy or any model library is loaded, so
+# WEB_CONCURRENCY workers on one host split its cores instead of each taking all of them
+configure_threads("serving")
+
+# pandas, numpy, the feature/serving modules and the model's own library are imported on
+# first use (or by the background warm-up), keeping `import app` - and cold start - cheap.
+REQUEST_PATH_MODULES = ["pandas", "src.serving", "src.io_formats", "src.data_loader",
+                        "src.result_store", "features.feature_engineering"]
 
 # [PHASE: INSTITUTIONAL LOGGING]
-logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+# Queue-backed: disk writes happen on a background thread, never on the request path
+configure_logging(Config.API_LOG_PATH)
 logger = logging.getLogger("CHURNAI-API")
-# Add file handler for persistent debugging
-file_handler = logging.FileHandler("backend_debug.log")
-file_handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
-logger.addHandler(file_handler)
+
+def warm_up(precompute=None):
+    """
+    Imports the request-path modules and loads the champion bundle, then (`precompute`,
+    default PRECOMPUTE_SAMPLE_RESPONSE) scores the demo sample into the response cache.
+    """
+    if precompute is None:
+        precompute = Config.PRECOMPUTE_SAMPLE_RESPONSE
+    import importlib
+    for module in REQUEST_PATH_MODULES:
+        importlib.import_module(module)
+    bundle = get_bundle()
+    if bundle is not None:
+        bundle.get('pipeline')  # bundle directories load their payload on first access
+        if precompute and os.path.exists(Config.SAMPLE_DATA_PATH):
+            # The demo button is then answered straight from the response cache
+            import asyncio
+            asyncio.run(test_sample_data(top_n=None, x_model_version=PRODUCTION_VERSION,
+                                         accept=None, accept_encoding=None))
+            logger.info("🧪 Sample response precomputed.")
+
+@asynccontextmanager
+async def lifespan(app):
+    # The server accepts traffic immediately; heavy imports finish on a background thread
+    if Config.API_BACKGROUND_WARMUP:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
 
 app = FastAPI(
     title="ChurnAI: Customer Intelligence Platform",
     description="Advanced Customer Churn Prediction System with Machine Learning Analytics",
-    version="2.2.0"
+    version="2.2.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -32,15 +69,93 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-_BUNDLE = None
+# Champion plus any challenger bundles in models/registry, loaded lazily
+REGISTRY = ModelRegistry()
+
+# Scored uploads kept server-side for top-N responses and paginated follow-ups
+_RESULTS = None
+# Finished JSON responses by upload sha256 + model fingerprint (re-uploads and the demo sample)
+_RESPONSES = None
+_SAMPLE_DIGEST = None
+# Rows / upload bytes being scored, with the queue and shed counters behind /api/metrics
+_ADMISSION = None
+# Offline-scored customer table (python -m src.customer_store) behind /api/customers/{id}
+_CUSTOMERS = None
+# Churn segment cube behind /api/segments: the last customer-base snapshot plus production-model uploads
+_SEGMENTS = None
+
+def get_bundle(version=PRODUCTION_VERSION):
+    return REGISTRY.get(version)
 
-def get_bundle():
-    global _BUNDLE
-    bundle_path = os.path.join(Config.MODELS_DIR, "production_pipeline_bundle.joblib")
-    if not os.path.exists(bundle_path): return None
-    if _BUNDLE is None:
-        _BUNDLE = joblib.load(bundle_path)
-    return _BUNDLE
+def get_result_store():
+    global _RESULTS
+    if _RESULTS is None:
+        from src.result_store import ResultStore
+        _RESULTS = ResultStore()
+    return _RESULTS
+
+def get_admission():
+    global _ADMISSION
+    if _ADMISSION is None:
+        from src.admission import AdmissionController
+        _ADMISSION = AdmissionController()
+    return _ADMISSION
+
+def get_customer_store():
+    global _CUSTOMERS
+    if _CUSTOMERS is None:
+        from src.customer_store import CustomerStore
+        _CUSTOMERS = CustomerStore()
+    return _CUSTOMERS
+
+def get_segment_cube():
+    global _SEGMENTS
+    if _SEGMENTS is None:
+        from src.segment_cube import SegmentCube
+        _SEGMENTS = SegmentCube(Config.SEGMENT_CUBE_PATH)
+    _SEGMENTS.refresh()  # a stat call, unless a customer-base run wrote a new snapshot
+    return _SEGMENTS
+
+def get_response_cache():
+    global _RESPONSES
+    if _RESPONSES is None:
+        from src.response_cache import ResponseCache
+        _RESPONSES = ResponseCache()
+    return _RESPONSES
+
+def sample_digest():
+    global _SAMPLE_DIGEST
+    if _SAMPLE_DIGEST is None:
+        from src.response_cache import FileDigest
+        _SAMPLE_DIGEST = FileDigest(Config.SAMPLE_DATA_PATH)
+    return _SAMPLE_DIGEST.get()
+
+def _cached_response(key):
+    """The cached response for `key`, unless it points at a result set that has since expired."""
+    cache = get_response_cache()
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    if cached.result_id is not None and get_result_store().get(cached.result_id) is None:
+        cache.discard(key)
+        return None
+    return Response(content=cached.body, media_type="application/json", headers={"X-Cache": "hit"})
+
+@app.get("/api/models")
+def get_models():
+    """Loaded model versions, traffic split and champion/challenger shadow statistics."""
+    return REGISTRY.describe()
+
+@app.get("/api/metrics")
+def get_metrics():
+    """Admission control (in-flight rows/bytes, queue depth, shed counts) and cache occupancy."""
+    return {
+        "admission": get_admission().stats(),
+        "response_cache": get_response_cache().stats(),
+        "result_store": get_result_store().stats(),
+        "customer_store": get_customer_store().stats(),
+        "segment_cube": get_segment_cube().stats()
+    }
 
 @app.get("/api/stats")
 def get_stats():
@@ -52,7 +167,9 @@ def get_stats():
     try:
         sample_path = os.path.join("data", "raw", "Telco-Customer-Churn.csv")
         if os.path.exists(sample_path):
-            total_records = len(pd.read_csv(sample_path))
+            # Line count instead of a full parse: no pandas on the health-check path
+            with open(sample_path, "rb") as f:
+                total_records = sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b"")) - 1
     except:
         total_records = 7043 # Fallback
         
@@ -71,16 +188,31 @@ def get_stats():
     }
 
 @app.post("/api/test-sample")
-async def test_sample_data():
+async def test_sample_data(top_n: int | None = Query(default=None, ge=1, le=Config.RESULTS_MAX_PAGE_SIZE),
+                           x_model_version: str | None = Header(default=None),
+                           accept: str | None = Header(default=None), accept_encoding: str | None = Header(default=None)):
     """
     [POINT 3.0] TESTING FLOW: Run prediction on internal sample data.
     """
     try:
-        sample_path = os.path.join("data", "raw", "Telco-Customer-Churn.csv")
+        sample_path = Config.SAMPLE_DATA_PATH
         if not os.path.exists(sample_path):
-            logger.error(f"Sample file not found at {sample_path}")
+            logger.error("Sample file not found at %s", sample_path)
             raise HTTPException(status_code=404, detail="Sample dataset missing on server")
-            
+
+        try:
+            model_version = REGISTRY.route(x_model_version)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Unknown model version: {x_model_version}")
+
+        # Precomputed at warm-up (or by the previous click): no read, parse or scoring
+        from src.serving import negotiate
+        if negotiate(accept) == "json" and get_bundle(model_version) is not None:
+            from src.response_cache import cache_key
+            cached = _cached_response(cache_key(sample_digest(), REGISTRY.fingerprint(model_version), top_n))
+            if cached is not None:
+                return cached
+
         with open(sample_path, "rb") as f:
             file_content = f.read()
             
@@ -88,177 +220,299 @@ async def test_sample_data():
         from fastapi import UploadFile
         import io
         
-        mock_file = UploadFile(filename="Telco-Customer-Churn.csv", file=io.BytesIO(file_content))
-        return await predict_churn(mock_file)
+        mock_file = UploadFile(filename=os.path.basename(sample_path), file=io.BytesIO(file_content))
+        return await predict_churn(mock_file, top_n=top_n, x_model_version=model_version,
+                                   accept=accept, accept_encoding=accept_encoding, x_profile=None)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        logger.error(f"Sample Test Failed: {e}\n{error_details}")
+        logger.exception("Sample Test Failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Sample Test Failed: {str(e)}")
 
+def _after_stream(body, callback):
+    """Runs `callback` once a streamed body has been fully produced."""
+    yield from body
+    callback()
+
+def _release_after(body, ticket):
+    """Returns the admission budget when a stream ends, completed or not (client disconnects included)."""
+    try:
+        yield from body
+    finally:
+        get_admission().release(ticket)
+
+async def _admit(contents, upload_format):
+    """Admission ticket for scoring an upload, or 429 with Retry-After when shedding load."""
+    from src.admission import Overloaded, estimate_rows
+    rows = estimate_rows(contents, upload_format)
+    try:
+        return await get_admission().acquire(rows, len(contents))
+    except Overloaded as e:
+        logger.warning("Shedding upload of ~%d rows (%s); retry in %ds", rows, e.reason, e.retry_after)
+        raise HTTPException(status_code=429, detail=f"Server busy ({e.reason}). Please retry shortly.",
+                            headers={"Retry-After": str(e.retry_after)})
+
+def _read_csv_upload(contents):
+    """Robust CSV reading: tries common encodings and sniffs the delimiter."""
+    import pandas as pd
+    df = None
+    for enc in ['utf-8-sig', 'latin-1', 'cp1252']:
+        try:
+            df = pd.read_csv(io.BytesIO(contents), encoding=enc, sep=None, engine='python')
+            if len(df.columns) > 1:
+                logger.debug("Successfully read CSV with %s", enc)
+                break
+        except Exception as e:
+            logger.debug("Failed to read with %s: %s", enc, e)
+            continue
+
+    if df is None:
+        logger.error("Could not read CSV with any encoding")
+        df = pd.read_csv(io.BytesIO(contents))
+    return df
+
 @app.post("/api/predict")
-async def predict_churn(file: UploadFile = File(...)):
-    """Predict customer churn probability for uploaded CSV data."""
-    bundle = get_bundle()
+async def predict_churn(file: UploadFile = File(...),
+                        top_n: int | None = Query(default=None, ge=1, le=Config.RESULTS_MAX_PAGE_SIZE),
+                        x_model_version: str | None = Header(default=None),
+                        accept: str | None = Header(default=None), accept_encoding: str | None = Header(default=None),
+                        x_profile: str | None = Header(default=None)):
+    """
+    Predict customer churn probability for uploaded CSV (plain, gzip, zstd), Parquet or Arrow/Feather data.
+    `Accept: application/x-ndjson` or `application/vnd.apache.arrow.stream` streams the results instead.
+    `?top_n=N` keeps the scored rows server-side and returns only the N highest-risk ones plus a
+    `result_id` for /api/results pagination.
+    `X-Profile: <CHURNAI_PROFILE_TOKEN>` runs the request under the sampling profiler (outputs/reports/profiles).
+    """
+    from src.io_formats import SUPPORTED_EXTENSIONS
+    sample_request_logs()
+    try:
+        model_version = REGISTRY.route(x_model_version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {x_model_version}")
+    bundle = get_bundle(model_version)
     if not bundle: 
         raise HTTPException(
             status_code=503, 
             detail="Prediction model is currently unavailable. Please try again later."
         )
     
-    # Validate file type
-    if not file.filename.endswith('.csv'):
+    # Validate file type (the actual format is detected from the file's magic bytes)
+    if not file.filename.lower().endswith(SUPPORTED_EXTENSIONS):
         raise HTTPException(
             status_code=400,
-            detail="Invalid file format. Please upload a CSV file."
+            detail="Invalid file format. Please upload a CSV, Parquet, Arrow or Feather file."
         )
     
     try:
-        pipeline_data = get_bundle()
-        if not pipeline_data:
-            logger.error("Model bundle not found!")
-            raise HTTPException(status_code=503, detail="Model not loaded")
-        
-        pipeline = pipeline_data['pipeline']
+        pipeline = bundle['pipeline']
         contents = await file.read()
         
         if not contents:
             logger.error("Uploaded file is empty.")
             raise HTTPException(status_code=400, detail="Uploaded file is empty.")
 
-        logger.info(f"Processing file {file.filename}, size {len(contents)} bytes")
-
-        # Robust reading
-        df = None
-        for enc in ['utf-8-sig', 'latin-1', 'cp1252']:
-            try:
-                df = pd.read_csv(io.BytesIO(contents), encoding=enc, sep=None, engine='python')
-                if len(df.columns) > 1:
-                    logger.info(f"Successfully read CSV with {enc}")
-                    break
-            except Exception as e:
-                logger.debug(f"Failed to read with {enc}: {e}")
-                continue
-        
-        if df is None:
-            logger.error("Could not read CSV with any encoding")
-            df = pd.read_csv(io.BytesIO(contents))
-
-        # Extreme Cleaning
-        import re
-        def ultra_clean(c):
-            c = str(c).strip().strip('"').strip("'")
-            c = re.sub(r'^[^a-zA-Z0-9]+|[^a-zA-Z0-9]+$', '', c)
-            return c
-
-        df.columns = [ultra_clean(col) for col in df.columns]
-        found_cols = df.columns.tolist()
-        found_cols_lower = [c.lower() for c in found_cols]
-        logger.info(f"Sanitized columns: {found_cols}")
-
-        required_columns = [
-            'gender', 'SeniorCitizen', 'Partner', 'Dependents', 
-            'tenure', 'PhoneService', 'MultipleLines', 'InternetService', 
-            'OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 'TechSupport', 
-            'StreamingTV', 'StreamingMovies', 'Contract', 'PaperlessBilling', 
-            'PaymentMethod', 'MonthlyCharges', 'TotalCharges'
-        ]
+        # Identical bytes scored by the identical model: answer from the response cache
+        from src.response_cache import cache_key, upload_digest
+        from src.serving import negotiate
+        response_mode = negotiate(accept)
+        response_key = None
+        profile = profile_requested(x_profile)
+        if response_mode == "json":
+            response_key = cache_key(upload_digest(contents), REGISTRY.fingerprint(model_version), top_n)
+            # A profiled request always scores, so the profile shows the real work
+            cached = None if profile else _cached_response(response_key)
+            if cached is not None:
+                logger.info("Prediction served from cache (model %s).", model_version)
+                return cached
+
+        from src.data_loader import compact_frame
+        from src.io_formats import COLUMNAR_FORMATS, decompress, read_columnar, sniff_format
+        from src.serving import (
+            ARROW_MEDIA_TYPE, NDJSON_MEDIA_TYPE, SummaryAccumulator, dumps, gzip_stream, iter_arrow, iter_ndjson,
+            prediction_frame, prediction_records, score_chunks
+        )
+        from features.feature_engineering import engineer_enterprise_features
+
+        upload_format = sniff_format(contents[:8])
+        logger.debug("Processing file %s (%s), size %d bytes", file.filename, upload_format, len(contents))
+
+        # Parsing and scoring run on the threadpool, within the rows/bytes-in-flight budget
+        ticket = await _admit(contents, upload_format)
+        streamed = False
+
+        def score():
+            nonlocal streamed
+            required_columns = [
+                'gender', 'SeniorCitizen', 'Partner', 'Dependents', 
+                'tenure', 'PhoneService', 'MultipleLines', 'InternetService', 
+                'OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 'TechSupport', 
+                'StreamingTV', 'StreamingMovies', 'Contract', 'PaperlessBilling', 
+                'PaymentMethod', 'MonthlyCharges', 'TotalCharges'
+            ]
+
+            if upload_format in COLUMNAR_FORMATS:
+                # Zero-copy Arrow-backed frame with only the model's columns decoded
+                df = read_columnar(contents, upload_format, required_columns + ['customerID'])
+            else:
+                try:
+                    payload = decompress(contents, upload_format)
+                except (OSError, EOFError, ValueError) as e:
+                    raise HTTPException(status_code=400, detail=f"Could not decompress {upload_format} upload: {e}")
+                df = _read_csv_upload(payload)
+
+            # Extreme Cleaning
+            import re
+            def ultra_clean(c):
+                c = str(c).strip().strip('"').strip("'")
+                c = re.sub(r'^[^a-zA-Z0-9]+|[^a-zA-Z0-9]+$', '', c)
+                return c
+
+            df.columns = [ultra_clean(col) for col in df.columns]
+            found_cols = df.columns.tolist()
+            found_cols_lower = [c.lower() for c in found_cols]
+            logger.debug("Sanitized columns: %s", found_cols)
         
-        missing = [col for col in required_columns if col.lower() not in found_cols_lower]
+            missing = [col for col in required_columns if col.lower() not in found_cols_lower]
         
-        if missing:
-            err_msg = f"Columns Missing: {', '.join(missing)}"
-            logger.error(err_msg)
-            raise HTTPException(status_code=400, detail=err_msg)
+            if missing:
+                err_msg = f"Columns Missing: {', '.join(missing)}"
+                logger.error(err_msg)
+                raise HTTPException(status_code=400, detail=err_msg)
         
-        col_map = {c.lower(): c for c in found_cols}
-        if 'customerid' in col_map:
-            df = df.rename(columns={col_map['customerid']: 'customerID'})
+            col_map = {c.lower(): c for c in found_cols}
+            if 'customerid' in col_map:
+                df = df.rename(columns={col_map['customerid']: 'customerID'})
 
-        rename_map = {col_map[req.lower()]: req for req in required_columns}
-        df = df.rename(columns=rename_map)
-        
-        logger.info("Starting feature engineering...")
-        df_eng = engineer_enterprise_features(df)
-        
-        logger.info("Starting prediction...")
-        # Check if pipeline exists
-        if not hasattr(pipeline, 'predict_proba'):
-            logger.error("Pipeline does not have predict_proba method!")
-            raise Exception("Invalid model pipeline")
-
-        probs = pipeline.predict_proba(df_eng)[:, 1]
-        logger.info(f"Prediction successful for {len(probs)} records.")
+            # Segment analytics follow the champion only, and only for real customer IDs: generated
+            # ones (CUST-1000, ...) repeat across unrelated uploads
+            fold_segments = model_version == PRODUCTION_VERSION and 'customerid' in col_map
+
+            rename_map = {col_map[req.lower()]: req for req in required_columns}
+            df = compact_frame(df.rename(columns=rename_map))
         
-        # Risk classification
-        def classify_risk(p):
-            if p > 0.85: return {"level": "Critical", "timeframe": "Next 30 Days", "color": "red"}
-            elif p > 0.60: return {"level": "At-Risk", "timeframe": "2-4 Months", "color": "orange"}
-            elif p < 0.15: return {"level": "Loyal", "timeframe": "Strong Retention", "color": "green"}
-            else: return {"level": "Stable", "timeframe": "Baseline", "color": "yellow"}
-
-        results = df_eng.copy()
+            logger.debug("Starting feature engineering...")
+            df_eng = engineer_enterprise_features(df)
         
-        def explain_churn(row, p):
-            reasons = []
-            if row.get('Contract') == 'Month-to-month':
-                reasons.append("High-risk monthly contract")
-            if row.get('PaymentMethod') == 'Electronic check':
-                reasons.append("Unstable payment")
-            if row.get('MonthlyCharges', 0) > results['MonthlyCharges'].mean() * 1.2:
-                reasons.append("High charges")
-            if row.get('tenure', 0) < 6:
-                reasons.append("New customer risk")
-            
-            if not reasons: return "Stable profile"
-            return " + ".join(reasons[:2])
+            logger.debug("Starting prediction...")
+            # Check if pipeline exists
+            if not hasattr(pipeline, 'predict_proba'):
+                logger.error("Pipeline does not have predict_proba method!")
+                raise Exception("Invalid model pipeline")
 
-        results['churn_probability'] = (probs * 100).round(2)
-        results['risk_classification'] = [classify_risk(p) for p in probs]
-        results['risk_reason'] = [explain_churn(row, p) for row, p in zip(results.to_dict('records'), probs)]
-        
-        output_data = []
-        for _, row in results.iterrows():
-            risk_info = row['risk_classification']
-            output_data.append({
-                "customer_id": row['customerID'],
-                "tenure_months": row['tenure'],
-                "monthly_charges": float(row['MonthlyCharges']),
-                "churn_probability": float(row['churn_probability']),
-                "risk_level": risk_info['level'],
-                "risk_timeframe": risk_info['timeframe'],
-                "risk_color": risk_info['color'],
-                "primary_reason": row['risk_reason'],
-                "contract_type": row['Contract']
+            if response_mode != "json":
+                # Predictions go out chunk by chunk as they are scored; the summary closes the stream
+                summary = SummaryAccumulator()
+                chunks = score_chunks(df_eng, lambda part: REGISTRY.predict_proba(model_version, part), summary=summary)
+                if fold_segments:
+                    chunks = get_segment_cube().track(chunks, df_eng)
+                body_iter, media_type = (iter_ndjson, NDJSON_MEDIA_TYPE) if response_mode == "ndjson" else (iter_arrow, ARROW_MEDIA_TYPE)
+                body = _after_stream(body_iter(chunks, summary, {"model_version": model_version}),
+                                     lambda: REGISTRY.maybe_shadow(model_version, df_eng, summary.probs))
+                headers = {"X-Model-Version": model_version}
+                if "gzip" in (accept_encoding or "").lower():
+                    body = gzip_stream(body)
+                    headers["Content-Encoding"] = "gzip"
+                # The stream holds its admission budget until the last chunk is sent
+                streamed = True
+                return StreamingResponse(_release_after(body, ticket), media_type=media_type, headers=headers)
+
+            probs = REGISTRY.predict_proba(model_version, df_eng)
+            logger.info("Prediction successful for %d records (model %s).", len(probs), model_version)
+            # Challenger scores a sampled copy off the request path; the response never waits on it
+            REGISTRY.maybe_shadow(model_version, df_eng, probs)
+
+            # Vectorized risk tiers and reasons (src/serving.py), serialized straight to bytes
+            results = prediction_frame(df_eng, probs)
+            if fold_segments:
+                get_segment_cube().update(df_eng, results)
+            summary = SummaryAccumulator()
+            summary.update(results, probs)
+            if top_n:
+                stored = get_result_store().put(results, summary.result(), model_version)
+                first_page = stored.page(limit=top_n)
+                body = dumps({
+                    "model_version": model_version,
+                    "result_id": stored.result_id,
+                    "predictions": first_page["predictions"],
+                    "next_cursor": first_page["next_cursor"],
+                    "summary": stored.summary
+                })
+                get_response_cache().put(response_key, body, stored.result_id)
+                return Response(content=body, media_type="application/json")
+            body = dumps({
+                "model_version": model_version,
+                "predictions": prediction_records(results),
+                "summary": summary.result()
             })
-        
-        return {
-            "predictions": output_data, 
-            "summary": {
-                "total_customers": len(output_data),
-                "high_risk_count": sum(1 for item in output_data if item['risk_level'] == 'Critical'),
-                "medium_risk_count": sum(1 for item in output_data if item['risk_level'] == 'At-Risk'),
-                "stable_count": sum(1 for item in output_data if item['risk_level'] == 'Stable'),
-                "low_risk_count": sum(1 for item in output_data if item['risk_level'] == 'Loyal'),
-                "prediction_variance": float(np.var(probs)),
-                "average_probability": float(np.mean([item['churn_probability'] for item in output_data]))
-            }
-        }
+            get_response_cache().put(response_key, body)
+            return Response(content=body, media_type="application/json")
+
+        try:
+            if profile:
+                # Streamed bodies are produced after this returns: the profile covers parsing up to the first chunk
+                from src.profiling import profile_call
+                response, profiler = await run_in_threadpool(profile_call, "predict", score)
+                response.headers["X-Profile-Id"] = profiler.profile_id
+                return response
+            return await run_in_threadpool(score)
+        finally:
+            if not streamed:
+                get_admission().release(ticket)
         
     except HTTPException as he:
-        logger.error(f"HTTPException: {he.detail}")
+        logger.error("HTTPException: %s", he.detail)
         raise he
     except Exception as e:
-        logger.error(f"CRITICAL ERROR: {str(e)}")
-        import traceback
-        error_details = traceback.format_exc()
-        logger.error(error_details)
-        # Write to file explicitly in case logger fails
-        with open("backend_debug.log", "a") as f:
-            f.write(f"\n\nERROR AT {pd.Timestamp.now()}:\n{error_details}\n")
+        logger.exception("CRITICAL ERROR: %s", e)
         raise HTTPException(status_code=500, detail=f"Prediction Failed: {str(e)}")
 
+@app.get("/api/customers/{customer_id}")
+async def get_customer(customer_id: str):
+    """
+    A customer's current churn score, risk level and reason from the last offline scoring
+    run. A single indexed SQLite read (microseconds), so it runs on the event loop.
+    """
+    try:
+        customer = get_customer_store().lookup(customer_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=503,
+                            detail="Customer store not built yet. Run: python -m src.customer_store")
+    if customer is None:
+        raise HTTPException(status_code=404, detail=f"Customer '{customer_id}' is not in the scored customer base.")
+    return customer
+
+@app.get("/api/segments")
+def get_segments(group_by: str | None = Query(default=None, description="Comma-separated: contract, payment_method, tenure_bin, internet_service"),
+                 contract: str | None = None, payment_method: str | None = None,
+                 tenure_bin: str | None = None, internet_service: str | None = None):
+    """
+    Customer count, average churn probability and high-risk count per segment, read from
+    the in-memory segment cube (O(cells), independent of the number of customers).
+    """
+    dimensions = [name.strip() for name in (group_by or "").split(",") if name.strip()]
+    try:
+        return get_segment_cube().query(dimensions, contract=contract, payment_method=payment_method,
+                                        tenure_bin=tenure_bin, internet_service=internet_service)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/results/{result_id}")
+def get_results(result_id: str, cursor: str | None = None,
+                limit: int = Query(default=Config.RESULTS_PAGE_SIZE, ge=1, le=Config.RESULTS_MAX_PAGE_SIZE),
+                risk_level: str | None = None, contract: str | None = None, search: str | None = None):
+    """Next page of a stored result set, highest risk first, optionally filtered by risk level, contract or customer ID."""
+    from src.serving import dumps
+    stored = get_result_store().get(result_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Result set not found or expired. Please re-run the prediction.")
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    page = stored.page(cursor, limit, search=search, risk_level=risk_level, contract=contract)
+    page["summary"] = stored.summary
+    return Response(content=dumps(page), media_type="application/json")
+
 @app.get("/api/feature-importance")
 def get_feature_importance():
     """Get feature importance scores from the trained model."""
@@ -287,7 +541,7 @@ def get_feature_importance():
                     for i, feat in enumerate(base_features)
                 ]
         except Exception as e:
-            logger.warning(f"Failed to extract dynamic feature importance: {e}")
+            logger.warning("Failed to extract dynamic feature importance: %s", e)
 
     # Fallback to high-quality defaults
     return [
@@ -302,6 +556,7 @@ def get_benchmark():
     """Get model performance benchmark across different algorithms."""
     if os.path.exists(Config.BENCHMARK_REPORT_PATH):
         try:
+            import pandas as pd
             df = pd.read_csv(Config.BENCHMARK_REPORT_PATH)
             
             # Normalize column names: lowercase, replace spaces and hyphens with underscores
@@ -325,10 +580,10 @@ def get_benchmark():
             # Sort by ROC-AUC to ensure rank is correct
             df = df.sort_values(by="roc_auc", ascending=False)
             
-            return df.to_dict(orient="records")
+            # Columns a candidate has no value for (best_iteration, RSS of parallel runs) go out as null, not NaN
+            return df.astype(object).where(df.notna(), None).to_dict(orient="records")
         except Exception as e:
-            print(f"Error reading benchmark CSV: {e}")
-            pass
+            logger.warning("Error reading benchmark CSV: %s", e)
     
     # Default benchmark data if CSV fails or doesn't exist
     return [
@@ -0,0 +1,230 @@
+"""
+[PERFORMANCE: HTTP LOAD TEST HARNESS]
+Starts the API locally (or targets --url), replays a weighted request mix at a fixed
+concurrency and writes p50/p95/p99 latency, requests/s and peak server RSS as JSON.
+
+    python -m benchmarks.load_test --requests 500 --concurrency 8
+    python -m benchmarks.load_test --mix my_mix.json --compare outputs/reports/load_test_baseline.json
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.synthetic_data import stream_synthetic
+from src.perf_utils import (
+    latency_summary, peak_rss_mb, git_revision, write_report, load_report, find_regressions
+)
+
+# Weighted synthetic mix: small interactive uploads dominate, bulk uploads are rare.
+DEFAULT_MIX = [
+    {"name": "predict_10", "method": "POST", "path": "/api/predict", "rows": 10, "weight": 4},
+    {"name": "predict_500", "method": "POST", "path": "/api/predict", "rows": 500, "weight": 2},
+    {"name": "predict_5000", "method": "POST", "path": "/api/predict", "rows": 5000, "weight": 1},
+    {"name": "stats", "method": "GET", "path": "/api/stats", "weight": 4},
+    {"name": "benchmark", "method": "GET", "path": "/api/benchmark", "weight": 2},
+]
+
+
+def build_upload(rows, seed):
+    """Synthetic Telco-shaped upload of `rows` customers as CSV bytes."""
+    sample = pd.concat(stream_synthetic(rows, seed=seed), ignore_index=True)
+    return sample.to_csv(index=False, na_rep=" ").encode("utf-8")
+
+
+def _multipart(payload, filename="upload.csv"):
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    body.write(f"--{boundary}\r\n".encode())
+    body.write(f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode())
+    body.write(b"Content-Type: text/csv\r\n\r\n")
+    body.write(payload)
+    body.write(f"\r\n--{boundary}--\r\n".encode())
+    return body.getvalue(), f"multipart/form-data; boundary={boundary}"
+
+
+def prepare_requests(mix, total, seed):
+    """
+    Expands the mix into a deterministic, pre-encoded request schedule plus one warm-up
+    request per entry. Every synthetic upload (warm-up included) is generated with its own
+    seed: the API answers repeated bytes from its response cache, so identical uploads would
+    time cache lookups instead of parsing and scoring. `body_file` entries replay the same
+    bytes and are, after the warm-up, cache hits.
+    """
+    rng = random.Random(seed)
+    files = {}
+    for spec in mix:
+        if spec.get("body_file"):
+            with open(spec["body_file"], "rb") as f:
+                files[spec["name"]] = _multipart(f.read(), os.path.basename(spec["body_file"]))
+
+    def body(spec, index):
+        if spec.get("rows"):
+            return _multipart(build_upload(spec["rows"], seed + index))
+        return files.get(spec["name"])
+
+    weights = [spec.get("weight", 1) for spec in mix]
+    schedule = rng.choices(mix, weights=weights, k=total)
+    warm_up = [(spec, body(spec, total + i + 1)) for i, spec in enumerate(mix)]
+    return [(spec, body(spec, i + 1)) for i, spec in enumerate(schedule)], warm_up
+
+
+class _Client(threading.local):
+    """One keep-alive connection per worker thread."""
+
+    def __init__(self, host, port):
+        self.conn = http.client.HTTPConnection(host, port, timeout=120)
+
+
+def _send(client, spec, body):
+    headers = dict(spec.get("headers", {}))
+    payload = None
+    if body is not None:
+        payload, headers["Content-Type"] = body
+
+    start = time.perf_counter()
+    try:
+        client.conn.request(spec["method"], spec["path"], body=payload, headers=headers)
+        resp = client.conn.getresponse()
+        resp.read()
+        status = resp.status
+        cached = resp.getheader("X-Cache") == "hit"
+    except (OSError, http.client.HTTPException):
+        client.conn.close()
+        status, cached = 0, False
+    return spec["name"], status, time.perf_counter() - start, cached
+
+
+def start_server(port, workers=1, timeout=60):
+    cmd = [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+           "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=Config.BASE_DIR)
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/api/stats")
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError(f"API did not become ready on port {port} within {timeout}s")
+
+
+def run_load_test(url, mix, total, concurrency, seed=Config.RANDOM_STATE, server_pid=None):
+    target = urlparse(url)
+    schedule, warm_up = prepare_requests(mix, total, seed)
+    client = _Client(target.hostname, target.port or 80)
+
+    # Warm-up: loads the model bundle outside the measured window
+    for spec, body in warm_up:
+        _send(client, spec, body)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda item: _send(client, *item), schedule))
+    wall = time.perf_counter() - started
+
+    by_name = {}
+    for name, status, elapsed, cached in outcomes:
+        by_name.setdefault(name, []).append((status, elapsed, cached))
+
+    endpoints = {}
+    for name, rows in by_name.items():
+        stats = latency_summary([e for s, e, _ in rows if s == 200])
+        stats["errors"] = sum(1 for s, _, _ in rows if s != 200)
+        stats["cache_hits"] = sum(1 for _, _, c in rows if c)
+        stats["requests_per_s"] = len(rows) / wall
+        endpoints[name] = stats
+
+    overall = latency_summary([e for _, s, e, _ in outcomes if s == 200])
+    overall["errors"] = sum(1 for _, s, _, _ in outcomes if s != 200)
+    overall["cache_hits"] = sum(1 for *_, c in outcomes if c)
+    overall["requests_per_s"] = len(outcomes) / wall
+
+    return {
+        "meta": {
+            "commit": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "url": url,
+            "requests": total,
+            "concurrency": concurrency,
+            "seed": seed,
+            "python": sys.version.split()[0]
+        },
+        "overall": overall,
+        "endpoints": endpoints,
+        "server": {"peak_rss_mb": peak_rss_mb(server_pid) if server_pid else None}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChurnAI HTTP load test")
+    parser.add_argument("--url", help="Target an already running API instead of starting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local server")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", help="JSON file with a recorded request mix (same schema as DEFAULT_MIX)")
+    parser.add_argument("--output", default=Config.LOAD_TEST_REPORT_PATH)
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    mix = DEFAULT_MIX
+    if args.mix:
+        with open(args.mix) as f:
+            mix = json.load(f)
+
+    proc = None
+    url = args.url
+    if not url:
+        proc = start_server(args.port, args.workers)
+        url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        report = run_load_test(url, mix, args.requests, args.concurrency,
+                               server_pid=proc.pid if proc else None)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    write_report(report, args.output)
+    o = report["overall"]
+    print(f"✅ {o['count']} ok / {o['errors']} errors | {o['requests_per_s']:.1f} req/s | "
+          f"p50 {o['p50_ms']:.1f}ms p95 {o['p95_ms']:.1f}ms p99 {o['p99_ms']:.1f}ms | "
+          f"peak RSS {report['server']['peak_rss_mb']} MB | {o['cache_hits']} cache hits")
+    print(f"📊 Report saved to {args.output}")
+
+    if args.compare:
+        violations = find_regressions(
+            report, load_report(args.compare), args.threshold,
+            lower_is_better=("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb"),
+            higher_is_better=("requests_per_s",)
+        )
+        for v in violations:
+            print(f"❌ REGRESSION {v}")
+        if violations:
+            sys.exit(1)
+        print("✅ No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+[PERFORMANCE: MEMORY FOOTPRINT REPORT]
+Bytes per row of the Telco frame before (object columns, float64/int64) and after
+compact dtypes, at ingestion and after feature engineering.
+
+    python -m benchmarks.memory_report
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.data_loader import load_data, bytes_per_row
+from src.perf_utils import git_revision, write_report
+from features.feature_engineering import engineer_enterprise_features
+
+
+def build_memory_report(data_path=Config.RAW_DATA_PATH):
+    stages = {}
+    for label, compact in [("before", False), ("after", True)]:
+        raw = load_data(data_path, compact=compact)
+        engineered = engineer_enterprise_features(raw)
+        stages[label] = {
+            "ingested_bytes_per_row": bytes_per_row(raw),
+            "engineered_bytes_per_row": bytes_per_row(engineered),
+            "dtypes": {col: str(dtype) for col, dtype in engineered.dtypes.items()}
+        }
+
+    before, after = stages["before"], stages["after"]
+    return {
+        "meta": {"commit": git_revision(), "rows": len(raw), "source": data_path},
+        "stages": stages,
+        "reduction": {
+            "ingested": 1 - after["ingested_bytes_per_row"] / before["ingested_bytes_per_row"],
+            "engineered": 1 - after["engineered_bytes_per_row"] / before["engineered_bytes_per_row"]
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChurnAI memory footprint report")
+    parser.add_argument("--data", default=Config.RAW_DATA_PATH)
+    parser.add_argument("--output", default=Config.MEMORY_REPORT_PATH)
+    args = parser.parse_args()
+
+    report = build_memory_report(args.data)
+    write_report(report, args.output)
+    for label in ("before", "after"):
+        s = report["stages"][label]
+        print(f"🧮 {label:6} | ingested {s['ingested_bytes_per_row']:7.1f} B/row | "
+              f"engineered {s['engineered_bytes_per_row']:7.1f} B/row")
+    print(f"📉 Reduction: ingested {report['reduction']['ingested']:.0%}, "
+          f"engineered {report['reduction']['engineered']:.0%}")
+    print(f"📊 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+[PERFORMANCE: HOT PATH MICRO-BENCHMARKS]
+Times the feature, preprocessing, inference and validation hot paths on synthetic
+Telco-shaped frames and records rows/s plus peak allocations as JSON.
+
+    python -m benchmarks.microbench --sizes 1 1000 100000
+    python -m benchmarks.microbench --update-baseline
+    python -m benchmarks.microbench --threshold 0.25   # exit 1 on regression vs baseline
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.data_loader import load_data, compact_frame
+from src.synthetic_data import stream_synthetic
+from src.perf_utils import git_revision, write_report, load_report, find_regressions
+from src.validation import DataValidator
+from features.feature_engineering import engineer_enterprise_features
+from preprocessing_pipeline import get_preprocessing_pipeline
+
+DEFAULT_SIZES = [1, 100, 10_000, 100_000, 1_000_000]
+
+
+def make_frame(rows, seed=Config.RANDOM_STATE):
+    """Synthetic Telco-shaped frame with the same compact dtypes as load_data()."""
+    df = pd.concat(stream_synthetic(rows, seed=seed), ignore_index=True)
+    return compact_frame(df)
+
+
+def build_hot_paths(source_df):
+    """Returns {name: (setup(frame) -> arg, fn(arg))} for every tracked hot path."""
+    train_eng = engineer_enterprise_features(source_df)
+    y = (train_eng['Churn'] == 'Yes').astype(int)
+    preprocessor = get_preprocessing_pipeline(Config.NUM_FEATURES, Config.CAT_FEATURES).fit(train_eng, y)
+
+    # Always the same model, fitted here: timing whichever bundle is deployed would make a
+    # baseline recorded with one champion report false regressions against another
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    pipeline = Pipeline([('prep', preprocessor), ('clf', LogisticRegression(max_iter=1000))]).fit(train_eng, y)
+
+    return {
+        "engineer_enterprise_features": (lambda df: df, engineer_enterprise_features),
+        "preprocessing_transform": (engineer_enterprise_features, preprocessor.transform),
+        "pipeline_predict_proba": (engineer_enterprise_features, pipeline.predict_proba),
+        "data_validator_validate": (lambda df: df, DataValidator.validate),
+    }
+
+
+def measure(fn, arg, rows, min_time=0.5, max_repeats=50, track_alloc=True):
+    timings = []
+    budget_end = time.perf_counter() + min_time
+    while len(timings) < max_repeats:
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() > budget_end:
+            break
+
+    result = {
+        "repeats": len(timings),
+        "median_s": float(np.median(timings)),
+        "rows_per_s": rows / max(float(np.median(timings)), 1e-9)
+    }
+
+    if track_alloc:
+        tracemalloc.start()
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_alloc_mb"] = peak / 1024 ** 2
+        result["alloc_bytes_per_row"] = peak / rows
+    return result
+
+
+def run_microbench(sizes, track_alloc=True, only=None):
+    source_df = load_data(Config.RAW_DATA_PATH)
+    hot_paths = build_hot_paths(source_df)
+    results = {}
+
+    for rows in sizes:
+        frame = make_frame(rows)
+        for name, (setup, fn) in hot_paths.items():
+            if only and name not in only:
+                continue
+            stats = measure(fn, setup(frame), rows, track_alloc=track_alloc)
+            results.setdefault(name, {})[str(rows)] = stats
+            print(f"⏱️ {name:30} | {rows:>9} rows | {stats['rows_per_s']:>14,.0f} rows/s"
+                  + (f" | peak {stats['peak_alloc_mb']:.1f} MB" if track_alloc else ""))
+
+    return {
+        "meta": {
+            "commit": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sizes": sizes,
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__
+        },
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChurnAI hot path micro-benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", help="Restrict to these hot path names")
+    parser.add_argument("--no-alloc", action="store_true", help="Skip tracemalloc allocation runs")
+    parser.add_argument("--output", default=Config.MICROBENCH_REPORT_PATH)
+    parser.add_argument("--baseline", default=Config.MICROBENCH_BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    # Validation logging would dominate the timings of the validator hot path
+    logging.disable(logging.INFO)
+
+    report = run_microbench(args.sizes, track_alloc=not args.no_alloc, only=args.only)
+    write_report(report, args.output)
+    print(f"📊 Report saved to {args.output}")
+
+    if args.update_baseline:
+        write_report(report, args.baseline)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        violations = find_regressions(
+            report["results"], load_report(args.baseline)["results"], args.threshold,
+            lower_is_better=("peak_alloc_mb", "alloc_bytes_per_row"),
+            higher_is_better=("rows_per_s",)
+        )
+        for v in violations:
+            print(f"❌ REGRESSION {v}")
+        if violations:
+            sys.exit(1)
+        print("✅ No hot path regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
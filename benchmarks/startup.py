@@ -0,0 +1,98 @@
+"""
+[PERFORMANCE: STARTUP / IMPORT-TIME BUDGET]
+Imports each entry point in a fresh interpreter under `-X importtime`, records the
+cumulative import time and its slowest direct imports, and fails when an entry point
+exceeds its budget (Config.STARTUP_BUDGET_MS) or eagerly imports a forbidden library
+(Config.STARTUP_FORBIDDEN_MODULES).
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --modules app --repeat 5 --budget-scale 1.5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.perf_utils import git_revision, write_report
+
+
+def parse_importtime(stderr):
+    """-X importtime lines -> [(depth, module, self_us, cumulative_us)] in emission order."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # The name column is indented two spaces per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def profile_imports(module):
+    """Imports `module` in a fresh interpreter; returns wall time and the parsed import tree."""
+    env = dict(os.environ, CHURNAI_WARMUP="0")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=Config.BASE_DIR, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    total = next((cum for depth, name, _, cum in rows if depth == 0 and name == module), 0)
+    return {"import_ms": total / 1000, "wall_ms": wall_ms, "rows": rows}
+
+
+def measure(module, repeat=3, top=10):
+    runs = [profile_imports(module) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["import_ms"])
+    loaded = {name.split(".")[0] for _, name, _, _ in best["rows"]}
+    # Direct imports of the entry point, i.e. what its own import statements cost
+    direct = sorted(((cum, name) for depth, name, _, cum in best["rows"] if depth == 1), reverse=True)[:top]
+    forbidden = [m for m in Config.STARTUP_FORBIDDEN_MODULES.get(module, []) if m in loaded]
+    return {
+        "import_ms": best["import_ms"],
+        "interpreter_wall_ms": min(r["wall_ms"] for r in runs),
+        "slowest_direct_imports": [{"module": name, "cumulative_ms": cum / 1000} for cum, name in direct],
+        "forbidden_imports": forbidden
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget for the API and CLI entry points")
+    parser.add_argument("--modules", nargs="+", default=list(Config.STARTUP_BUDGET_MS))
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N runs per entry point")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply budgets (slower machines)")
+    parser.add_argument("--output", default=Config.STARTUP_REPORT_PATH)
+    args = parser.parse_args()
+
+    report = {"git_revision": git_revision(), "python": sys.version.split()[0], "entry_points": {}}
+    violations = []
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        budget = Config.STARTUP_BUDGET_MS.get(module)
+        result["budget_ms"] = budget * args.budget_scale if budget else None
+        report["entry_points"][module] = result
+
+        slowest = ", ".join(f"{d['module']} {d['cumulative_ms']:.0f}ms" for d in result["slowest_direct_imports"][:3])
+        print(f"⏱️  {module:<18} {result['import_ms']:7.1f} ms (budget {result['budget_ms']}) | {slowest}")
+        if result["budget_ms"] and result["import_ms"] > result["budget_ms"]:
+            violations.append(f"{module}: {result['import_ms']:.0f} ms > budget {result['budget_ms']:.0f} ms")
+        if result["forbidden_imports"]:
+            violations.append(f"{module}: eagerly imports {', '.join(result['forbidden_imports'])}")
+
+    write_report(report, args.output)
+    print(f"📊 Report saved to {args.output}")
+    for v in violations:
+        print(f"❌ STARTUP BUDGET {v}")
+    if violations:
+        sys.exit(1)
+    print("✅ All entry points within their startup budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+[PERFORMANCE: PER-WORKER MEMORY]
+Starts the API with N workers in each serving mode, warms every worker with prediction
+requests, then records RSS and PSS per worker. PSS splits shared pages between the
+processes mapping them, so its sum is the real footprint of the worker pool.
+
+    python -m benchmarks.worker_memory --workers 4
+    python -m benchmarks.worker_memory --workers 4 --modes prefork prefork-mmap
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.load_test import build_upload, _multipart
+from src.config import Config
+from src.perf_utils import child_pids, current_rss_mb, pss_mb, git_revision, write_report
+
+MODES = {
+    # Each uvicorn worker is a fresh interpreter that imports the app and loads its own bundle
+    "uvicorn": lambda port, n: [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+                                "--port", str(port), "--workers", str(n), "--log-level", "warning"],
+    # Bundle loaded once in the parent, workers forked with copy-on-write pages
+    "prefork": lambda port, n: [sys.executable, "serve.py", "--host", "127.0.0.1",
+                                "--port", str(port), "--workers", str(n)],
+}
+MODES["prefork-mmap"] = MODES["prefork"]
+
+
+def _wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/api/stats")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.25)
+    raise RuntimeError(f"API did not become ready on port {port} within {timeout}s")
+
+
+def _predict(port, body, content_type):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    conn.request("POST", "/api/predict", body=body, headers={"Content-Type": content_type})
+    resp = conn.getresponse()
+    resp.read()
+    return resp.status
+
+
+def _workers(root_pid):
+    # uvicorn --workers adds a multiprocessing resource tracker next to the workers; skip non-python-app children
+    pids = []
+    for pid in child_pids(root_pid):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ")
+        except OSError:
+            continue
+        if b"resource_tracker" not in cmdline:
+            pids.append(pid)
+    return pids
+
+
+def measure_mode(mode, workers, port, warmup_requests):
+    env = dict(os.environ, CHURNAI_MODEL_MMAP="r" if mode.endswith("mmap") else "")
+    proc = subprocess.Popen(MODES[mode](port, workers), cwd=Config.BASE_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(port)
+        body, content_type = _multipart(build_upload(200, seed=Config.RANDOM_STATE))
+        # Enough concurrent requests that the kernel hands work (and a model load) to every worker
+        with ThreadPoolExecutor(max_workers=workers * 2) as pool:
+            statuses = list(pool.map(lambda _: _predict(port, body, content_type), range(warmup_requests)))
+        time.sleep(0.5)
+
+        per_worker = [
+            {"pid": pid, "rss_mb": current_rss_mb(pid), "pss_mb": pss_mb(pid)} for pid in _workers(proc.pid)
+        ]
+        rss = [w["rss_mb"] for w in per_worker if w["rss_mb"] is not None]
+        pss = [w["pss_mb"] for w in per_worker if w["pss_mb"] is not None]
+        return {
+            "workers": per_worker,
+            "master": {"rss_mb": current_rss_mb(proc.pid), "pss_mb": pss_mb(proc.pid)},
+            "mean_worker_rss_mb": sum(rss) / len(rss) if rss else None,
+            "mean_worker_pss_mb": sum(pss) / len(pss) if pss else None,
+            "total_pss_mb": (sum(pss) + (pss_mb(proc.pid) or 0)) if pss else None,
+            "failed_requests": sum(1 for s in statuses if s != 200)
+        }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker memory of the serving modes")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["uvicorn", "prefork", "prefork-mmap"])
+    parser.add_argument("--warmup-requests", type=int, default=40)
+    parser.add_argument("--output", default=Config.WORKER_MEMORY_REPORT_PATH)
+    args = parser.parse_args()
+
+    report = {"git_revision": git_revision(), "n_workers": args.workers, "modes": {}}
+    for mode in args.modes:
+        result = measure_mode(mode, args.workers, args.port, args.warmup_requests)
+        report["modes"][mode] = result
+        print(f"🧠 {mode:<13} mean worker RSS {result['mean_worker_rss_mb']:.1f} MB | "
+              f"mean worker PSS {result['mean_worker_pss_mb']:.1f} MB | "
+              f"pool total PSS {result['total_pss_mb']:.1f} MB")
+
+    write_report(report, args.output)
+    print(f"📊 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
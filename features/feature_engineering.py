@@ -5,6 +5,7 @@ def engineer_enterprise_features(df_in):
     """
     [PROCESS 5: ADVANCED FEATURE ENGINEERING]
     Strict 1:1 Port of Masterclass Notebook Logic.
+    Engineered columns are emitted as int8 flags/counts and float32 ratios.
     """
     df = df_in.copy()
     
@@ -22,11 +23,12 @@ def engineer_enterprise_features(df_in):
                                   labels=['New', 'Junior', 'Middle', 'Senior', 'Legend'])
     
     # 2. Risk Indicators (Step 5.2)
+    # Vectorized comparisons work on category codes as well as object columns
     if 'Contract' in df.columns:
-        df['is_high_risk_contract'] = df['Contract'].apply(lambda x: 1 if x == 'Month-to-month' else 0)
+        df['is_high_risk_contract'] = (df['Contract'] == 'Month-to-month').astype(np.int8)
     
     if 'PaymentMethod' in df.columns:
-        df['unstable_payment'] = df['PaymentMethod'].apply(lambda x: 1 if x == 'Electronic check' else 0)
+        df['unstable_payment'] = (df['PaymentMethod'] == 'Electronic check').astype(np.int8)
     
     # 3. Behavioral Intensity (Step 5.3)
     # Using the notebook's summation logic for active services
@@ -34,16 +36,16 @@ def engineer_enterprise_features(df_in):
                 'OnlineBackup', 'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies']
     available_services = [s for s in services if s in df.columns]
     if available_services:
-        df['service_count'] = (df[available_services] == 'Yes').sum(axis=1)
+        df['service_count'] = (df[available_services] == 'Yes').sum(axis=1).astype(np.int8)
     else:
-        df['service_count'] = 0
+        df['service_count'] = np.int8(0)
         
     # 4. Economic Value & Price Sensitivity (Step 5.4)
     if 'MonthlyCharges' in df.columns and 'TotalCharges' in df.columns:
-        df['price_sensitivity'] = df['MonthlyCharges'] / (df['TotalCharges'].fillna(0) + 1)
+        df['price_sensitivity'] = (df['MonthlyCharges'] / (df['TotalCharges'].fillna(0) + 1)).astype(np.float32)
         
     if 'MonthlyCharges' in df.columns and 'tenure' in df.columns:
-        df['clv_proxy'] = df['MonthlyCharges'] * df['tenure']
+        df['clv_proxy'] = (df['MonthlyCharges'] * df['tenure']).astype(np.float32)
         
     return df
 
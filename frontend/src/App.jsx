@@ -14,6 +14,7 @@ import {
 } from 'lucide-react';
 
 const API_BASE = "/api";
+const PAGE_SIZE = 200;
 
 function App() {
   const [step, setStep] = useState('LOGIN');
@@ -29,11 +30,32 @@ function App() {
   const [uploadProgress, setUploadProgress] = useState(0);
   const [searchTerm, setSearchTerm] = useState('');
   const [filterRisk, setFilterRisk] = useState('ALL');
-  const [displayLimit, setDisplayLimit] = useState(100);
+  const [tableRows, setTableRows] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalMatching, setTotalMatching] = useState(0);
+
+  // Scored rows stay on the server: fetch one page at a time, highest risk first
+  const fetchResultsPage = async (cursor = null) => {
+    const res = await axios.get(`${API_BASE}/results/${predictions.result_id}`, {
+      params: {
+        limit: PAGE_SIZE,
+        cursor: cursor || undefined,
+        risk_level: filterRisk === 'ALL' ? undefined : filterRisk,
+        search: searchTerm || undefined
+      }
+    });
+    setTableRows(prev => (cursor ? [...prev, ...res.data.predictions] : res.data.predictions));
+    setNextCursor(res.data.next_cursor);
+    setTotalMatching(res.data.total_matching);
+  };
 
   useEffect(() => {
-    setDisplayLimit(100);
-  }, [filterRisk, searchTerm]);
+    if (!predictions?.result_id) return;
+    fetchResultsPage().catch(e => {
+      console.error("Results API Error", e);
+      setError('Prediction results expired. Please run the analysis again.');
+    });
+  }, [predictions, filterRisk, searchTerm]);
 
   // Mock ROC Data
   const rocData = [
@@ -83,7 +105,7 @@ function App() {
     }, 200);
 
     try {
-      const res = await axios.post(`${API_BASE}/test-sample`);
+      const res = await axios.post(`${API_BASE}/test-sample`, null, { params: { top_n: PAGE_SIZE } });
       setUploadProgress(100);
       setPredictions(res.data);
       setStep('DASHBOARD');
@@ -126,6 +148,7 @@ function App() {
       formData.append('file', file);
 
       const res = await axios.post(`${API_BASE}/predict`, formData, {
+        params: { top_n: PAGE_SIZE },
         headers: {
           'Content-Type': 'multipart/form-data',
         },
@@ -546,17 +569,12 @@ function App() {
                   </thead>
                   <tbody>
                     {(() => {
-                      const filtered = (predictions?.predictions || [])
-                        .filter(c => {
-                          const matchesSearch = c.customer_id.toLowerCase().includes(searchTerm.toLowerCase());
-                          const matchesRisk = filterRisk === 'ALL' || c.risk_level.toUpperCase() === filterRisk;
-                          return matchesSearch && matchesRisk;
-                        })
-                        .sort((a, b) => b.churn_probability - a.churn_probability);
+                      // Already filtered and sorted by the server
+                      const filtered = tableRows;
 
                       return (
                         <>
-                          {filtered.slice(0, displayLimit).map((customer, i) => (
+                          {filtered.map((customer, i) => (
                             <tr key={i}>
                               <td style={{ fontFamily: 'JetBrains Mono', fontWeight: 'bold', color: 'var(--accent)' }}>
                                 {customer.customer_id}
@@ -574,15 +592,15 @@ function App() {
                               </td>
                             </tr>
                           ))}
-                          {filtered.length > displayLimit && (
+                          {nextCursor && (
                             <tr>
                               <td colSpan="6" style={{ textAlign: 'center', padding: '1.5rem' }}>
                                 <button
-                                  onClick={() => setDisplayLimit(prev => prev + 200)}
+                                  onClick={() => fetchResultsPage(nextCursor)}
                                   className="btn-secondary"
                                   style={{ width: 'auto', padding: '0.5rem 2rem' }}
                                 >
-                                  Load More (Showing {displayLimit} of {filtered.length})
+                                  Load More (Showing {filtered.length} of {totalMatching})
                                 </button>
                               </td>
                             </tr>
@@ -675,6 +693,10 @@ function App() {
                         F1-Score <MetricHelp title="F1-Score" description="Balance between Precision and Recall. Best overall performance metric." />
                       </th>
                       <th>Training Time</th>
+                      <th>
+                        Latency <MetricHelp title="Serving Latency" description="Median scoring time for a single customer / a 10k-customer batch." />
+                      </th>
+                      <th>Model Size</th>
                       <th>Status</th>
                     </tr>
                   </thead>
@@ -682,6 +704,8 @@ function App() {
                     {(() => {
                       const championScore = benchmark[0]?.roc_auc || 1;
                       return benchmark.map((algo, i) => {
+                        // Older reports have no selection columns: the top AUC is the champion
+                        const isChampion = algo.is_champion ?? i === 0;
                         const variance = i === 0 ? 0 : ((algo.roc_auc - championScore) / championScore) * 100;
                         return (
                           <tr key={i}>
@@ -704,9 +728,17 @@ function App() {
                             <td style={{ fontSize: '0.75rem', color: 'var(--text-muted)' }}>
                               {(algo.training_time || 0).toFixed(2)}s
                             </td>
+                            <td style={{ fontSize: '0.75rem', color: 'var(--text-muted)' }}>
+                              {algo.latency_row_ms != null ? `${algo.latency_row_ms.toFixed(2)}ms / ${algo.latency_batch_ms.toFixed(0)}ms` : '—'}
+                            </td>
+                            <td style={{ fontSize: '0.75rem', color: 'var(--text-muted)' }}>
+                              {algo.model_size_mb != null ? `${algo.model_size_mb.toFixed(2)} MB` : '—'}
+                            </td>
                             <td>
-                              {i === 0 ? (
+                              {isChampion ? (
                                 <span className="risk-badge risk-low">Champion</span>
+                              ) : algo.within_budget === false ? (
+                                <span className="risk-badge risk-high">Over Budget</span>
                               ) : (
                                 <span className="risk-badge risk-med">Verified</span>
                               )}
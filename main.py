@@ -1,24 +1,17 @@
 import argparse
 import logging
+import multiprocessing
 import os
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from src.config import Config
 from src.data_loader import load_data
-from src.preprocess import prepare_data
-from src.train import train_and_benchmark
-from src.predict import generate_churn_report
-from src.visualization import generate_production_figures
+from src.preprocess import inference_features, prepare_data
+from src.logging_config import configure_logging
+from src.cpu_budget import configure_threads
+from src.profiling import profile_stage
 
 # Setup Professional Logging
-os.makedirs(Config.REPORTS_DIR, exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)-8s | %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(Config.REPORTS_DIR, "production.log")),
-        logging.StreamHandler()
-    ]
-)
+configure_logging(Config.PRODUCTION_LOG_PATH)
 logger = logging.getLogger("ChurnEngine")
 
 from src.validation import DataValidator
@@ -26,33 +19,70 @@ from src.validation import DataValidator
 def main():
     parser = argparse.ArgumentParser(description="Professional Churn Prediction Engine")
     parser.add_argument("--mode", choices=["train", "predict", "full"], default="full", help="Pipeline mode")
+    parser.add_argument("--input", default=Config.RAW_DATA_PATH,
+                        help="Customer data: CSV (optionally .gz/.zst), Parquet, Arrow IPC or Feather")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Rescore only new or changed customers (full rescore when the model changes)")
+    parser.add_argument("--early-stopping", action="store_true",
+                        help="Stop boosted models when validation AUC plateaus (validation split of the training set)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under the sampling profiler (speedscope + hot spots in outputs/reports/profiles)")
     args = parser.parse_args()
+    if args.profile:
+        Config.PROFILE_STAGES = True
+    if args.early_stopping:
+        Config.EARLY_STOPPING = True
+    run_pipeline(args)
 
+@profile_stage("main")
+def run_pipeline(args):
     logger.info("Initializing Churn Prediction Pipeline")
+    configure_threads("training")
 
     # 1. Load
-    raw_df = load_data(Config.RAW_DATA_PATH)
+    raw_df = load_data(args.input)
     
     # --- ENTERPRISE VALIDATION GATE (15-Year Standard) ---
     if not DataValidator.validate(raw_df, context="Training"):
         logger.error("🛑 Pipeline terminated due to data integrity violations.")
         return
 
-    # 2. Preprocess
-    X_train, X_test, y_train, y_test, feature_names, customer_ids, scaler = prepare_data(raw_df)
+    # Incremental scoring reuses the trained scaler and the score index of the last run
+    incremental = args.incremental and args.mode in ["predict", "full"]
+    if incremental and args.mode == "predict" and not os.path.exists(Config.SCALER_PATH):
+        logger.warning("No trained scaler at %s: falling back to a full rescore.", Config.SCALER_PATH)
+        incremental = False
+
+    # 2. Preprocess (winsorizes in place: the incremental scorer must hash the extract as delivered)
+    if args.mode in ["train", "full"] or not incremental:
+        X_train, X_test, y_train, y_test, feature_names, customer_ids, scaler = prepare_data(
+            raw_df.copy() if incremental else raw_df)
 
     # 3. Benchmark & Train (20 Algorithms)
     if args.mode in ["train", "full"]:
-        benchmark_results = train_and_benchmark(X_train, X_test, y_train, y_test, feature_names)
-        generate_production_figures(Config.RAW_DATA_PATH)
+        # Imported here: the 20-algorithm suite and matplotlib are only needed for training
+        from src.train import train_and_benchmark
+        from src.visualization import generate_production_figures
+        # Figures of the dataset being trained on render in their own process while the models
+        # train (skipped if the input is unchanged). Spawned, not forked: the log listener and
+        # BLAS/OpenMP pools are already running here, and forking a threaded process can deadlock
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as figure_pool:
+            figures = figure_pool.submit(generate_production_figures, args.input)
+            benchmark_results = train_and_benchmark(X_train, X_test, y_train, y_test, feature_names)
+            figures.result()
 
     # 4. Generate High-Risk Report
     if args.mode in ["predict", "full"]:
-        # Prepare full scaled data for inference
-        X_full_columns = pd.get_dummies(raw_df.drop(['customerID', 'Churn'], axis=1), drop_first=True)
-        X_full_scaled = scaler.transform(X_full_columns)
-        
-        report = generate_churn_report(X_full_scaled, raw_df['customerID'])
+        if incremental:
+            from src.incremental_scoring import incremental_churn_report
+            report, _ = incremental_churn_report(raw_df)
+        else:
+            from src.predict import generate_churn_report
+            # Prepare full scaled data for inference (the same features the incremental scorer builds)
+            X_full_scaled = inference_features(raw_df, scaler)
+            
+            report = generate_churn_report(X_full_scaled, raw_df['customerID'])
         
         # Save high-risk targets
         high_risk = report[report['RiskLevel'].isin(['Critical', 'High'])].sort_values(by='ConfidenceScore', ascending=False)
@@ -1,8 +1,85 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import RobustScaler, PowerTransformer, OneHotEncoder
+from sklearn.preprocessing import RobustScaler, PowerTransformer
 from sklearn.impute import SimpleImputer
 
+
+class CategoryCodeEncoder(BaseEstimator, TransformerMixin):
+    """
+    One-hot encoder that works on pandas category codes.
+    Equivalent to SimpleImputer(fill_value='missing') + OneHotEncoder(handle_unknown='ignore',
+    drop='first'), but categorical columns are recoded through their (tiny) category index
+    instead of hashing every row's string, and no object array is materialized.
+    """
+
+    def __init__(self, fill_value='missing', dtype=np.float64):
+        self.fill_value = fill_value
+        self.dtype = dtype
+
+    def _column(self, X, i):
+        return X.iloc[:, i] if isinstance(X, pd.DataFrame) else pd.Series(np.asarray(X)[:, i])
+
+    def _codes(self, col, categories):
+        # For categorical input this recodes the category index, not every row
+        codes = pd.Categorical(col, categories=categories).codes.astype(np.int64)
+        missing = col.isna().to_numpy()
+        if missing.any():
+            fill_idx = categories.get_indexer([self.fill_value])[0]
+            codes[missing] = fill_idx
+        return codes
+
+    def fit(self, X, y=None):
+        if isinstance(X, pd.DataFrame):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = X.shape[1]
+        self.categories_ = []
+
+        for i in range(self.n_features_in_):
+            col = self._column(X, i)
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                observed = col.cat.categories[np.unique(col.cat.codes[col.cat.codes >= 0])]
+                values = list(observed)
+            else:
+                values = list(pd.unique(col.dropna()))
+            if col.isna().any():
+                values.append(self.fill_value)
+            try:
+                values = sorted(values)
+            except TypeError:
+                values = sorted(values, key=str)
+            self.categories_.append(pd.Index(values, dtype=object))
+        return self
+
+    def transform(self, X):
+        n_rows = X.shape[0]
+        rows, cols = [], []
+        offset = 0
+
+        for i, categories in enumerate(self.categories_):
+            codes = self._codes(self._column(X, i), categories)
+            # Code 0 is the dropped reference level, -1 an unseen category: both encode to all-zeros
+            hit = np.flatnonzero(codes > 0)
+            rows.append(hit)
+            cols.append(codes[hit].astype(np.int64) - 1 + offset)
+            offset += len(categories) - 1
+
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        data = np.ones(len(rows), dtype=self.dtype)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n_rows, offset))
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is None:
+            input_features = getattr(self, "feature_names_in_", [f"x{i}" for i in range(self.n_features_in_)])
+        return np.asarray([
+            f"{feat}_{cat}" for feat, cats in zip(input_features, self.categories_) for cat in cats[1:]
+        ], dtype=object)
+
+
 def get_preprocessing_pipeline(num_features, cat_features):
     """
     [PROCESS 6: INSTITUTIONAL PREPROCESSING PIPELINE]
@@ -16,10 +93,9 @@ def get_preprocessing_pipeline(num_features, cat_features):
         ('scale', RobustScaler())
     ])
 
-    # Categorical Pipeline (One-Hot Encoding)
+    # Categorical Pipeline (One-Hot Encoding straight from category codes, 'missing' imputed inline)
     cat_pipe = Pipeline([
-        ('impute', SimpleImputer(strategy='constant', fill_value='missing')),
-        ('ohe', OneHotEncoder(handle_unknown='ignore', drop='first'))
+        ('ohe', CategoryCodeEncoder(fill_value='missing'))
     ])
 
     # Final Unified Preprocessor
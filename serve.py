@@ -0,0 +1,153 @@
+"""
+[PRODUCTION SERVING: PREFORK WORKERS]
+Loads the API, its libraries and every model bundle ONCE in a parent process, freezes the
+heap, then forks N uvicorn workers that accept on a shared socket. The workers inherit the
+model as copy-on-write pages, so N workers hold one read-only copy instead of N private ones.
+
+    python serve.py --workers 4 --port 8080
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+from src.config import Config
+
+logger = logging.getLogger("CHURNAI-SERVE")
+
+
+def _bind(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(api, sock, log_level):
+    import uvicorn
+
+    # The parent's handlers must not fire in the worker
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(api.app, log_level=log_level, access_log=False))
+    server.run(sockets=[sock])
+
+
+def serve(host="0.0.0.0", port=8080, workers=None, log_level="warning"):
+    """
+    Prefork master: preload, freeze, fork, then supervise. Crashed workers are respawned;
+    workers that die within WORKER_MIN_UPTIME_S are respawned after an exponential backoff,
+    and after WORKER_MAX_QUICK_FAILURES of those in a row the master stops and returns 1.
+    """
+    workers = workers or Config.WEB_CONCURRENCY
+
+    # 1. Import the app, its lazily-imported request path and every bundle in the parent.
+    #    Thread pools are sized per worker: every forked worker shares the host's cores.
+    #    Nothing is scored here: a prediction would start the OpenMP/BLAS and executor
+    #    threads, and forking a threaded process can deadlock the child. Each worker
+    #    precomputes the demo sample in its own lifespan warm-up after the fork
+    Config.WEB_CONCURRENCY = workers
+    import app as api
+    start = time.perf_counter()
+    api.warm_up(precompute=False)
+    versions = api.REGISTRY.preload()
+    logger.info("📦 Preloaded %s in %.2fs (mmap_mode=%s)", versions, time.perf_counter() - start,
+                api.REGISTRY.mmap_mode)
+
+    # 2. Move everything allocated so far out of the GC's reach: collections in the
+    #    workers would otherwise write to these object headers and un-share their pages
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(host, port)
+    logger.info("🚀 Prefork master %d listening on %s:%d with %d workers", os.getpid(), host, port, workers)
+
+    children = {}  # pid -> start time
+    stopping = False
+    failed = False
+    quick_failures = 0
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(api, sock, log_level)
+            finally:
+                os._exit(0)
+        children[pid] = time.monotonic()
+        return pid
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+
+    # 3. Supervise
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        uptime = time.monotonic() - children.pop(pid, time.monotonic())
+        if stopping:
+            continue
+        if uptime >= Config.WORKER_MIN_UPTIME_S:
+            quick_failures = 0
+            logger.warning("Worker %d exited (status %d); respawning", pid, status)
+            spawn()
+            continue
+
+        # A worker that dies right after starting (bad config, port/model errors) will keep
+        # doing so: back off instead of fork-looping, and give up if it never stays up
+        quick_failures += 1
+        if quick_failures >= Config.WORKER_MAX_QUICK_FAILURES:
+            logger.error("❌ Worker %d exited after %.1fs (status %d): %d quick failures in a row, stopping",
+                         pid, uptime, status, quick_failures)
+            stop(None, None)
+            failed = True
+            continue
+        delay = min(Config.WORKER_RESPAWN_BACKOFF_S * 2 ** (quick_failures - 1), Config.WORKER_RESPAWN_BACKOFF_MAX_S)
+        logger.warning("Worker %d exited after %.1fs (status %d); respawning in %.1fs",
+                       pid, uptime, status, delay)
+        time.sleep(delay)
+        if not stopping:
+            spawn()
+
+    sock.close()
+    logger.info("✨ Prefork master stopped.")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChurnAI prefork server (shared model memory)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8080")))
+    parser.add_argument("--workers", type=int, default=Config.WEB_CONCURRENCY)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py needs os.fork(); use `uvicorn app:app --workers N` on this platform.")
+    sys.exit(serve(args.host, args.port, args.workers, args.log_level))
+
+
+if __name__ == "__main__":
+    main()
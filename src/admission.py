@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+
+from src.config import Config
+
+
+class Overloaded(Exception):
+    """The request cannot be admitted: the queue is full or the wait timed out."""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def estimate_rows(contents, fmt):
+    """
+    Cheap row estimate for an upload before it is parsed: newline count for CSV, the footer
+    for Parquet, and a conservative bytes-per-row ratio for compressed or Arrow payloads.
+    """
+    if fmt == "csv":
+        return max(1, contents.count(b"\n"))
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            return max(1, pq.ParquetFile(pa.BufferReader(contents)).metadata.num_rows)
+        except Exception:
+            pass
+    return max(1, len(contents) // Config.ADMISSION_EST_BYTES_PER_ROW)
+
+
+class Ticket:
+    __slots__ = ("rows", "nbytes", "admitted_at", "released")
+
+    def __init__(self, rows, nbytes):
+        self.rows = rows
+        self.nbytes = nbytes
+        self.admitted_at = time.monotonic()
+        self.released = False
+
+
+class AdmissionController:
+    """
+    Admits scoring work while the rows and upload bytes in flight stay within budget.
+    Over-budget requests wait in a bounded queue, smallest first (interactive uploads
+    overtake bulk ones), and are shed with a Retry-After hint when it is full or the wait
+    times out. A request larger than the whole budget runs only when nothing else does.
+    Budgets are per container and split across the WEB_CONCURRENCY worker processes.
+    `release` may be called from any thread (streamed bodies finish on the threadpool).
+    """
+
+    def __init__(self, max_rows=None, max_bytes=None, queue_size=None, queue_timeout_s=None, workers=None):
+        workers = max(1, workers or Config.WEB_CONCURRENCY)
+        self.max_rows = max(1, (max_rows or Config.ADMISSION_MAX_ROWS_IN_FLIGHT) // workers)
+        self.max_bytes = max(1, (max_bytes or Config.ADMISSION_MAX_BYTES_IN_FLIGHT) // workers)
+        self.queue_size = Config.ADMISSION_QUEUE_SIZE if queue_size is None else queue_size
+        self.queue_timeout_s = queue_timeout_s or Config.ADMISSION_QUEUE_TIMEOUT_S
+        self._lock = threading.Lock()
+        self._waiters = []  # heap of (rows, seq, entry)
+        self._seq = itertools.count()
+        self.rows_in_flight = 0
+        self.bytes_in_flight = 0
+        self.requests_in_flight = 0
+        self.counters = dict.fromkeys(["admitted", "queued", "shed_queue_full", "shed_timeout"], 0)
+        self.max_queue_depth = 0
+        self._rows_per_s = None  # EWMA of observed scoring throughput
+
+    def _fits(self, rows, nbytes):
+        if self.requests_in_flight == 0:
+            return True
+        return self.rows_in_flight + rows <= self.max_rows and self.bytes_in_flight + nbytes <= self.max_bytes
+
+    def _take(self, rows, nbytes):
+        self.rows_in_flight += rows
+        self.bytes_in_flight += nbytes
+        self.requests_in_flight += 1
+        self.counters["admitted"] += 1
+        return Ticket(rows, nbytes)
+
+    def retry_after(self):
+        """Seconds until the current backlog has likely drained (1-60)."""
+        backlog = self.rows_in_flight + sum(rows for rows, _, _ in self._waiters)
+        rate = self._rows_per_s or 50_000.0
+        return int(min(60, max(1, math.ceil(backlog / rate))))
+
+    async def acquire(self, rows, nbytes):
+        """Waits for budget and returns a Ticket; raises Overloaded when shed."""
+        with self._lock:
+            if not self._waiters and self._fits(rows, nbytes):
+                return self._take(rows, nbytes)
+            if len(self._waiters) >= self.queue_size:
+                self.counters["shed_queue_full"] += 1
+                raise Overloaded("queue full", self.retry_after())
+            loop = asyncio.get_running_loop()
+            entry = {"future": loop.create_future(), "loop": loop, "rows": rows, "nbytes": nbytes, "ticket": None}
+            heapq.heappush(self._waiters, (rows, next(self._seq), entry))
+            self.counters["queued"] += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+            # A newcomer smaller than the current head may fit right away
+            self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(entry["future"]), self.queue_timeout_s)
+        except asyncio.TimeoutError:
+            if self._abandon(entry, shed_reason="shed_timeout"):
+                raise Overloaded("queue wait timed out", self.retry_after())
+        except asyncio.CancelledError:
+            # Client went away while queued: never leak a ticket granted in the meantime
+            if not self._abandon(entry):
+                self.release(entry["ticket"])
+            raise
+        return entry["ticket"]
+
+    def _abandon(self, entry, shed_reason=None):
+        """Removes a still-waiting entry from the queue; False if it was admitted meanwhile."""
+        with self._lock:
+            if entry["ticket"] is not None:
+                return False
+            self._waiters = [w for w in self._waiters if w[2] is not entry]
+            heapq.heapify(self._waiters)
+            if shed_reason:
+                self.counters[shed_reason] += 1
+            return True
+
+    def _dispatch(self):
+        """Admits queued requests that fit, smallest first (caller holds the lock)."""
+        while self._waiters and self._fits(self._waiters[0][0], self._waiters[0][2]["nbytes"]):
+            _, _, entry = heapq.heappop(self._waiters)
+            entry["ticket"] = self._take(entry["rows"], entry["nbytes"])
+            entry["loop"].call_soon_threadsafe(_resolve, entry["future"])
+
+    def release(self, ticket):
+        """Returns a ticket's budget and admits the queued requests that now fit."""
+        with self._lock:
+            if ticket is None or ticket.released:
+                return
+            ticket.released = True
+            self.rows_in_flight -= ticket.rows
+            self.bytes_in_flight -= ticket.nbytes
+            self.requests_in_flight -= 1
+            elapsed = time.monotonic() - ticket.admitted_at
+            if elapsed > 0:
+                rate = ticket.rows / elapsed
+                self._rows_per_s = rate if self._rows_per_s is None else 0.8 * self._rows_per_s + 0.2 * rate
+            self._dispatch()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rows_in_flight": self.rows_in_flight,
+                "bytes_in_flight": self.bytes_in_flight,
+                "requests_in_flight": self.requests_in_flight,
+                "queue_depth": len(self._waiters),
+                "max_queue_depth": self.max_queue_depth,
+                **self.counters,
+                "shed_total": self.counters["shed_queue_full"] + self.counters["shed_timeout"],
+                "throughput_rows_per_s": round(self._rows_per_s, 1) if self._rows_per_s else None,
+                "budget": {"max_rows": self.max_rows, "max_bytes": self.max_bytes,
+                           "queue_size": self.queue_size, "queue_timeout_s": self.queue_timeout_s},
+            }
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
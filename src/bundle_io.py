@@ -0,0 +1,249 @@
+"""
+Versioned model bundle: a directory with a small JSON manifest (metadata, features,
+checksums, library versions) next to an uncompressed joblib payload that can be
+memory-mapped. Metadata is read without touching the model; the payload is loaded on
+first use and verified against its checksum. Legacy single-file `.joblib` bundles
+still load through `load_bundle`.
+
+    python -m src.bundle_io convert models/production_pipeline_bundle.joblib models/production_bundle
+    python -m src.bundle_io inspect models/production_bundle
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import threading
+import time
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+PAYLOAD_FILE = "payload.joblib"
+# Libraries recorded in the manifest when the writer has them imported
+TRACKED_LIBRARIES = ["numpy", "pandas", "scipy", "sklearn", "joblib", "xgboost", "lightgbm", "catboost"]
+# A lazy payload load retries against the current manifest when the bundle is rewritten under it
+RELOAD_ATTEMPTS = 3
+RELOAD_WAIT_S = 0.05
+
+
+class BundleIntegrityError(ValueError):
+    """The payload on disk does not match the checksum in its manifest."""
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def library_versions():
+    versions = {"python": platform.python_version()}
+    for name in TRACKED_LIBRARIES:
+        module = sys.modules.get(name)
+        if module is not None:
+            versions[name] = getattr(module, "__version__", "unknown")
+    return versions
+
+
+def is_bundle_dir(path):
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def swap_in_progress(path):
+    """True while `write_bundle` has moved the bundle at `path` aside and not yet renamed its successor in."""
+    return not os.path.exists(path) and bool(glob.glob(f"{glob.escape(path)}.old-*"))
+
+
+def write_bundle(path, pipeline, metadata, **fields):
+    """
+    Writes `pipeline` + `metadata` (and top-level `fields`, e.g. auc_score) as a bundle
+    directory. It is assembled next to `path` and swapped in with renames, so readers
+    never see a half-written bundle; between the two renames `path` is missing (see
+    `swap_in_progress`).
+    """
+    import joblib
+
+    start = time.perf_counter()
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    staging = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    # compress=0 keeps numpy arrays raw and aligned: loadable with mmap_mode='r'
+    payload_path = os.path.join(staging, PAYLOAD_FILE)
+    joblib.dump({'pipeline': pipeline}, payload_path, compress=0)
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "fields": fields,
+        "metadata": metadata,
+        "features": metadata.get('features', []),
+        "payload": {"file": PAYLOAD_FILE, "bytes": os.path.getsize(payload_path),
+                    "sha256": file_sha256(payload_path)},
+        "libraries": library_versions(),
+    }
+    with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, default=float)
+
+    previous = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.replace(path, previous)
+    os.replace(staging, path)
+    shutil.rmtree(previous, ignore_errors=True)
+    logger.info("📦 Bundle written to %s (%.1f KB payload) in %.2fs", path,
+                manifest["payload"]["bytes"] / 1024, time.perf_counter() - start)
+    return path
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version", 0) > BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Bundle format {manifest['format_version']} at {path} is newer than this code "
+                         f"supports ({BUNDLE_FORMAT_VERSION})")
+    return manifest
+
+
+class Bundle(Mapping):
+    """
+    Read-only bundle view with the legacy dict keys ('pipeline', 'metadata', 'auc_score', ...).
+    Everything but 'pipeline' comes from the manifest; the payload is checksummed and
+    loaded on first access to 'pipeline' (or `load()`). `on_load(pipeline)` runs once after that.
+    """
+
+    def __init__(self, path, mmap_mode=None, verify=True, on_load=None):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self.verify = verify
+        self.on_load = on_load
+        self.manifest = read_manifest(path)
+        self._values = {**self.manifest.get("fields", {}), 'metadata': self.manifest.get("metadata", {})}
+        self._pipeline = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._pipeline is not None
+
+    def load(self):
+        if self._pipeline is None:
+            with self._lock:
+                if self._pipeline is None:
+                    self._pipeline = self._load_payload()
+        return self._pipeline
+
+    def _load_payload(self):
+        """
+        Loads the payload of the manifest this view holds. If the bundle was rewritten since
+        that manifest was read (payload gone mid-swap, or a new payload that fails the old
+        checksum), the current manifest is re-read and its payload loaded instead.
+        """
+        for attempt in range(RELOAD_ATTEMPTS):
+            try:
+                return self._load_manifest_payload()
+            except (FileNotFoundError, BundleIntegrityError):
+                if attempt == RELOAD_ATTEMPTS - 1:
+                    raise
+                time.sleep(RELOAD_WAIT_S * (attempt + 1))  # write_bundle swaps directories in two renames
+                try:
+                    manifest = read_manifest(self.path)
+                except FileNotFoundError:
+                    continue
+                if manifest["payload"] == self.manifest["payload"]:
+                    raise  # same payload as before: genuinely missing or corrupt
+                logger.info("🔄 Bundle %s was rewritten while loading: using its new manifest", self.path)
+                self.manifest = manifest
+                self._values = {**manifest.get("fields", {}), 'metadata': manifest.get("metadata", {})}
+
+    def _load_manifest_payload(self):
+        import joblib
+
+        payload = self.manifest["payload"]
+        payload_path = os.path.join(self.path, payload["file"])
+        if self.verify and file_sha256(payload_path) != payload["sha256"]:
+            raise BundleIntegrityError(f"Checksum mismatch for {payload_path}: the bundle is corrupt or was modified")
+        pipeline = joblib.load(payload_path, mmap_mode=self.mmap_mode)['pipeline']
+        recorded, installed = self.manifest.get("libraries", {}), library_versions()
+        drift = {name: (recorded[name], installed[name]) for name in recorded
+                 if name != "python" and name in installed and recorded[name] != installed[name]}
+        if drift:
+            logger.warning("⚠️ Bundle %s was written with different library versions (written, installed): %s",
+                           self.path, drift)
+        if self.on_load is not None:
+            self.on_load(pipeline)
+        return pipeline
+
+    def __getitem__(self, key):
+        if key == 'pipeline':
+            return self.load()
+        return self._values[key]
+
+    def __iter__(self):
+        yield 'pipeline'
+        yield from self._values
+
+    def __len__(self):
+        return len(self._values) + 1
+
+
+def load_bundle(path, mmap_mode=None, verify=True, on_load=None):
+    """A lazy `Bundle` for a bundle directory, or the eagerly loaded dict of a legacy .joblib file."""
+    if os.path.isdir(path):
+        return Bundle(path, mmap_mode=mmap_mode, verify=verify, on_load=on_load)
+    import joblib
+    bundle = joblib.load(path, mmap_mode=mmap_mode)
+    if on_load is not None and isinstance(bundle, dict) and bundle.get('pipeline') is not None:
+        on_load(bundle['pipeline'])
+    return bundle
+
+
+def bundle_metadata(path):
+    """Metadata only: a manifest read for bundle directories (legacy files must be unpickled)."""
+    if is_bundle_dir(path):
+        return read_manifest(path).get("metadata", {})
+    return load_bundle(path).get('metadata', {})
+
+
+def save_bundle(path, bundle):
+    """Writes a legacy-shaped bundle dict ({'pipeline', 'metadata', ...}) in the directory format."""
+    fields = {k: v for k, v in bundle.items() if k not in ('pipeline', 'metadata')}
+    return write_bundle(path, bundle['pipeline'], bundle.get('metadata', {}), **fields)
+
+
+def convert_legacy(source, destination):
+    """Rewrites a legacy single-file bundle in the directory format."""
+    return save_bundle(destination, load_bundle(source))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or convert ChurnAI model bundles")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="Legacy .joblib bundle -> bundle directory")
+    convert.add_argument("source")
+    convert.add_argument("destination")
+    inspect = sub.add_parser("inspect", help="Print a bundle's manifest and verify its payload checksum")
+    inspect.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        print(f"✅ Converted {args.source} -> {convert_legacy(args.source, args.destination)}")
+        return
+    manifest = read_manifest(args.path)
+    payload_path = os.path.join(args.path, manifest["payload"]["file"])
+    manifest["payload"]["verified"] = file_sha256(payload_path) == manifest["payload"]["sha256"]
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,11 @@ class Config:
     # Model Paths
     MODELS_DIR = os.path.join(BASE_DIR, "models")
     BEST_MODEL_PATH = os.path.join(MODELS_DIR, "best_model.joblib")
+    SCALER_PATH = os.path.join(MODELS_DIR, "scaler.joblib")
+    # Champion bundle: manifest.json + mmap-able payload (src/bundle_io.py); the legacy
+    # single-file pickle is still served when no bundle directory exists
+    PRODUCTION_BUNDLE_PATH = os.path.join(MODELS_DIR, "production_bundle")
+    LEGACY_BUNDLE_PATH = os.path.join(MODELS_DIR, "production_pipeline_bundle.joblib")
     
     # Output Paths
     FIGURES_DIR = os.path.join(BASE_DIR, "outputs", "figures")
@@ -18,6 +23,129 @@ class Config:
     CHURN_REPORT_PATH = os.path.join(REPORTS_DIR, "high_risk_customers.csv")
     BENCHMARK_REPORT_PATH = os.path.join(REPORTS_DIR, "algorithm_benchmark.csv")
     
+    # Logging (shared queue-based subsystem, see src/logging_config.py)
+    LOG_LEVEL = os.environ.get("CHURNAI_LOG_LEVEL", "INFO").upper()
+    LOG_SAMPLE_RATE = float(os.environ.get("CHURNAI_LOG_SAMPLE_RATE", "0.01"))
+    API_LOG_PATH = os.path.join(BASE_DIR, "backend_debug.log")
+    TRAINING_LOG_PATH = os.path.join(REPORTS_DIR, "training.log")
+    PRODUCTION_LOG_PATH = os.path.join(REPORTS_DIR, "production.log")
+    
+    # Performance Baselines
+    LOAD_TEST_REPORT_PATH = os.path.join(REPORTS_DIR, "load_test_baseline.json")
+    MICROBENCH_REPORT_PATH = os.path.join(REPORTS_DIR, "microbench.json")
+    MICROBENCH_BASELINE_PATH = os.path.join(REPORTS_DIR, "microbench_baseline.json")
+    MEMORY_REPORT_PATH = os.path.join(REPORTS_DIR, "memory_report.json")
+    
+    # Model Feature Sets (engineered frame -> preprocessing pipeline)
+    NUM_FEATURES = ['tenure', 'MonthlyCharges', 'TotalCharges', 'clv_proxy', 'price_sensitivity', 'service_count']
+    CAT_FEATURES = ['gender', 'SeniorCitizen', 'Partner', 'Dependents', 'Contract', 'PaymentMethod', 'tenure_bin']
+    
+    # Out-of-Core Training (src/incremental_training.py)
+    OOC_CHUNK_SIZE = 100_000
+    OOC_XGB_ROUNDS = 200
+    OOC_LGBM_ROUNDS_PER_CHUNK = 20
+    
+    # Model Registry (champion/challenger serving, see src/model_registry.py)
+    MODEL_REGISTRY_DIR = os.path.join(MODELS_DIR, "registry")
+    MODEL_TRAFFIC_SPLIT = os.environ.get("CHURNAI_TRAFFIC_SPLIT", "")  # e.g. "production=90,challenger=10"
+    SHADOW_MODEL_VERSION = os.environ.get("CHURNAI_SHADOW_MODEL", "")
+    SHADOW_SAMPLE_RATE = float(os.environ.get("CHURNAI_SHADOW_SAMPLE_RATE", "0.1"))
+    SHADOW_WORKERS = int(os.environ.get("CHURNAI_SHADOW_WORKERS", "2"))
+    SHADOW_MAX_PENDING = int(os.environ.get("CHURNAI_SHADOW_MAX_PENDING", "8"))  # queued + running shadow jobs
+    
+    # Multi-Worker Serving (serve.py)
+    WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    MODEL_MMAP_MODE = os.environ.get("CHURNAI_MODEL_MMAP", "") or None  # "r" maps bundle arrays read-only
+    WORKER_MEMORY_REPORT_PATH = os.path.join(REPORTS_DIR, "worker_memory.json")
+    WORKER_MIN_UPTIME_S = float(os.environ.get("CHURNAI_WORKER_MIN_UPTIME_S", "10"))  # shorter = a quick failure
+    WORKER_RESPAWN_BACKOFF_S = float(os.environ.get("CHURNAI_WORKER_RESPAWN_BACKOFF_S", "0.5"))  # doubles per quick failure
+    WORKER_RESPAWN_BACKOFF_MAX_S = float(os.environ.get("CHURNAI_WORKER_RESPAWN_BACKOFF_MAX_S", "30"))
+    WORKER_MAX_QUICK_FAILURES = int(os.environ.get("CHURNAI_WORKER_MAX_QUICK_FAILURES", "5"))  # in a row, then give up
+    
+    # Streaming Responses (src/serving.py)
+    STREAM_CHUNK_ROWS = 10_000
+    
+    # Server-Side Results (src/result_store.py)
+    RESULT_STORE_TTL_S = int(os.environ.get("CHURNAI_RESULT_TTL_S", "1800"))
+    RESULT_STORE_MAX_RESULTS = 64
+    RESULT_STORE_MAX_BYTES = 256 * 1024 * 1024
+    RESULTS_PAGE_SIZE = 100
+    RESULTS_MAX_PAGE_SIZE = 1000
+    
+    # Response Cache (src/response_cache.py): finished JSON responses keyed by upload sha256 + model
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("CHURNAI_RESPONSE_CACHE_MB", "128")) * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRIES = 256
+    PRECOMPUTE_SAMPLE_RESPONSE = os.environ.get("CHURNAI_PRECOMPUTE_SAMPLE", "1") == "1"
+    SAMPLE_DATA_PATH = RAW_DATA_PATH
+    
+    # Admission Control (src/admission.py): per-container budgets, split across WEB_CONCURRENCY workers
+    ADMISSION_MAX_ROWS_IN_FLIGHT = int(os.environ.get("CHURNAI_MAX_ROWS_IN_FLIGHT", "1000000"))
+    ADMISSION_MAX_BYTES_IN_FLIGHT = int(os.environ.get("CHURNAI_MAX_UPLOAD_MB_IN_FLIGHT", "512")) * 1024 * 1024
+    ADMISSION_QUEUE_SIZE = int(os.environ.get("CHURNAI_ADMISSION_QUEUE", "32"))
+    ADMISSION_QUEUE_TIMEOUT_S = float(os.environ.get("CHURNAI_ADMISSION_TIMEOUT_S", "30"))
+    ADMISSION_EST_BYTES_PER_ROW = 25  # compressed / Arrow uploads: conservative rows-per-byte estimate
+    
+    # API Cold Start (see benchmarks/startup.py)
+    API_BACKGROUND_WARMUP = os.environ.get("CHURNAI_WARMUP", "1") == "1"
+    STARTUP_REPORT_PATH = os.path.join(REPORTS_DIR, "startup.json")
+    # Import-time budgets per entry point (ms, cumulative `-X importtime` of the module)
+    STARTUP_BUDGET_MS = {"app": 450, "main": 1200, "training_pipeline": 1500}
+    # Libraries an entry point must not import eagerly
+    STARTUP_FORBIDDEN_MODULES = {
+        "app": ["pandas", "numpy", "sklearn", "xgboost", "lightgbm", "catboost", "matplotlib", "seaborn"],
+        "main": ["xgboost", "lightgbm", "catboost", "matplotlib", "seaborn"],
+    }
+    
+    # CPU Thread Budget (src/cpu_budget.py)
+    CPU_LIMIT = int(os.environ.get("CHURNAI_CPUS", "0"))  # 0 = detect from affinity / cgroup quota
+    BENCHMARK_PARALLEL_MODELS = int(os.environ.get("CHURNAI_PARALLEL_MODELS", "1"))
+    
+    # Incremental Scoring (main.py --mode predict --incremental)
+    # customerID -> (row content hash, last score) plus the model fingerprint it was scored with
+    SCORE_INDEX_PATH = os.path.join(REPORTS_DIR, "score_index.parquet")
+    
+    # EDA Figures (src/visualization.py)
+    FIGURE_DPI = int(os.environ.get("CHURNAI_FIGURE_DPI", "300"))
+    FIGURE_CHUNK_ROWS = 500_000
+    FIGURE_KDE_MAX_POINTS = 200_000  # tenure KDE is fitted on a proportional sample above this
+    FIGURE_CACHE_PATH = os.path.join(FIGURES_DIR, "figure_cache.json")
+    
+    # Customer Store (src/customer_store.py): offline scores served by GET /api/customers/{id}
+    CUSTOMER_STORE_PATH = os.environ.get("CHURNAI_CUSTOMER_STORE", os.path.join(REPORTS_DIR, "customer_scores.sqlite"))
+    CUSTOMER_STORE_BATCH_ROWS = 50_000  # rows scored and inserted per transaction
+    # Segment cube (src/segment_cube.py): written by customer-base runs, served by /api/segments
+    SEGMENT_CUBE_PATH = os.environ.get("CHURNAI_SEGMENT_CUBE", os.path.join(REPORTS_DIR, "segment_cube.parquet"))
+    SEGMENT_CUBE_MAX_CUSTOMERS = int(os.environ.get("CHURNAI_SEGMENT_CUBE_MAX_CUSTOMERS", "5000000"))  # ~100 B each
+    
+    # Profiling (src/profiling.py): opt-in sampling profiler, speedscope + hot-spot output
+    PROFILE_DIR = os.path.join(REPORTS_DIR, "profiles")
+    PROFILE_ADMIN_TOKEN = os.environ.get("CHURNAI_PROFILE_TOKEN", "")  # X-Profile header value; empty disables the header
+    PROFILE_SAMPLE_RATE = float(os.environ.get("CHURNAI_PROFILE_SAMPLE_RATE", "0"))  # fraction of /api/predict requests
+    PROFILE_STAGES = os.environ.get("CHURNAI_PROFILE", "0") == "1"  # training entry points (or --profile)
+    PROFILE_INTERVAL_S = 0.005
+    PROFILE_TOP_FUNCTIONS = 25
+    
+    # Early Stopping (src/early_stopping.py): boosted models stop when validation AUC plateaus
+    EARLY_STOPPING = os.environ.get("CHURNAI_EARLY_STOPPING", "0") == "1"  # or --early-stopping
+    EARLY_STOPPING_ROUNDS = int(os.environ.get("CHURNAI_EARLY_STOPPING_ROUNDS", "20"))
+    EARLY_STOPPING_VALIDATION_FRACTION = 0.15  # carved from the training partition
+    
+    # Resource-Aware Champion Selection (src/model_costs.py): 0 leaves a budget unbounded
+    CHAMPION_MAX_ROW_LATENCY_MS = float(os.environ.get("CHURNAI_MAX_ROW_LATENCY_MS", "0"))
+    CHAMPION_MAX_BATCH_LATENCY_MS = float(os.environ.get("CHURNAI_MAX_BATCH_LATENCY_MS", "0"))  # BENCHMARK_BATCH_ROWS rows
+    CHAMPION_MAX_TRAIN_RSS_MB = float(os.environ.get("CHURNAI_MAX_TRAIN_RSS_MB", "0"))
+    CHAMPION_MAX_MODEL_MB = float(os.environ.get("CHURNAI_MAX_MODEL_MB", "0"))
+    BENCHMARK_BATCH_ROWS = 10_000
+    BENCHMARK_LATENCY_REPEATS = 50  # single-row timings per candidate (median reported)
+    BENCHMARK_BATCH_REPEATS = 3
+    
+    # Champion -> Student Distillation (src/distillation.py): the student serves if its AUC is within tolerance
+    DISTILLATION = os.environ.get("CHURNAI_DISTILL") == "1"
+    DISTILLATION_STUDENT = os.environ.get("CHURNAI_DISTILL_STUDENT", "gbm")  # "gbm" or "logistic"
+    DISTILLATION_AUC_TOLERANCE = float(os.environ.get("CHURNAI_DISTILL_AUC_TOLERANCE", "0.005"))
+    DISTILLATION_TEACHER_VERSION = "teacher"  # registry version keeping the champion when the student ships
+    DISTILLATION_REPORT_PATH = os.path.join(REPORTS_DIR, "distillation.json")
+    
     # Random State
     RANDOM_STATE = 42
     TEST_SIZE = 0.2
@@ -0,0 +1,101 @@
+import logging
+import math
+import os
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Environment knobs read by the native thread pools when their library is first loaded
+THREAD_ENV_VARS = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                   "BLIS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"]
+
+
+def cgroup_cpu_limit():
+    """CPU quota of the container in cores (cgroup v2 cpu.max or v1 CFS), None when unlimited."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus():
+    """
+    Cores this process may actually use: CHURNAI_CPUS if set, otherwise the smaller of
+    the CPU affinity mask and the (rounded-up) cgroup quota. Always at least 1.
+    """
+    if Config.CPU_LIMIT:
+        return max(1, int(Config.CPU_LIMIT))
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_limit()
+    if quota:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def threads_per_task(parallel_tasks=1, processes=1):
+    """Threads each task may use when `parallel_tasks` run at once in each of `processes` processes."""
+    return max(1, available_cpus() // max(1, processes * parallel_tasks))
+
+
+def apply_estimator_threads(estimator, n_threads):
+    """
+    Sets the parallelism parameter of an estimator, or of every step of a Pipeline /
+    ColumnTransformer: n_jobs (sklearn, XGBoost, LightGBM) or thread_count (CatBoost).
+    """
+    if estimator is None:
+        return estimator
+    for _, step in getattr(estimator, "steps", []):
+        apply_estimator_threads(step, n_threads)
+    for _, transformer, _ in getattr(estimator, "transformers", []):
+        if hasattr(transformer, "get_params"):
+            apply_estimator_threads(transformer, n_threads)
+
+    if type(estimator).__module__.startswith("catboost"):
+        estimator.set_params(thread_count=n_threads)
+    elif hasattr(estimator, "get_params") and "n_jobs" in estimator.get_params(deep=False):
+        estimator.set_params(n_jobs=n_threads)
+    return estimator
+
+
+def limit_native_threads(n_threads):
+    """
+    Caps BLAS / OpenMP pools at `n_threads`: environment defaults for libraries not loaded
+    yet (an explicit user setting wins), and threadpoolctl for the ones already loaded.
+    """
+    for var in THREAD_ENV_VARS:
+        os.environ.setdefault(var, str(n_threads))
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return None
+    return threadpool_limits(limits=n_threads)
+
+
+def configure_threads(role="training", parallel_tasks=1):
+    """
+    Entry-point hook. 'serving' divides the cores between the WEB_CONCURRENCY workers on
+    the host; 'training' divides them between `parallel_tasks` concurrently fitted models.
+    Returns the per-task thread budget.
+    """
+    processes = Config.WEB_CONCURRENCY if role == "serving" else 1
+    n_threads = threads_per_task(parallel_tasks, processes)
+    limit_native_threads(n_threads)
+    logger.debug("CPU budget (%s): %d cores available, %d process(es) x %d task(s) -> %d thread(s) each",
+                 role, available_cpus(), processes, parallel_tasks, n_threads)
+    return n_threads
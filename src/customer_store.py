@@ -0,0 +1,182 @@
+"""
+Offline-scored customer table: the whole customer base scored with the current champion
+and written to an indexed SQLite file keyed by customerID. The API answers
+`GET /api/customers/{id}` with one primary-key lookup; the model is never touched.
+A scoring run builds a new file next to the live one and swaps it in with a rename, so
+readers see either the previous table or the new one, never a half-written one. The same
+run writes the segment cube snapshot behind `GET /api/segments`.
+
+    python -m src.customer_store                         # scores Config.RAW_DATA_PATH
+    python -m src.customer_store --input customers.parquet --version challenger
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Same fields as a /api/predict row (src/serving.py OUTPUT_COLUMNS)
+STORE_COLUMNS = [
+    ("customer_id", "TEXT PRIMARY KEY"), ("tenure_months", "NUMERIC"), ("monthly_charges", "REAL"),
+    ("churn_probability", "REAL"), ("risk_level", "TEXT"), ("risk_timeframe", "TEXT"),
+    ("risk_color", "TEXT"), ("primary_reason", "TEXT"), ("contract_type", "TEXT"),
+]
+COLUMN_NAMES = [name for name, _ in STORE_COLUMNS]
+
+
+def write_store(frames, path=None, **meta):
+    """
+    Writes prediction frames (an iterable, inserted one transaction each) and `meta`
+    key/values to a new SQLite file, then atomically replaces `path` with it.
+    A customer listed twice keeps its last row. Returns the number of customers stored.
+    """
+    path = path or Config.CUSTOMER_STORE_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        # A private file until the rename: no journal needed, one fsync at the end
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        # WITHOUT ROWID: rows live in the primary-key b-tree, a lookup is a single index walk
+        conn.execute(f"CREATE TABLE customers ({', '.join(f'{n} {t}' for n, t in STORE_COLUMNS)}) WITHOUT ROWID")
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        insert = f"INSERT OR REPLACE INTO customers VALUES ({', '.join('?' * len(COLUMN_NAMES))})"
+        for frame in frames:
+            # tolist() gives native Python scalars, which sqlite3 binds directly
+            conn.executemany(insert, zip(*(frame[name].tolist() for name in COLUMN_NAMES)))
+            conn.commit()
+        rows = conn.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+        meta = {**meta, "rows": rows, "scored_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        # JSON-encoded, so readers get numbers back as numbers
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [(k, json.dumps(v)) for k, v in meta.items()])
+        conn.commit()
+    finally:
+        conn.close()
+
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return rows
+
+
+def score_customer_base(data_path=None, path=None, version=None, registry=None, cube_path=None):
+    """
+    Scores every customer in `data_path` with a registry version (production by default)
+    and swaps the result in as the customer store. Production runs also fold each scored
+    chunk into a new segment cube snapshot (src/segment_cube.py). Returns the store metadata.
+    """
+    from features.feature_engineering import engineer_enterprise_features
+    from src.data_loader import load_data
+    from src.model_registry import ModelRegistry, PRODUCTION_VERSION
+    from src.segment_cube import SegmentCube
+    from src.serving import score_chunks
+
+    start = time.perf_counter()
+    data_path = data_path or Config.RAW_DATA_PATH
+    version = version or PRODUCTION_VERSION
+    registry = registry or ModelRegistry()
+    if registry.get(version) is None:
+        raise FileNotFoundError(f"No model bundle for version '{version}'. Train one first (python main.py).")
+
+    df_eng = engineer_enterprise_features(load_data(data_path))
+    chunks = score_chunks(df_eng, lambda part: registry.predict_proba(version, part),
+                          chunk_rows=Config.CUSTOMER_STORE_BATCH_ROWS)
+    # /api/segments follows the production model: other versions only build an explicit cube_path
+    cube = SegmentCube() if cube_path or version == PRODUCTION_VERSION else None
+    if cube is not None:
+        chunks = cube.track(chunks, df_eng)
+    meta = {"model_version": version, "model_fingerprint": registry.fingerprint(version),
+            "source": os.path.basename(data_path)}
+    meta["rows"] = write_store((frame for frame, _ in chunks), path, **meta)
+    if cube is not None:
+        cube.save(cube_path or Config.SEGMENT_CUBE_PATH, **meta)
+    logger.info("🗄️ Customer store: %d customers scored with '%s' in %.2fs -> %s", meta["rows"], version,
+                time.perf_counter() - start, path or Config.CUSTOMER_STORE_PATH)
+    return meta
+
+
+def _decode(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value  # stores written before values were JSON-encoded
+
+
+class CustomerStore:
+    """
+    Read-only lookups against the customer store. Each thread keeps its own connection
+    and reopens it when the file on disk is replaced by a newer scoring run.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.CUSTOMER_STORE_PATH
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        self.lookups = 0
+        self.misses = 0
+
+    def _connection(self):
+        """(connection, meta) for the current file; raises FileNotFoundError before the first run."""
+        stat = os.stat(self.path)
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        local = self._local
+        if getattr(local, "signature", None) != signature:
+            if getattr(local, "conn", None) is not None:
+                local.conn.close()
+            local.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            local.meta = {key: _decode(value) for key, value in local.conn.execute("SELECT key, value FROM meta")}
+            local.signature = signature
+        return local.conn, local.meta
+
+    def lookup(self, customer_id):
+        """The stored prediction row for `customer_id` plus the run it came from, or None."""
+        conn, meta = self._connection()
+        row = conn.execute(f"SELECT {', '.join(COLUMN_NAMES)} FROM customers WHERE customer_id = ?",
+                           (str(customer_id),)).fetchone()
+        with self._counter_lock:
+            self.lookups += 1
+            if row is None:
+                self.misses += 1
+        if row is None:
+            return None
+        return {**dict(zip(COLUMN_NAMES, row)), "model_version": meta.get("model_version"),
+                "scored_at": meta.get("scored_at")}
+
+    def metadata(self):
+        return dict(self._connection()[1])
+
+    def stats(self):
+        with self._counter_lock:
+            stats = {"path": self.path, "lookups": self.lookups, "misses": self.misses}
+        if os.path.exists(self.path):
+            stats.update(self.metadata())
+        return stats
+
+
+def main():
+    import argparse
+
+    from src.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Score the customer base into the ChurnAI customer store")
+    parser.add_argument("--input", default=Config.RAW_DATA_PATH, help="Customer extract (CSV, Parquet, Arrow)")
+    parser.add_argument("--output", default=Config.CUSTOMER_STORE_PATH, help="SQLite store to (re)build")
+    parser.add_argument("--version", default=None, help="Registry version to score with (default: production)")
+    args = parser.parse_args()
+
+    configure_logging(Config.PRODUCTION_LOG_PATH)
+    meta = score_customer_base(args.input, args.output, args.version)
+    print(f"✅ {meta['rows']} customers scored with '{meta['model_version']}' -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
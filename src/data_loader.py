@@ -1,22 +1,67 @@
 import pandas as pd
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from src.io_formats import COLUMNAR_FORMATS, read_columnar, sniff_file
 
-def load_data(filepath):
-    """Loads dataset from the given filepath."""
-    logging.info(f"Loading data from {filepath}")
+# Handlers are installed by the entry point (see src/logging_config.py)
+logger = logging.getLogger(__name__)
+
+# Low-cardinality Telco string columns: stored as category codes instead of Python objects
+CATEGORICAL_COLUMNS = [
+    'gender', 'Partner', 'Dependents', 'PhoneService', 'MultipleLines', 'InternetService',
+    'OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 'TechSupport', 'StreamingTV',
+    'StreamingMovies', 'Contract', 'PaperlessBilling', 'PaymentMethod', 'Churn'
+]
+INTEGER_COLUMNS = ['SeniorCitizen', 'tenure']
+FLOAT_COLUMNS = ['MonthlyCharges', 'TotalCharges']
+
+
+def compact_frame(df):
+    """
+    Downcasts a Telco frame in place: categories for the service/contract flags,
+    smallest integer type for counts and float32 for charges.
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer')
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    return df
+
+
+def load_data(filepath, compact=True):
+    """Loads dataset from the given filepath (CSV, gzip/zstd CSV, Parquet, Arrow or Feather)."""
+    logger.info("Loading data from %s", filepath)
     try:
-        df = pd.read_csv(filepath)
-        
+        fmt = sniff_file(filepath)
+        if fmt in COLUMNAR_FORMATS:
+            df = read_columnar(filepath, fmt)
+        else:
+            # Categories are declared on read so the object columns are never materialized
+            dtype = {col: 'category' for col in CATEGORICAL_COLUMNS} if compact else None
+            compression = fmt if fmt in ('gzip', 'zstd') else None
+            df = pd.read_csv(filepath, dtype=dtype, compression=compression)
+
         # --- Institutional Type Safety (15-Year Standard) ---
         # TotalCharges often contains spaces in the raw CSV
         if 'TotalCharges' in df.columns:
             df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
-            logging.info("TotalCharges converted to numeric (Float64).")
-            
-        logging.info(f"Data loaded successfully with {df.shape[0]} rows and {df.shape[1]} columns.")
+            logger.info("TotalCharges converted to numeric (Float64).")
+
+        if compact:
+            compact_frame(df)
+
+        logger.info("Data loaded successfully with %d rows and %d columns.", df.shape[0], df.shape[1])
         return df
     except Exception as e:
-        logging.error(f"Error loading data: {e}")
+        logger.error("Error loading data: %s", e)
         raise e
+
+
+def bytes_per_row(df):
+    """Deep memory footprint of a frame divided by its row count."""
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
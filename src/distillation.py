@@ -0,0 +1,112 @@
+"""
+Champion -> student distillation. A compact student (a shallow histogram GBM or a
+logistic regression) is fitted on the preprocessed training rows against the champion's
+soft probabilities, then both models are scored on the holdout. The student becomes the
+serving model only if its AUC is within DISTILLATION_AUC_TOLERANCE of the champion's and
+it scores a row faster.
+
+Soft targets use the standard weighted-duplicate construction: every row appears once as
+class 1 with weight p and once as class 0 with weight 1 - p, so an ordinary classifier
+minimizes the cross-entropy against p and the student stays a plain sklearn estimator.
+"""
+import json
+import logging
+import os
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics import accuracy_score, roc_auc_score
+
+from src.config import Config
+from src.model_costs import measure_inference, predict_scores
+
+logger = logging.getLogger(__name__)
+
+# name -> (display name, factory(random_state)); students are deliberately small
+STUDENTS = {
+    "gbm": ("Distilled GBM", lambda seed: _hist_gbm(seed)),
+    "logistic": ("Distilled Logistic Regression", lambda seed: _logistic()),
+}
+
+
+def _hist_gbm(random_state):
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    return HistGradientBoostingClassifier(max_depth=3, max_iter=100, learning_rate=0.1, random_state=random_state)
+
+
+def _logistic():
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(max_iter=1000)
+
+
+def soft_label_set(X, soft):
+    """(X twice, labels 1 then 0, weights p then 1 - p) for fitting on soft probabilities."""
+    soft = np.clip(np.asarray(soft, dtype=np.float64), 0.0, 1.0)
+    X_twice = sparse.vstack([X, X]).tocsr() if sparse.issparse(X) else np.concatenate([X, X])
+    labels = np.concatenate([np.ones(len(soft), dtype=int), np.zeros(len(soft), dtype=int)])
+    return X_twice, labels, np.concatenate([soft, 1.0 - soft])
+
+
+def distill(teacher, X_transfer, student=None, random_state=None):
+    """Fits a student on the teacher's probabilities over `X_transfer`; returns (display name, student)."""
+    student = student or Config.DISTILLATION_STUDENT
+    if student == "gbm" and sparse.issparse(X_transfer):
+        # HistGradientBoosting needs dense rows and the student serves behind the same
+        # preprocessor, so sparse preprocessed features get the logistic student instead
+        logger.warning("⚠️ Sparse preprocessed features: distilling a logistic student instead of a GBM.")
+        student = "logistic"
+    name, factory = STUDENTS[student]
+    model = factory(Config.RANDOM_STATE if random_state is None else random_state)
+    X_twice, labels, weights = soft_label_set(X_transfer, predict_scores(teacher, X_transfer))
+    model.fit(X_twice, labels, sample_weight=weights)
+    return name, model
+
+
+def evaluate(model, X_test, y_test):
+    """Holdout AUC / accuracy plus serving latency and size (src/model_costs.py)."""
+    scores = predict_scores(model, X_test)
+    return {"roc_auc": float(roc_auc_score(y_test, scores)),
+            "accuracy": float(accuracy_score(y_test, (scores > 0.5).astype(int))),
+            **measure_inference(model, X_test)}
+
+
+def run_distillation(teacher_name, teacher, X_train, X_test, y_test, student=None, tolerance=None,
+                     report_path=None):
+    """
+    Distills `teacher`, compares both models on the holdout and writes the report.
+    Returns (student or None when it does not ship, report).
+    """
+    tolerance = Config.DISTILLATION_AUC_TOLERANCE if tolerance is None else tolerance
+    student_name, student = distill(teacher, X_train, student)
+    teacher_metrics = evaluate(teacher, X_test, y_test)
+    # Boosting rounds of a GBM student (n_iter_ of a logistic one counts solver iterations)
+    rounds = int(student.n_iter_) if hasattr(student, "n_trees_per_iteration_") else None
+    student_metrics = {**evaluate(student, X_test, y_test), "best_iteration": rounds}
+    auc_gap = teacher_metrics["roc_auc"] - student_metrics["roc_auc"]
+    # A student only pays off if it is also cheaper to serve (e.g. not when the champion is already linear)
+    faster = student_metrics["latency_row_ms"] < teacher_metrics["latency_row_ms"]
+    shipped = auc_gap <= tolerance and faster
+    report = {
+        "teacher": {"algorithm": teacher_name, **teacher_metrics},
+        "student": {"algorithm": student_name, **student_metrics},
+        "auc_gap": round(auc_gap, 6),
+        "auc_tolerance": tolerance,
+        "fidelity_corr": float(np.corrcoef(predict_scores(teacher, X_test), predict_scores(student, X_test))[0, 1]),
+        "speedup_row": round(teacher_metrics["latency_row_ms"] / max(student_metrics["latency_row_ms"], 1e-9), 2),
+        "speedup_batch": round(teacher_metrics["latency_batch_ms"] / max(student_metrics["latency_batch_ms"], 1e-9), 2),
+        "serving_model": student_name if shipped else teacher_name,
+    }
+
+    report_path = report_path or Config.DISTILLATION_REPORT_PATH
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    if shipped:
+        verdict = "ships as the serving model"
+    else:
+        verdict = "rejected: AUC gap over tolerance" if auc_gap > tolerance else "rejected: not faster than the champion"
+    logger.info(f"🎓 {student_name}: AUC {student_metrics['roc_auc']:.4f} vs {teacher_name} "
+                f"{teacher_metrics['roc_auc']:.4f}, {student_metrics['latency_row_ms']:.3f} vs "
+                f"{teacher_metrics['latency_row_ms']:.3f} ms/row -> {verdict}")
+    return (student if shipped else None), report
@@ -0,0 +1,117 @@
+"""
+Early stopping for the boosted algorithms of the suite. A stratified validation split is
+carved from the training partition once per run; every booster then stops adding rounds
+when its validation AUC has not improved for EARLY_STOPPING_ROUNDS rounds, keeping the
+best round count. Each algorithm's configured round count is the upper bound.
+
+XGBoost, LightGBM and CatBoost use their native early stopping; Gradient Boosting grows
+with warm_start and AdaBoost is truncated at its best stage (staged predictions).
+"""
+import inspect
+from itertools import islice
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from src.config import Config
+
+
+class ValidationSplit:
+    """Fit / validation parts of a training partition, shared by every model of a run."""
+
+    def __init__(self, X, y, fraction=None, random_state=None):
+        self.fraction = fraction or Config.EARLY_STOPPING_VALIDATION_FRACTION
+        self.X_fit, self.X_val, self.y_fit, self.y_val = train_test_split(
+            X, y, test_size=self.fraction, stratify=y,
+            random_state=Config.RANDOM_STATE if random_state is None else random_state)
+
+
+def _fit_xgboost(model, split, patience):
+    model.set_params(eval_metric='auc', early_stopping_rounds=patience)
+    model.fit(split.X_fit, split.y_fit, eval_set=[(split.X_val, split.y_val)], verbose=False)
+    # predict / predict_proba use the best iteration from here on
+    return model.best_iteration + 1
+
+
+def _fit_lightgbm(model, split, patience):
+    import lightgbm
+
+    model.set_params(metric='auc')
+    # LightGBM >= 4.7 takes eval_X / eval_y and deprecates eval_set
+    if "eval_X" in inspect.signature(model.fit).parameters:
+        validation = {"eval_X": (split.X_val,), "eval_y": (split.y_val,)}
+    else:
+        validation = {"eval_set": [(split.X_val, split.y_val)]}
+    model.fit(split.X_fit, split.y_fit, **validation,
+              callbacks=[lightgbm.early_stopping(patience, first_metric_only=True, verbose=False)])
+    return model.best_iteration_ or model.n_estimators
+
+
+def _fit_catboost(model, split, patience):
+    # use_best_model drops the trees after the best iteration from the fitted model
+    model.set_params(eval_metric='AUC', use_best_model=True, early_stopping_rounds=patience)
+    model.fit(split.X_fit, split.y_fit, eval_set=(split.X_val, split.y_val))
+    return model.tree_count_
+
+
+def _best_stage(model, split, start=0):
+    """(1-based stage, AUC) of the best validation AUC among the stages after `start`."""
+    best_stage, best_auc = 0, -np.inf
+    stages = islice(model.staged_predict_proba(split.X_val), start, None)
+    for stage, probs in enumerate(stages, start=start + 1):
+        auc = roc_auc_score(split.y_val, probs[:, 1])
+        if auc > best_auc:
+            best_stage, best_auc = stage, auc
+    return best_stage, best_auc
+
+
+def _fit_gradient_boosting(model, split, patience):
+    cap = model.n_estimators
+    step = max(1, min(10, patience))
+    best_stage, best_auc, grown = 0, -np.inf, 0
+    model.set_params(warm_start=True)
+    while grown < cap and grown - best_stage < patience:
+        previous, grown = grown, min(cap, grown + step)
+        model.set_params(n_estimators=grown).fit(split.X_fit, split.y_fit)
+        stage, auc = _best_stage(model, split, start=previous)
+        if auc > best_auc:
+            best_stage, best_auc = stage, auc
+    model.estimators_ = model.estimators_[:best_stage]
+    model.train_score_ = model.train_score_[:best_stage]
+    model.set_params(n_estimators=best_stage, warm_start=False)
+    if hasattr(model, "n_estimators_"):
+        model.n_estimators_ = best_stage
+    return best_stage
+
+
+def _fit_adaboost(model, split, patience):
+    model.fit(split.X_fit, split.y_fit)
+    best_stage, _ = _best_stage(model, split)
+    model.estimators_ = model.estimators_[:best_stage]
+    model.estimator_weights_ = model.estimator_weights_[:best_stage]
+    model.estimator_errors_ = model.estimator_errors_[:best_stage]
+    model.set_params(n_estimators=best_stage)
+    return best_stage
+
+
+EARLY_STOPPING_FITTERS = {
+    "XGBoost": _fit_xgboost,
+    "LightGBM": _fit_lightgbm,
+    "CatBoost": _fit_catboost,
+    "Gradient Boosting": _fit_gradient_boosting,
+    "AdaBoost": _fit_adaboost,
+}
+
+
+def fit_model(name, model, X_train, y_train, split=None, patience=None):
+    """
+    Fits one suite algorithm and returns the number of boosting rounds it kept, or None.
+    With a ValidationSplit, boosted algorithms train on its fit part and stop early;
+    everything else (and every algorithm without a split) fits the full partition.
+    """
+    fitter = EARLY_STOPPING_FITTERS.get(name)
+    if split is None or fitter is None:
+        model.fit(X_train, y_train)
+        return None
+    return int(fitter(model, split, patience or Config.EARLY_STOPPING_ROUNDS))
@@ -0,0 +1,78 @@
+import gzip
+import io
+
+import pandas as pd
+
+# Leading bytes of each supported container; CSV has no signature and is the fallback
+MAGIC_BYTES = [
+    (b"PAR1", "parquet"),
+    (b"ARROW1", "arrow"),
+    (b"FEA1", "feather_v1"),
+    (b"\xff\xff\xff\xff", "arrow_stream"),
+    (b"\x1f\x8b", "gzip"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+]
+COLUMNAR_FORMATS = {"parquet", "arrow", "feather_v1", "arrow_stream"}
+SUPPORTED_EXTENSIONS = (".csv", ".csv.gz", ".gz", ".csv.zst", ".zst", ".parquet", ".pq",
+                        ".arrow", ".feather", ".ipc")
+
+
+def sniff_format(head):
+    """Identifies an upload from its first bytes: a COLUMNAR_FORMATS entry, 'gzip', 'zstd' or 'csv'."""
+    for magic, fmt in MAGIC_BYTES:
+        if head.startswith(magic):
+            return fmt
+    return "csv"
+
+
+def sniff_file(path):
+    with open(path, "rb") as f:
+        return sniff_format(f.read(8))
+
+
+def decompress(contents, fmt):
+    """Inflates gzip / zstd payloads; other formats are returned unchanged."""
+    if fmt == "gzip":
+        return gzip.decompress(contents)
+    if fmt == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd-compressed uploads need the 'zstandard' package")
+        # Streaming reader: frames written without a content size are still accepted
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(contents)) as reader:
+            return reader.read()
+    return contents
+
+
+def _resolve(names, wanted):
+    """Maps each wanted column to the file's own spelling (case/whitespace-insensitive)."""
+    lookup = {str(n).strip().lower(): n for n in names}
+    return [lookup[w.lower()] for w in wanted if w.lower() in lookup]
+
+
+def read_columnar(source, fmt, columns=None):
+    """
+    Reads Parquet / Arrow IPC (file or stream) / Feather into an Arrow-backed DataFrame.
+    `source` is bytes or a path. Only `columns` (matched case-insensitively) are decoded,
+    and numeric/string buffers are wrapped as pd.ArrowDtype columns without conversion.
+    """
+    import pyarrow as pa
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = pa.BufferReader(source)
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(source)
+        selected = _resolve(parquet.schema_arrow.names, columns) if columns else None
+        table = parquet.read(columns=selected)
+    elif fmt == "arrow_stream":
+        table = pa.ipc.open_stream(source).read_all()
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(source, memory_map=False)
+
+    if columns and fmt != "parquet":
+        table = table.select(_resolve(table.column_names, columns))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
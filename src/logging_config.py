@@ -0,0 +1,120 @@
+import atexit
+import contextvars
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+from src.config import Config
+
+LOG_FORMAT = '%(asctime)s | %(levelname)s | %(message)s'
+
+_listener = None
+_handlers = []
+_request_sampled = contextvars.ContextVar("request_sampled", default=True)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues a copy of the record with its message and exception text already rendered,
+    as QueueHandler.prepare does, so arguments changed after the log call and traceback
+    frames are never held in the queue. Timestamps, layout and I/O stay on the writer thread.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class _RequestSamplingFilter(logging.Filter):
+    """Drops DEBUG records for requests that were not selected for sampling."""
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or _request_sampled.get()
+
+
+def sample_request_logs(rate=None):
+    """
+    Decides once per request whether its DEBUG lines are kept.
+    Call at the start of a request handler; the decision is scoped to its context.
+    """
+    rate = Config.LOG_SAMPLE_RATE if rate is None else rate
+    sampled = rate >= 1 or random.random() < rate
+    _request_sampled.set(sampled)
+    return sampled
+
+
+def configure_logging(log_file=None, level=None):
+    """
+    Installs the shared logging subsystem on the root logger.
+    All records go through a single in-memory queue; a background QueueListener
+    writes them to stderr and to the process's log file. A later call with another
+    `log_file` replaces the file rather than adding a second one.
+    """
+    global _listener
+    level = level or Config.LOG_LEVEL
+    formatter = logging.Formatter(LOG_FORMAT)
+    # Drain and stop the writer before its handlers change
+    if _listener is not None:
+        _listener.stop()
+
+    if not _handlers:
+        console = logging.StreamHandler(sys.stderr)
+        console.setFormatter(formatter)
+        _handlers.append(console)
+
+    if log_file:
+        log_file = os.path.abspath(log_file)
+        if not any(getattr(h, "baseFilename", None) == log_file for h in _handlers):
+            for previous in [h for h in _handlers if isinstance(h, logging.FileHandler)]:
+                _handlers.remove(previous)
+                previous.close()
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(formatter)
+            _handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(_RequestSamplingFilter())
+
+    root = logging.getLogger()
+    for h in [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        root.removeHandler(h)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *_handlers, respect_handler_level=True)
+    _listener.start()
+    return root
+
+
+def shutdown_logging():
+    """Flushes queued records; registered at exit so nothing is lost on shutdown."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_in_child():
+    # A forked worker inherits the queue handler but not the listener thread
+    global _listener
+    if _listener is not None:
+        _listener = None
+        configure_logging()
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_in_child)
@@ -1,7 +1,6 @@
 import os
 import pandas as pd
 import numpy as np
-import joblib
 import logging
 from sklearn.model_selection import train_test_split
 from sklearn.compose import ColumnTransformer
@@ -12,10 +11,12 @@ from sklearn.metrics import roc_auc_score
 from xgboost import XGBClassifier
 
 from src.config import Config
+from src.bundle_io import save_bundle
+from src.cpu_budget import configure_threads
 from features.feature_engineering import engineer_enterprise_features
 from src.validation import DataValidator
+from src.logging_config import configure_logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
 logger = logging.getLogger("MASTER-TRAINER")
 
 def run_institutional_training():
@@ -73,7 +74,8 @@ def run_institutional_training():
 
     master_pipeline = Pipeline([
         ('prep', preprocessor),
-        ('clf', XGBClassifier(scale_pos_weight=3, eval_metric='logloss', random_state=Config.RANDOM_STATE))
+        ('clf', XGBClassifier(scale_pos_weight=3, eval_metric='logloss', random_state=Config.RANDOM_STATE,
+                              n_jobs=configure_threads("training")))
     ])
 
     # Fit Engine
@@ -103,9 +105,9 @@ def run_institutional_training():
     }
     
     os.makedirs(Config.MODELS_DIR, exist_ok=True)
-    bundle_path = os.path.join(Config.MODELS_DIR, "production_pipeline_bundle.joblib")
-    joblib.dump(bundle, bundle_path)
+    bundle_path = save_bundle(Config.PRODUCTION_BUNDLE_PATH, bundle)
     logger.info("⛳️ [DEPLOYMENT] Masterclass Production Bundle serialized to %s", bundle_path)
 
 if __name__ == "__main__":
+    configure_logging(Config.TRAINING_LOG_PATH)
     run_institutional_training()
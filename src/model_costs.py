@@ -0,0 +1,121 @@
+"""
+Serving and training costs of benchmark candidates, and champion selection under budgets.
+Latencies are for the fitted classifier on already preprocessed rows (the preprocessing
+pipeline is shared by every candidate, so it does not change the ranking).
+"""
+import io
+import logging
+import time
+
+import numpy as np
+
+from src.config import Config
+from src.perf_utils import peak_rss_mb, reset_peak_rss
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_COLUMNS = ["latency_row_ms", "latency_batch_ms", "peak_train_rss_mb", "model_size_mb", "cpu_time_s"]
+# Column -> Config budget; a budget of 0 leaves that resource unbounded
+BUDGETS = {
+    "latency_row_ms": "CHAMPION_MAX_ROW_LATENCY_MS",
+    "latency_batch_ms": "CHAMPION_MAX_BATCH_LATENCY_MS",
+    "peak_train_rss_mb": "CHAMPION_MAX_TRAIN_RSS_MB",
+    "model_size_mb": "CHAMPION_MAX_MODEL_MB",
+}
+
+
+def predict_scores(model, X):
+    """Positive-class scores: probabilities when the model has them, else its predictions."""
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(X)[:, 1]
+    return model.predict(X)
+
+
+class FitMeter:
+    """
+    CPU seconds and peak RSS of the fit inside the `with` block. With `concurrent=True`
+    (several fits at once) CPU is this thread's time only and the peak RSS is not
+    attributable to one model, so it is left as None.
+    """
+
+    def __init__(self, concurrent=False):
+        self.concurrent = concurrent
+        self.cpu_time_s = None
+        self.peak_train_rss_mb = None
+
+    def __enter__(self):
+        self._clock = time.thread_time if self.concurrent else time.process_time
+        self._rss_reset = not self.concurrent and reset_peak_rss()
+        self._cpu_start = self._clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.cpu_time_s = self._clock() - self._cpu_start
+        if self._rss_reset:
+            self.peak_train_rss_mb = round(peak_rss_mb(), 1)
+        return False
+
+
+def _median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def model_size_mb(model):
+    """Size of the model pickled as it is in a bundle payload (joblib, uncompressed)."""
+    import joblib
+
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer, compress=0)
+    return buffer.tell() / 1e6
+
+
+def measure_inference(model, X, batch_rows=None, repeats=None, batch_repeats=None):
+    """Median single-row and `batch_rows`-row scoring latency (ms) plus serialized size (MB)."""
+    batch_rows = batch_rows or Config.BENCHMARK_BATCH_ROWS
+    repeats = repeats or Config.BENCHMARK_LATENCY_REPEATS
+    batch_repeats = batch_repeats or Config.BENCHMARK_BATCH_REPEATS
+    rows = X.iloc if hasattr(X, "iloc") else X
+    row = rows[:1]
+    batch = rows[np.arange(batch_rows) % X.shape[0]]  # the holdout, tiled to the batch size
+    predict_scores(model, row)  # first call pays one-off setup (e.g. booster caches)
+    return {
+        "latency_row_ms": round(_median_ms(lambda: predict_scores(model, row), repeats), 4),
+        "latency_batch_ms": round(_median_ms(lambda: predict_scores(model, batch), batch_repeats), 2),
+        "model_size_mb": round(model_size_mb(model), 4),
+    }
+
+
+def active_budgets():
+    """{column: limit} for every budget set in Config."""
+    return {column: getattr(Config, name) for column, name in BUDGETS.items() if getattr(Config, name)}
+
+
+def within_budget(result, budgets=None):
+    """True when no measured resource exceeds its budget (unmeasured ones do not disqualify)."""
+    budgets = active_budgets() if budgets is None else budgets
+    return all(result.get(column) is None or result[column] <= limit for column, limit in budgets.items())
+
+
+def select_champion(results, budgets=None):
+    """
+    Best AUC among the results within budget, in list order on ties. Falls back to the
+    best AUC overall (with a warning) when no candidate fits. Returns (result, selection
+    info for the bundle metadata).
+    """
+    budgets = active_budgets() if budgets is None else budgets
+    eligible = [result for result in results if within_budget(result, budgets)]
+    fallback = not eligible
+    if fallback:
+        logger.warning("⚠️ No candidate fits the budgets %s: falling back to the best AUC overall.", budgets)
+        eligible = results
+    champion = None
+    for result in eligible:
+        if champion is None or result["roc_auc"] > champion["roc_auc"]:
+            champion = result
+    return champion, {"budgets": budgets, "eligible": [result["algorithm"] for result in eligible if not fallback],
+                      "fallback_to_best_auc": fallback}
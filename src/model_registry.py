@@ -0,0 +1,303 @@
+import glob
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import Config
+from src.bundle_io import (
+    RELOAD_ATTEMPTS, RELOAD_WAIT_S, bundle_metadata, is_bundle_dir, load_bundle, swap_in_progress
+)
+from src.cpu_budget import apply_estimator_threads, threads_per_task
+from src.perf_utils import latency_summary
+
+logger = logging.getLogger(__name__)
+
+PRODUCTION_VERSION = "production"
+
+
+def parse_traffic_split(spec):
+    """'production=90,v3=10' -> {'production': 0.9, 'v3': 0.1}. Empty spec -> {}."""
+    weights = {}
+    for part in filter(None, (p.strip() for p in (spec or "").split(","))):
+        version, _, weight = part.partition("=")
+        weights[version.strip()] = float(weight or 0)
+    total = sum(weights.values())
+    return {v: w / total for v, w in weights.items() if w > 0} if total > 0 else {}
+
+
+class _ModelStats:
+    """Thread-safe rolling latency window plus request/row counters for one version."""
+
+    def __init__(self, window=1000):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rows = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, rows, seconds):
+        with self.lock:
+            self.requests += 1
+            self.rows += rows
+            self.latencies.append(seconds)
+
+    def summary(self):
+        with self.lock:
+            return {"requests": self.requests, "rows": self.rows, "latency": latency_summary(list(self.latencies))}
+
+
+class _ShadowStats(_ModelStats):
+    """Adds agreement counters between a shadow model and the primary it shadowed."""
+
+    def __init__(self, window=1000):
+        super().__init__(window)
+        self.agreeing_rows = 0
+        self.abs_diff_sum = 0.0
+        self.failures = 0
+
+    def record_comparison(self, primary_probs, shadow_probs, seconds):
+        import numpy as np
+        primary_probs = np.asarray(primary_probs)
+        agree = int(np.sum((primary_probs >= 0.5) == (shadow_probs >= 0.5)))
+        diff = float(np.abs(primary_probs - shadow_probs).sum())
+        self.record(len(shadow_probs), seconds)
+        with self.lock:
+            self.agreeing_rows += agree
+            self.abs_diff_sum += diff
+
+    def summary(self):
+        out = super().summary()
+        with self.lock:
+            rows = max(self.rows, 1)
+            out.update({
+                "label_agreement": self.agreeing_rows / rows if self.rows else None,
+                "mean_abs_probability_diff": self.abs_diff_sum / rows if self.rows else None,
+                "failures": self.failures
+            })
+        return out
+
+
+class ModelRegistry:
+    """
+    Keeps several bundle versions loaded side by side.
+    The champion is `production_bundle/` ("production", falling back to the legacy
+    `production_pipeline_bundle.joblib`); challengers are any `<version>/` bundle directory or
+    `<version>.joblib` file in the registry directory. Bundles load lazily on first use.
+    Requests are routed by explicit version (X-Model-Version header) or by the weighted
+    traffic split; a shadow version can score a sampled fraction of traffic on its own pool.
+    """
+
+    def __init__(self, models_dir=None, registry_dir=None, traffic_split=None,
+                 shadow_version=None, shadow_sample_rate=None, shadow_workers=None, mmap_mode=None,
+                 n_threads=None, shadow_max_pending=None):
+        self.models_dir = models_dir or Config.MODELS_DIR
+        self.registry_dir = registry_dir or Config.MODEL_REGISTRY_DIR
+        self.traffic_split = parse_traffic_split(
+            Config.MODEL_TRAFFIC_SPLIT if traffic_split is None else traffic_split)
+        self.shadow_version = Config.SHADOW_MODEL_VERSION if shadow_version is None else shadow_version
+        self.shadow_sample_rate = Config.SHADOW_SAMPLE_RATE if shadow_sample_rate is None else shadow_sample_rate
+        self._shadow_workers = shadow_workers or Config.SHADOW_WORKERS
+        # With mmap_mode='r' the bundle's numpy arrays stay in the page cache, shared by every worker
+        self.mmap_mode = mmap_mode or Config.MODEL_MMAP_MODE
+        # Each API worker gets its share of the host's cores, not all of them
+        self.n_threads = n_threads or threads_per_task(processes=Config.WEB_CONCURRENCY)
+        self._executor = None
+        # Shadow jobs waiting or running; a request is not shadowed when all slots are taken
+        self._shadow_slots = threading.BoundedSemaphore(shadow_max_pending or Config.SHADOW_MAX_PENDING)
+        self.shadow_dropped = 0
+        self._listing = (None, {}, True)  # (directory signature, paths, settled) of the last registry scan
+        self._bundles = {}
+        self._load_lock = threading.Lock()
+        self._stats = {}
+        self._shadow_stats = {}
+
+    def _directory_signature(self):
+        signature = []
+        for directory in (self.models_dir, self.registry_dir):
+            try:
+                stat = os.stat(directory)
+                signature.append((stat.st_ino, stat.st_mtime_ns))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def paths(self):
+        """
+        {version: bundle path} for every bundle (directory or legacy .joblib) currently on disk.
+        The listing is cached until the models or registry directory changes (bundles are
+        written and removed by renames there), so routing costs two stat calls.
+        """
+        signature = self._directory_signature()
+        cached_signature, found, _ = self._listing
+        if signature != cached_signature:
+            found, settled = self._scan()
+            self._listing = (signature, found, settled)
+        return dict(found)
+
+    def _scan(self):
+        """
+        (paths, settled). A production bundle being rewritten is missing between the two
+        renames of `write_bundle`: the scan waits for its successor, and if it is still
+        missing reports settled=False, so a legacy fallback found meanwhile is not cached.
+        """
+        found = {}
+        production_dir = os.path.join(self.models_dir, os.path.basename(Config.PRODUCTION_BUNDLE_PATH))
+        production_file = os.path.join(self.models_dir, os.path.basename(Config.LEGACY_BUNDLE_PATH))
+        settled = True
+        for attempt in range(RELOAD_ATTEMPTS):
+            settled = not swap_in_progress(production_dir)
+            if settled:
+                break
+            time.sleep(RELOAD_WAIT_S * (attempt + 1))
+        if not settled:
+            logger.warning("⚠️ %s is missing with a previous version next to it (interrupted write?)", production_dir)
+        if is_bundle_dir(production_dir):
+            found[PRODUCTION_VERSION] = production_dir
+        elif os.path.exists(production_file):
+            found[PRODUCTION_VERSION] = production_file
+        for path in sorted(glob.glob(os.path.join(self.registry_dir, "*"))):
+            name, ext = os.path.splitext(os.path.basename(path))
+            if is_bundle_dir(path):
+                found.setdefault(os.path.basename(path), path)
+            elif ext == ".joblib":
+                found.setdefault(name, path)
+        return found, settled
+
+    def get(self, version=PRODUCTION_VERSION):
+        """
+        Returns the bundle for `version`, opening it on first use; None if it does not exist.
+        Bundle directories only read their manifest here, the model payload loads on first
+        access to bundle['pipeline'].
+        """
+        bundle = self._bundles.get(version)
+        if bundle is not None:
+            return bundle
+        path = self.paths().get(version)
+        if path is None:
+            return None
+        if version == PRODUCTION_VERSION and not self._listing[2]:
+            # Mid-swap legacy fallback: serve it for this call, but keep asking for the new bundle
+            return load_bundle(path, mmap_mode=self.mmap_mode,
+                               on_load=lambda pipeline: apply_estimator_threads(pipeline, self.n_threads))
+        with self._load_lock:
+            if version not in self._bundles:
+                start = time.perf_counter()
+                self._bundles[version] = load_bundle(
+                    path, mmap_mode=self.mmap_mode,
+                    on_load=lambda pipeline: apply_estimator_threads(pipeline, self.n_threads))
+                logger.info("📦 Model '%s' opened from %s in %.3fs", version, path, time.perf_counter() - start)
+        return self._bundles[version]
+
+    def preload(self):
+        """Loads every version up front (before forking workers, so they share one copy)."""
+        for version in self.paths():
+            self.get(version).get('pipeline')
+        return list(self._bundles)
+
+    def fingerprint(self, version=PRODUCTION_VERSION):
+        """Identifies the exact model behind `version`: the payload checksum, or path + mtime for legacy files."""
+        bundle = self.get(version)
+        if bundle is None:
+            return None
+        manifest = getattr(bundle, "manifest", None)
+        if manifest is not None:
+            return manifest["payload"]["sha256"][:16]
+        path = self.paths()[version]
+        return f"{version}-{os.stat(path).st_mtime_ns}"
+
+    def route(self, requested_version=None):
+        """
+        Picks the version serving a request: the requested one if given,
+        else a weighted draw from the traffic split, else production.
+        Raises KeyError for an unknown requested version.
+        """
+        if requested_version:
+            if requested_version not in self.paths():
+                raise KeyError(requested_version)
+            return requested_version
+        if self.traffic_split:
+            versions = [v for v in self.traffic_split if v in self.paths()]
+            if versions:
+                weights = [self.traffic_split[v] for v in versions]
+                return random.choices(versions, weights=weights)[0]
+        return PRODUCTION_VERSION
+
+    def predict_proba(self, version, frame):
+        """Positive-class probabilities from `version`, with latency recorded."""
+        start = time.perf_counter()
+        probs = self.get(version)['pipeline'].predict_proba(frame)[:, 1]
+        self._stats.setdefault(version, _ModelStats()).record(len(probs), time.perf_counter() - start)
+        return probs
+
+    def maybe_shadow(self, primary_version, frame, primary_probs):
+        """
+        Submits a sampled request to the shadow model on a separate pool.
+        Returns the future (or None); the caller never waits on it.
+        """
+        shadow = self.shadow_version
+        if not shadow or shadow == primary_version or random.random() >= self.shadow_sample_rate:
+            return None
+        if shadow not in self.paths():
+            return None
+        # Bounded: under load a request's frame is dropped rather than queued without limit
+        if not self._shadow_slots.acquire(blocking=False):
+            self.shadow_dropped += 1
+            return None
+        if self._executor is None:
+            with self._load_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._shadow_workers,
+                                                        thread_name_prefix="shadow-scoring")
+        future = self._executor.submit(self._shadow_score, shadow, primary_version, frame, primary_probs)
+        future.add_done_callback(lambda _: self._shadow_slots.release())
+        return future
+
+    def _shadow_score(self, shadow, primary_version, frame, primary_probs):
+        stats = self._shadow_stats.setdefault((shadow, primary_version), _ShadowStats())
+        try:
+            start = time.perf_counter()
+            probs = self.get(shadow)['pipeline'].predict_proba(frame)[:, 1]
+            stats.record_comparison(primary_probs, probs, time.perf_counter() - start)
+        except Exception as e:
+            with stats.lock:
+                stats.failures += 1
+            logger.warning("Shadow scoring with '%s' failed: %s", shadow, e)
+
+    def describe(self):
+        """Versions on disk, routing configuration and per-version / shadow statistics."""
+        versions = []
+        for version, path in self.paths().items():
+            bundle = self._bundles.get(version)
+            if is_bundle_dir(path):
+                # Manifest read: metadata without loading the model
+                metadata = bundle['metadata'] if bundle is not None else bundle_metadata(path)
+            else:
+                metadata = bundle.get('metadata', {}) if bundle else None
+            versions.append({
+                "version": version,
+                "path": os.path.relpath(path, Config.BASE_DIR),
+                "loaded": bundle is not None and getattr(bundle, "loaded", True),
+                "metadata": metadata,
+                "stats": self._stats[version].summary() if version in self._stats else None
+            })
+        return {
+            "versions": versions,
+            "traffic_split": self.traffic_split or {PRODUCTION_VERSION: 1.0},
+            "shadow": {
+                "version": self.shadow_version or None,
+                "sample_rate": self.shadow_sample_rate,
+                "dropped": self.shadow_dropped,
+                "comparisons": [
+                    {"shadow": s, "primary": p, **stats.summary()}
+                    for (s, p), stats in self._shadow_stats.items()
+                ]
+            }
+        }
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -1,35 +1,45 @@
-from sklearn.linear_model import LogisticRegression, RidgeClassifier, SGDClassifier, PassiveAggressiveClassifier, Perceptron
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, AdaBoostClassifier, ExtraTreesClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.svm import SVC, LinearSVC
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.naive_bayes import GaussianNB, BernoulliNB
-from sklearn.discriminant_analysis import LinearDiscriminantAnalysis, QuadraticDiscriminantAnalysis
-from xgboost import XGBClassifier
-from lightgbm import LGBMClassifier
-from catboost import CatBoostClassifier
+import importlib
 
-def get_algorithm_suite(random_state=42):
-    """Returns a dictionary of 20 algorithms curated for this project."""
-    return {
-        "Logistic Regression": LogisticRegression(),
-        "Random Forest": RandomForestClassifier(n_estimators=100, random_state=random_state),
-        "Gradient Boosting": GradientBoostingClassifier(random_state=random_state),
-        "XGBoost": XGBClassifier(use_label_encoder=False, eval_metric='logloss', random_state=random_state),
-        "LightGBM": LGBMClassifier(random_state=random_state, verbose=-1),
-        "CatBoost": CatBoostClassifier(verbose=0, random_state=random_state, allow_writing_files=False),
-        "AdaBoost": AdaBoostClassifier(random_state=random_state),
-        "Decision Tree": DecisionTreeClassifier(random_state=random_state),
-        "Extra Trees": ExtraTreesClassifier(n_estimators=100, random_state=random_state),
-        "SVC (RBF)": SVC(probability=True, random_state=random_state),
-        "Linear SVC": LinearSVC(random_state=random_state),
-        "KNN": KNeighborsClassifier(),
-        "Gaussian NB": GaussianNB(),
-        "Bernoulli NB": BernoulliNB(),
-        "Ridge Classifier": RidgeClassifier(),
-        "SGD Classifier": SGDClassifier(random_state=random_state),
-        "Passive Aggressive": PassiveAggressiveClassifier(random_state=random_state),
-        "Perceptron": Perceptron(random_state=random_state),
-        "LDA": LinearDiscriminantAnalysis(),
-        "QDA": QuadraticDiscriminantAnalysis()
-    }
+from src.cpu_budget import apply_estimator_threads, threads_per_task
+
+# name -> (module, class, constructor kwargs, takes random_state)
+# Libraries are imported only when an algorithm is actually built, so serving and
+# single-model paths never pay for xgboost / lightgbm / catboost they do not use.
+ALGORITHM_SPECS = {
+    "Logistic Regression": ("sklearn.linear_model", "LogisticRegression", {}, False),
+    "Random Forest": ("sklearn.ensemble", "RandomForestClassifier", {"n_estimators": 100}, True),
+    "Gradient Boosting": ("sklearn.ensemble", "GradientBoostingClassifier", {}, True),
+    "XGBoost": ("xgboost", "XGBClassifier", {"use_label_encoder": False, "eval_metric": 'logloss'}, True),
+    "LightGBM": ("lightgbm", "LGBMClassifier", {"verbose": -1}, True),
+    "CatBoost": ("catboost", "CatBoostClassifier", {"verbose": 0, "allow_writing_files": False}, True),
+    "AdaBoost": ("sklearn.ensemble", "AdaBoostClassifier", {}, True),
+    "Decision Tree": ("sklearn.tree", "DecisionTreeClassifier", {}, True),
+    "Extra Trees": ("sklearn.ensemble", "ExtraTreesClassifier", {"n_estimators": 100}, True),
+    "SVC (RBF)": ("sklearn.svm", "SVC", {"probability": True}, True),
+    "Linear SVC": ("sklearn.svm", "LinearSVC", {}, True),
+    "KNN": ("sklearn.neighbors", "KNeighborsClassifier", {}, False),
+    "Gaussian NB": ("sklearn.naive_bayes", "GaussianNB", {}, False),
+    "Bernoulli NB": ("sklearn.naive_bayes", "BernoulliNB", {}, False),
+    "Ridge Classifier": ("sklearn.linear_model", "RidgeClassifier", {}, False),
+    "SGD Classifier": ("sklearn.linear_model", "SGDClassifier", {}, True),
+    "Passive Aggressive": ("sklearn.linear_model", "PassiveAggressiveClassifier", {}, True),
+    "Perceptron": ("sklearn.linear_model", "Perceptron", {}, True),
+    "LDA": ("sklearn.discriminant_analysis", "LinearDiscriminantAnalysis", {}, False),
+    "QDA": ("sklearn.discriminant_analysis", "QuadraticDiscriminantAnalysis", {}, False)
+}
+
+
+def get_algorithm(name, random_state=42, n_jobs=None):
+    """
+    Builds one algorithm from the suite, importing only its own library. Its n_jobs /
+    thread_count is set to `n_jobs`, or to the whole CPU budget when None.
+    """
+    module, cls, kwargs, seeded = ALGORITHM_SPECS[name]
+    estimator = getattr(importlib.import_module(module), cls)
+    model = estimator(**kwargs, **({"random_state": random_state} if seeded else {}))
+    return apply_estimator_threads(model, n_jobs or threads_per_task())
+
+
+def get_algorithm_suite(random_state=42, names=None, n_jobs=None):
+    """Returns a dictionary of 20 algorithms curated for this project (or the `names` subset)."""
+    return {name: get_algorithm(name, random_state, n_jobs) for name in (names or ALGORITHM_SPECS)}
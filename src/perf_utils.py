@@ -0,0 +1,143 @@
+import json
+import os
+import subprocess
+
+
+def latency_summary(samples_s):
+    """Summarizes a list of latencies (seconds) into millisecond percentiles."""
+    import numpy as np
+    if len(samples_s) == 0:
+        return {"count": 0, "mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+
+    ms = np.asarray(samples_s, dtype=float) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "count": int(ms.size),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(ms.max())
+    }
+
+
+def _read_proc_status(pid, key):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1]) / 1024  # kB -> MB
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def peak_rss_mb(pid=None):
+    """High-water-mark RSS of a process in MB (Linux only, None elsewhere)."""
+    return _read_proc_status(pid or "self", "VmHWM")
+
+
+def reset_peak_rss():
+    """Resets this process's RSS high-water mark (VmHWM); False where the kernel does not allow it."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def current_rss_mb(pid=None):
+    """Current RSS of a process in MB (Linux only, None elsewhere)."""
+    return _read_proc_status(pid or "self", "VmRSS")
+
+
+def pss_mb(pid=None):
+    """
+    Proportional set size in MB: pages shared with other processes are split between them,
+    so summing PSS over forked workers gives their real combined footprint (Linux only).
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def child_pids(pid):
+    """Direct children of a process, read from /proc (Linux only, [] elsewhere)."""
+    children = []
+    try:
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # Field 4 is the parent pid; the command name may contain spaces, so split after ')'
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        children.append(int(entry))
+            except (OSError, ValueError, IndexError):
+                continue
+    except OSError:
+        pass
+    return sorted(children)
+
+
+def git_revision():
+    """Returns the current commit hash so baselines can be compared across commits."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_report(report, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def flatten_metrics(report, prefix=""):
+    """Flattens nested result dicts into {'scope.metric': value} for numeric leaves."""
+    flat = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, prefix=name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def find_regressions(current, baseline, threshold, lower_is_better=(), higher_is_better=()):
+    """
+    Compares two result dicts metric-by-metric.
+    A metric regresses when it moves in the wrong direction by more than `threshold`
+    (a fraction, e.g. 0.15 = 15%). Returns a list of human readable violations.
+    """
+    cur = flatten_metrics(current)
+    base = flatten_metrics(baseline)
+    violations = []
+
+    for name, base_val in base.items():
+        if name not in cur or base_val == 0:
+            continue
+        metric = name.rsplit(".", 1)[-1]
+        change = (cur[name] - base_val) / abs(base_val)
+
+        if metric in lower_is_better and change > threshold:
+            violations.append(f"{name}: {base_val:.4g} -> {cur[name]:.4g} (+{change:.1%})")
+        elif metric in higher_is_better and -change > threshold:
+            violations.append(f"{name}: {base_val:.4g} -> {cur[name]:.4g} ({change:.1%})")
+
+    return violations
@@ -7,6 +7,16 @@ import os
 import logging
 from src.config import Config
 
+# Winsorized by prepare_data; the fitted scaler keeps their bounds (winsor_bounds_) for inference
+WINSORIZED_COLUMNS = ['tenure', 'MonthlyCharges', 'TotalCharges']
+NON_FEATURE_COLUMNS = ['customerID', 'Churn']
+
+def winsorize(df, bounds):
+    """Clips each column to its (lower, upper) bounds, in place."""
+    for col, (lower, upper) in bounds.items():
+        df[col] = np.clip(df[col], lower, upper)
+    return df
+
 def prepare_data(df):
     """
     Complete professional pipeline for data preparation.
@@ -18,16 +28,13 @@ def prepare_data(df):
     logging.info("Preparing data for training...")
     
     # 1. Cleaning
-    df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
-    df['TotalCharges'].fillna(df['TotalCharges'].median(), inplace=True)
+    total_charges = pd.to_numeric(df['TotalCharges'], errors='coerce')
+    df['TotalCharges'] = total_charges.fillna(total_charges.median())
     
     # --- ENTERPRISE OUTLIER POLICY (15-Year Standard) ---
     # Winsorization: Clipping extreme 1% outliers to prevent model distortion
-    num_cols = ['tenure', 'MonthlyCharges', 'TotalCharges']
-    for col in num_cols:
-        upper = df[col].quantile(0.99)
-        lower = df[col].quantile(0.01)
-        df[col] = np.clip(df[col], lower, upper)
+    bounds = {col: (float(df[col].quantile(0.01)), float(df[col].quantile(0.99))) for col in WINSORIZED_COLUMNS}
+    winsorize(df, bounds)
     logging.info("✅ Outlier policy applied (Winsorization 1%).")
     
     # 2. Extract Target and IDs
@@ -38,7 +45,7 @@ def prepare_data(df):
     X = df.drop(['customerID', 'Churn'], axis=1)
     
     # 4. Encoding
-    categorical_cols = X.select_dtypes(include=['object']).columns
+    categorical_cols = X.select_dtypes(include=['object', 'category']).columns
     X_encoded = pd.get_dummies(X, columns=categorical_cols, drop_first=True)
     feature_names = X_encoded.columns.tolist()
     
@@ -51,13 +58,28 @@ def prepare_data(df):
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
+    scaler.winsor_bounds_ = bounds
     
-    # Save the scaler for future inference
+    # Save the scaler (and the winsorization bounds on it) for future inference
     os.makedirs(Config.MODELS_DIR, exist_ok=True)
-    joblib.dump(scaler, os.path.join(Config.MODELS_DIR, "scaler.joblib"))
+    joblib.dump(scaler, Config.SCALER_PATH)
     
     return X_train_scaled, X_test_scaled, y_train, y_test, feature_names, customer_ids, scaler
 
+def inference_features(df, scaler):
+    """
+    Encodes and scales rows exactly like training, aligned to the scaler's columns (works on
+    any subset of rows). Numeric columns are clipped to the training-time winsorization bounds,
+    so a row gets the same features whichever extract it arrives in.
+    """
+    X = df.drop(columns=[c for c in NON_FEATURE_COLUMNS if c in df.columns])
+    bounds = getattr(scaler, 'winsor_bounds_', None)  # scalers saved before the bounds were kept have none
+    if bounds:
+        X = winsorize(X.copy(), bounds)
+    # Without drop_first, a subset missing a category still encodes the others correctly
+    X_encoded = pd.get_dummies(X).reindex(columns=scaler.feature_names_in_, fill_value=0)
+    return scaler.transform(X_encoded)
+
 def prepare_for_inference(df, scaler):
     """Prepares raw data for prediction using a pre-trained scaler."""
     df_clean = df.copy()
@@ -0,0 +1,197 @@
+"""
+Opt-in statistical profiler for API requests and training runs. A background thread
+samples the Python stacks of the profiled thread(s) every PROFILE_INTERVAL_S and, when
+the run ends, writes to Config.PROFILE_DIR:
+
+    <name>-<timestamp>-<id>.speedscope.json   flamegraph, open at https://www.speedscope.app
+    <name>-<timestamp>-<id>.hotspots.txt      per-function self / total time, hottest first
+
+Nothing is imported, started or checked on the hot path unless profiling was requested
+(X-Profile header with the admin token, CHURNAI_PROFILE_SAMPLE_RATE, or --profile).
+"""
+import functools
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+def profile_requested(token=None):
+    """Whether an API request should be profiled: a matching admin token, or the sampling rate."""
+    if token and Config.PROFILE_ADMIN_TOKEN and hmac.compare_digest(token, Config.PROFILE_ADMIN_TOKEN):
+        return True
+    return Config.PROFILE_SAMPLE_RATE > 0 and random.random() < Config.PROFILE_SAMPLE_RATE
+
+
+class SamplingProfiler:
+    """
+    Samples the starting thread's stack (plus, with `follow_new_threads`, every thread
+    started while profiling, e.g. a benchmark pool) at a fixed interval. Identical stacks
+    are aggregated with their sampled wall time, so memory stays bounded on long runs.
+    """
+
+    def __init__(self, name, interval_s=None, follow_new_threads=False):
+        self.name = name
+        self.profile_id = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.interval_s = interval_s or Config.PROFILE_INTERVAL_S
+        self.follow_new_threads = follow_new_threads
+        self.duration = 0.0
+        self.samples = 0
+        self.paths = None
+        self._stacks = {}  # thread id -> {(code, ...) root first: sampled seconds}
+        self._thread_names = {}
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._preexisting = set(sys._current_frames()) - {self._target}
+        self._started = time.perf_counter()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{self.name}", daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _profiled(self, thread_id):
+        if thread_id == self._target:
+            return True
+        return self.follow_new_threads and thread_id not in self._preexisting
+
+    def _run(self):
+        me = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval_s):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frames = sys._current_frames()
+            if self._stop.is_set():
+                break  # the profiled thread is already waiting on stop()
+            for thread_id, frame in frames.items():
+                if thread_id == me or not self._profiled(thread_id):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack.reverse()
+                stacks = self._stacks.get(thread_id)
+                if stacks is None:
+                    stacks = self._stacks[thread_id] = {}
+                    self._thread_names.update((t.ident, t.name) for t in threading.enumerate())
+                key = tuple(stack)
+                stacks[key] = stacks.get(key, 0.0) + elapsed
+                self.samples += 1
+
+    @staticmethod
+    def _frame(code):
+        return {"name": code.co_qualname, "file": code.co_filename, "line": code.co_firstlineno}
+
+    def speedscope(self):
+        """The profile in speedscope's file format: one sampled profile per thread."""
+        frames, index = [], {}
+
+        def frame_index(code):
+            if code not in index:
+                index[code] = len(frames)
+                frames.append(self._frame(code))
+            return index[code]
+
+        profiles = []
+        for thread_id, stacks in self._stacks.items():
+            samples = [[frame_index(code) for code in stack] for stack in stacks]
+            weights = [round(seconds, 6) for seconds in stacks.values()]
+            profiles.append({
+                "type": "sampled",
+                "name": f"{self.profile_id} [{self._thread_names.get(thread_id, thread_id)}]",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {"$schema": SPEEDSCOPE_SCHEMA, "name": self.profile_id, "exporter": "churnai.profiling",
+                "shared": {"frames": frames}, "profiles": profiles}
+
+    def hot_spots(self, limit=None):
+        """Functions by self time (leaf of the sampled stack), with their inclusive time."""
+        limit = limit or Config.PROFILE_TOP_FUNCTIONS
+        self_time, total_time = {}, {}
+        for stacks in self._stacks.values():
+            for stack, seconds in stacks.items():
+                if not stack:
+                    continue
+                self_time[stack[-1]] = self_time.get(stack[-1], 0.0) + seconds
+                # Recursive functions count once per sample in the inclusive time
+                for code in set(stack):
+                    total_time[code] = total_time.get(code, 0.0) + seconds
+        sampled = sum(self_time.values()) or 1.0
+        ranked = sorted(total_time, key=lambda code: (self_time.get(code, 0.0), total_time[code]), reverse=True)
+        return [{**self._frame(code),
+                 "self_s": round(self_time.get(code, 0.0), 4), "self_pct": round(100 * self_time.get(code, 0.0) / sampled, 1),
+                 "total_s": round(total_time[code], 4), "total_pct": round(100 * total_time[code] / sampled, 1)}
+                for code in ranked[:limit]]
+
+    def save(self, out_dir=None):
+        """Writes the speedscope JSON and the hot-spot summary; returns both paths."""
+        out_dir = out_dir or Config.PROFILE_DIR
+        os.makedirs(out_dir, exist_ok=True)
+        base = os.path.join(out_dir, self.profile_id)
+        with open(f"{base}.speedscope.json", 'w') as f:
+            json.dump(self.speedscope(), f)
+
+        lines = [f"Profile {self.profile_id}: {self.duration:.3f}s wall, {self.samples} samples "
+                 f"every {self.interval_s * 1000:g} ms",
+                 f"{'self s':>9} {'self %':>7} {'total s':>9} {'total %':>8}  function"]
+        for spot in self.hot_spots():
+            lines.append(f"{spot['self_s']:>9.3f} {spot['self_pct']:>6.1f}% {spot['total_s']:>9.3f} "
+                         f"{spot['total_pct']:>7.1f}%  {spot['name']} ({spot['file']}:{spot['line']})")
+        with open(f"{base}.hotspots.txt", 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        self.paths = (f"{base}.speedscope.json", f"{base}.hotspots.txt")
+        return self.paths
+
+
+def profile_call(name, fn, *args, follow_new_threads=False, **kwargs):
+    """Runs `fn` under a SamplingProfiler and saves the profile (also when `fn` raises). Returns (result, profiler)."""
+    profiler = SamplingProfiler(name, follow_new_threads=follow_new_threads)
+    try:
+        with profiler:
+            result = fn(*args, **kwargs)
+    finally:
+        profiler.save()
+        top = ", ".join(f"{spot['name']} {spot['self_pct']}%" for spot in profiler.hot_spots(limit=3))
+        logger.info("🔬 Profile %s (%.2fs): %s -> %s", profiler.profile_id, profiler.duration, top, profiler.paths[0])
+    return result, profiler
+
+
+def profile_stage(name):
+    """Decorator for training entry points: profiles the call when Config.PROFILE_STAGES is on."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not Config.PROFILE_STAGES:
+                return fn(*args, **kwargs)
+            return profile_call(name, fn, *args, follow_new_threads=True, **kwargs)[0]
+        return wrapper
+    return decorate
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from src.config import Config
+
+# body: serialized response bytes; result_id: server-side result set the body points at (top_n responses)
+CachedResponse = namedtuple("CachedResponse", ["body", "result_id"])
+
+
+def upload_digest(contents):
+    return hashlib.sha256(contents).hexdigest()
+
+
+def cache_key(digest, model_fingerprint, top_n=None):
+    """Content address of a response: upload bytes x exact model x response shape."""
+    return f"{digest}:{model_fingerprint}:{top_n or 'all'}"
+
+
+class ResponseCache:
+    """Thread-safe LRU of finished, pre-serialized responses bounded by entry count and total bytes."""
+
+    def __init__(self, max_bytes=None, max_entries=None):
+        self.max_bytes = Config.RESPONSE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body, result_id=None):
+        # Larger than the whole budget (or caching disabled): not worth evicting everything for
+        if len(body) > self.max_bytes:
+            return None
+        entry = CachedResponse(body, result_id)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key).body)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._bytes -= len(self._entries.popitem(last=False)[1].body)
+        return entry
+
+    def discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= len(entry.body)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+class FileDigest:
+    """sha256 of a file, recomputed only when its size or mtime changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._stat = None
+        self._digest = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        stat = os.stat(self.path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if signature != self._stat:
+                with open(self.path, "rb") as f:
+                    self._digest = upload_digest(f.read())
+                self._stat = signature
+            return self._digest
@@ -0,0 +1,110 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from src.config import Config
+
+# Output columns that get a value -> row-position index, and their query parameter names
+INDEXED_COLUMNS = {"risk_level": "risk_level", "contract": "contract_type"}
+
+
+class ResultSet:
+    """
+    One scored upload held server-side. Rows are sorted by churn probability (highest first),
+    so every index below is an ascending array of positions that is already in risk order,
+    and a cursor is simply the position of the last row a client has seen.
+    """
+
+    def __init__(self, result_id, frame, summary, model_version):
+        order = np.argsort(-frame['churn_probability'].to_numpy(), kind='stable')
+        self.result_id = result_id
+        self.frame = frame.iloc[order].reset_index(drop=True)
+        self.summary = summary
+        self.model_version = model_version
+        self.created = time.monotonic()
+        self.nbytes = int(self.frame.memory_usage(deep=True).sum())
+        self.indexes = {}
+        for param, column in INDEXED_COLUMNS.items():
+            codes = self.frame[column].astype('category')
+            positions = np.arange(len(self.frame))
+            self.indexes[param] = {
+                str(value).lower(): positions[(codes.cat.codes == code).to_numpy()]
+                for code, value in enumerate(codes.cat.categories)
+            }
+
+    def _positions(self, filters, search=None):
+        positions = None
+        for param, value in filters.items():
+            if value is None:
+                continue
+            matched = self.indexes[param].get(str(value).lower(), np.empty(0, dtype=np.int64))
+            positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+        if positions is None:
+            positions = np.arange(len(self.frame))
+        if search:
+            ids = self.frame['customer_id'].to_numpy()[positions].astype(str)
+            positions = positions[np.char.find(np.char.lower(ids), search.lower()) >= 0]
+        return positions
+
+    def page(self, cursor=None, limit=None, search=None, **filters):
+        """Rows after `cursor` matching every filter (and customer-ID substring), plus the next cursor."""
+        limit = min(limit or Config.RESULTS_PAGE_SIZE, Config.RESULTS_MAX_PAGE_SIZE)
+        positions = self._positions(filters, search)
+        start = 0 if cursor is None else int(np.searchsorted(positions, int(cursor), side='right'))
+        selected = positions[start:start + limit]
+        more = start + limit < len(positions)
+        return {
+            "result_id": self.result_id,
+            "total_matching": int(len(positions)),
+            "predictions": self.frame.iloc[selected].to_dict(orient="records"),
+            "next_cursor": str(int(selected[-1])) if more and len(selected) else None
+        }
+
+
+class ResultStore:
+    """Thread-safe LRU of ResultSets bounded by count, total bytes and a TTL."""
+
+    def __init__(self, max_results=None, max_bytes=None, ttl_s=None):
+        self.max_results = max_results or Config.RESULT_STORE_MAX_RESULTS
+        self.max_bytes = max_bytes or Config.RESULT_STORE_MAX_BYTES
+        self.ttl_s = ttl_s or Config.RESULT_STORE_TTL_S
+        self._results = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, frame, summary, model_version):
+        result = ResultSet(uuid.uuid4().hex, frame, summary, model_version)
+        with self._lock:
+            self._results[result.result_id] = result
+            self._bytes += result.nbytes
+            self._evict()
+        return result
+
+    def get(self, result_id):
+        with self._lock:
+            result = self._results.get(result_id)
+            if result is None:
+                return None
+            if time.monotonic() - result.created > self.ttl_s:
+                self._drop(result_id)
+                return None
+            self._results.move_to_end(result_id)
+            return result
+
+    def _drop(self, result_id):
+        self._bytes -= self._results.pop(result_id).nbytes
+
+    def _evict(self):
+        now = time.monotonic()
+        for result_id in [k for k, r in self._results.items() if now - r.created > self.ttl_s]:
+            self._drop(result_id)
+        # Always keep the newest result, even if it alone exceeds the byte budget
+        while len(self._results) > 1 and (len(self._results) > self.max_results or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._results)))
+
+    def stats(self):
+        with self._lock:
+            return {"results": len(self._results), "bytes": self._bytes}
@@ -0,0 +1,264 @@
+"""
+Pre-aggregated churn segment cube: customer count, churn probability sum and high-risk
+(Critical) count for every Contract x PaymentMethod x tenure_bin x InternetService cell.
+Scoring runs fold their rows in as they complete, and segment queries only read the
+cells (a few hundred at most), never the customers behind them.
+
+The cube also keeps each customer's current cell and score, keyed by customer ID, so a
+customer scored again moves between cells instead of being counted twice. A full
+customer-base run (python -m src.customer_store) writes a snapshot that API workers load
+and reload when it is replaced; uploads scored by the production model are folded into
+the worker's in-memory cube on top of it. Uploads without a customerID column are left
+out: their generated IDs (CUST-1000, ...) repeat across unrelated uploads.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Query parameter -> engineered column (features/feature_engineering.py)
+DIMENSIONS = {
+    "contract": "Contract",
+    "payment_method": "PaymentMethod",
+    "tenure_bin": "tenure_bin",
+    "internet_service": "InternetService",
+}
+MISSING_LABEL = "Unknown"  # missing column or value, e.g. tenure 0 has no tenure_bin
+HIGH_RISK_LEVEL = "Critical"  # the summary's high_risk_count (src/serving.py RISK_TIERS)
+
+
+def _factorize(df_eng, column):
+    """(codes, labels) of a segment column; missing values and columns get MISSING_LABEL."""
+    if column not in df_eng.columns:
+        return np.zeros(len(df_eng), dtype=np.int64), [MISSING_LABEL]
+    codes, uniques = pd.factorize(df_eng[column])
+    labels = [str(value) for value in uniques]
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(labels), codes)
+        labels.append(MISSING_LABEL)
+    return codes.astype(np.int64), labels
+
+
+class SegmentCube:
+    """
+    Cell aggregates plus the customer -> cell membership behind them. With a `path`, the
+    cube serves the latest snapshot there (see `refresh`). Thread-safe.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._reset()
+
+    def _reset(self, keys=(), ids=(), cells=(), probability=(), high_risk=(), meta=None):
+        self._keys = [tuple(key) for key in keys]  # cell number -> (contract, payment, tenure_bin, internet)
+        self._cells = {key: cell for cell, key in enumerate(self._keys)}
+        self.customers = np.zeros(len(self._keys), dtype=np.int64)
+        self.probability_sum = np.zeros(len(self._keys), dtype=np.float64)
+        self.high_risk = np.zeros(len(self._keys), dtype=np.int64)
+        # Membership: customer ID -> position in the parallel arrays below, which grow by
+        # doubling, so adding customers is amortized O(rows) (copies: snapshot columns are
+        # read-only Arrow views)
+        self._member_ids = np.array(ids, dtype=object)
+        self._positions = dict(zip(self._member_ids.tolist(), range(len(self._member_ids))))
+        self._member_cell = np.array(cells, dtype=np.int64)
+        self._member_probability = np.array(probability, dtype=np.float64)
+        self._member_high_risk = np.array(high_risk, dtype=bool)
+        self._size = len(self._member_ids)
+        self.meta = dict(meta or {})
+        self.rows_folded = 0
+        self.rows_dropped = 0
+        self._apply(self._member_cell, self._member_probability, self._member_high_risk, 1)
+
+    def _reserve(self, rows):
+        capacity = len(self._member_ids)
+        if self._size + rows <= capacity:
+            return
+        capacity = max(2 * capacity, self._size + rows, 1024)
+        for name in ("_member_ids", "_member_cell", "_member_probability", "_member_high_risk"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _cell_numbers(self, df_eng):
+        """Cell number of every row, adding cells seen for the first time."""
+        combined = np.zeros(len(df_eng), dtype=np.int64)
+        dimensions = []
+        for column in DIMENSIONS.values():
+            codes, labels = _factorize(df_eng, column)
+            combined = combined * len(labels) + codes
+            dimensions.append(labels)
+        combos, inverse = np.unique(combined, return_inverse=True)
+        cells = np.empty(len(combos), dtype=np.int64)
+        for i, combo in enumerate(combos.tolist()):
+            key = []
+            for labels in reversed(dimensions):
+                combo, code = divmod(combo, len(labels))
+                key.append(labels[code])
+            key = tuple(reversed(key))
+            if key not in self._cells:
+                self._cells[key] = len(self._keys)
+                self._keys.append(key)
+            cells[i] = self._cells[key]
+        return cells[inverse.reshape(-1)]
+
+    def _apply(self, cells, probability, high_risk, sign):
+        size = len(self._keys)
+        if len(self.customers) < size:
+            grow = size - len(self.customers)
+            self.customers = np.concatenate([self.customers, np.zeros(grow, dtype=np.int64)])
+            self.probability_sum = np.concatenate([self.probability_sum, np.zeros(grow)])
+            self.high_risk = np.concatenate([self.high_risk, np.zeros(grow, dtype=np.int64)])
+        if not len(cells):
+            return
+        self.customers += sign * np.bincount(cells, minlength=size)
+        self.probability_sum += sign * np.bincount(cells, weights=probability, minlength=size)
+        self.high_risk += sign * np.bincount(cells, weights=high_risk, minlength=size).astype(np.int64)
+
+    def update(self, df_eng, frame, max_customers=None):
+        """
+        Folds a scored chunk in: `df_eng` rows (segment columns) aligned with its prediction
+        frame (src/serving.py). Customers already in the cube are moved to their new cell/score;
+        new customers beyond `max_customers` (SEGMENT_CUBE_MAX_CUSTOMERS) are not folded in.
+        """
+        max_customers = max_customers or Config.SEGMENT_CUBE_MAX_CUSTOMERS
+        ids = frame["customer_id"].astype(str).to_numpy(dtype=object)
+        last = ~pd.Index(ids).duplicated(keep="last")  # a customer listed twice keeps its last row
+        ids = ids[last]
+        probability = frame["churn_probability"].to_numpy(dtype=np.float64)[last]
+        high_risk = (frame["risk_level"].to_numpy() == HIGH_RISK_LEVEL)[last]
+        with self._lock:
+            cells = self._cell_numbers(df_eng)[last]
+            positions = np.fromiter((self._positions.get(i, -1) for i in ids.tolist()), dtype=np.int64, count=len(ids))
+            known = positions >= 0
+            added = np.flatnonzero(~known)
+            if self._size + len(added) > max_customers:
+                room = max(0, max_customers - self._size)
+                self.rows_dropped += len(added) - room
+                logger.warning("⚠️ Segment cube is at %d customers: %d new customers not folded in.",
+                               max_customers, len(added) - room)
+                added = added[:room]
+            positions[added] = np.arange(self._size, self._size + len(added))
+            folded = positions >= 0
+
+            previous = positions[known]
+            self._apply(self._member_cell[previous], self._member_probability[previous],
+                        self._member_high_risk[previous], -1)
+            self._apply(cells[folded], probability[folded], high_risk[folded], 1)
+            self._reserve(len(added))
+            self._positions.update(zip(ids[added].tolist(), positions[added].tolist()))
+            self._size += len(added)
+            targets = positions[folded]
+            self._member_ids[targets] = ids[folded]
+            self._member_cell[targets] = cells[folded]
+            self._member_probability[targets] = probability[folded]
+            self._member_high_risk[targets] = high_risk[folded]
+            self.rows_folded += int(folded.sum())
+            self.meta["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def track(self, chunks, df_eng):
+        """Passes scored (frame, probabilities) chunks of `df_eng` through, folding each into the cube."""
+        offset = 0
+        for frame, probs in chunks:
+            self.update(df_eng.iloc[offset:offset + len(frame)], frame)
+            offset += len(frame)
+            yield frame, probs
+
+    def query(self, group_by=(), **filters):
+        """
+        Segments of the cells matching every filter ({query parameter: value}, case-insensitive),
+        grouped by the `group_by` dimensions, riskiest first. Costs O(cells).
+        """
+        unknown = [name for name in [*group_by, *filters] if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown segment dimension(s): {', '.join(unknown)}. Use: {', '.join(DIMENSIONS)}")
+        names = list(DIMENSIONS)
+        wanted = [(names.index(name), str(value).lower()) for name, value in filters.items() if value is not None]
+        positions = [names.index(name) for name in group_by]
+
+        groups = {}
+        with self._lock:
+            for cell, key in enumerate(self._keys):
+                n = self.customers[cell]
+                if not n or any(key[i].lower() != value for i, value in wanted):
+                    continue
+                totals = groups.setdefault(tuple(key[i] for i in positions), [0, 0.0, 0])
+                totals[0] += int(n)
+                totals[1] += float(self.probability_sum[cell])
+                totals[2] += int(self.high_risk[cell])
+            meta = dict(self.meta)
+
+        segments = [{**dict(zip(group_by, key)), **self._aggregate(*totals)} for key, totals in groups.items()]
+        segments.sort(key=lambda segment: segment["average_probability"], reverse=True)
+        overall = [sum(totals[i] for totals in groups.values()) for i in range(3)]
+        return {"group_by": list(group_by), "filters": {k: v for k, v in filters.items() if v is not None},
+                "total": self._aggregate(*overall), "segments": segments, "source": meta}
+
+    @staticmethod
+    def _aggregate(customers, probability_sum, high_risk):
+        return {
+            "customers": customers,
+            "average_probability": round(probability_sum / customers, 2) if customers else None,
+            "high_risk_count": high_risk,
+            "high_risk_rate": round(100 * high_risk / customers, 2) if customers else None,
+        }
+
+    def save(self, path=None, **meta):
+        """Writes the membership and `meta` as a Parquet snapshot, replacing `path` atomically."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = path or self.path or Config.SEGMENT_CUBE_PATH
+        with self._lock:
+            self.meta.update(meta, updated_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+            size = self._size
+            table = pa.table({"customer_id": pa.array(self._member_ids[:size], type=pa.string()),
+                              "cell": pa.array(self._member_cell[:size], type=pa.int32()),
+                              "probability": self._member_probability[:size],
+                              "high_risk": self._member_high_risk[:size]})
+            table = table.replace_schema_metadata({b"cells": json.dumps(self._keys).encode(),
+                                                   b"meta": json.dumps(self.meta).encode()})
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def refresh(self):
+        """Loads the snapshot at `path` when a scoring run has written a new one since the last load."""
+        if self.path is None:
+            return False
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        if signature == self._signature:
+            return False
+
+        import pyarrow.parquet as pq
+        table = pq.read_table(self.path)
+        metadata = table.schema.metadata or {}
+        columns = {name: table.column(name).to_numpy() for name in table.column_names}
+        with self._lock:
+            self._reset(json.loads(metadata[b"cells"]), columns["customer_id"], columns["cell"],
+                        columns["probability"], columns["high_risk"], json.loads(metadata.get(b"meta", b"{}")))
+            self._signature = signature
+        logger.info("🧊 Segment cube loaded: %d customers in %d cells from %s",
+                    table.num_rows, int(np.count_nonzero(self.customers)), self.path)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {"path": self.path, "customers": self._size, "cells": int(np.count_nonzero(self.customers)),
+                    "rows_folded": self.rows_folded, "rows_dropped": self.rows_dropped, **self.meta}
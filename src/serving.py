@@ -0,0 +1,204 @@
+import io
+import json
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from src.config import Config
+
+try:
+    import orjson
+
+    def dumps(obj):
+        """Serializes to UTF-8 JSON bytes (orjson; numpy scalars/arrays supported)."""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:  # pragma: no cover - orjson is optional
+    def _json_default(obj):
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+    def dumps(obj):
+        """Serializes to UTF-8 JSON bytes (stdlib fallback)."""
+        return json.dumps(obj, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# (level, timeframe, color), checked in this order; the last entry is the default
+RISK_TIERS = [
+    ("Critical", "Next 30 Days", "red"),
+    ("At-Risk", "2-4 Months", "orange"),
+    ("Loyal", "Strong Retention", "green"),
+    ("Stable", "Baseline", "yellow"),
+]
+SUMMARY_COUNTS = {"Critical": "high_risk_count", "At-Risk": "medium_risk_count",
+                  "Stable": "stable_count", "Loyal": "low_risk_count"}
+OUTPUT_COLUMNS = ["customer_id", "tenure_months", "monthly_charges", "churn_probability", "risk_level",
+                  "risk_timeframe", "risk_color", "primary_reason", "contract_type"]
+
+
+def classify_risk(probs):
+    """Vectorized risk tiers: index into RISK_TIERS for every probability."""
+    probs = np.asarray(probs)
+    return np.select([probs > 0.85, probs > 0.60, probs < 0.15], [0, 1, 2], default=3)
+
+
+def explain_churn(df, mean_charges):
+    """Vectorized 'primary_reason': the first two triggered risk drivers, or 'Stable profile'."""
+    flags = [
+        (np.asarray(df['Contract'] == 'Month-to-month', dtype=bool), "High-risk monthly contract"),
+        (np.asarray(df['PaymentMethod'] == 'Electronic check', dtype=bool), "Unstable payment"),
+        (np.asarray(df['MonthlyCharges'].astype(float) > mean_charges * 1.2, dtype=bool), "High charges"),
+        (np.asarray(df['tenure'].astype(float) < 6, dtype=bool), "New customer risk"),
+    ]
+    # Each row's reason is fully determined by its 4-bit flag pattern: build the 16 strings once
+    pattern = np.zeros(len(df), dtype=np.int64)
+    for bit, (mask, _) in enumerate(flags):
+        pattern |= mask.astype(np.int64) << bit
+    lookup = []
+    for code in range(1 << len(flags)):
+        reasons = [label for bit, (_, label) in enumerate(flags) if code >> bit & 1]
+        lookup.append(" + ".join(reasons[:2]) if reasons else "Stable profile")
+    return np.asarray(lookup, dtype=object)[pattern]
+
+
+def prediction_frame(df_eng, probs, mean_charges=None):
+    """Column-wise prediction output (one row per customer, OUTPUT_COLUMNS)."""
+    if mean_charges is None:
+        mean_charges = float(df_eng['MonthlyCharges'].mean())
+    tenure = df_eng['tenure']
+    tiers = classify_risk(probs)
+    levels, timeframes, colors = (np.asarray(col, dtype=object)[tiers] for col in zip(*RISK_TIERS))
+    return pd.DataFrame({
+        "customer_id": df_eng['customerID'].astype(str).to_numpy(dtype=object),
+        "tenure_months": tenure.to_numpy(dtype=np.float64 if tenure.isna().any() else np.int64),
+        "monthly_charges": df_eng['MonthlyCharges'].to_numpy(dtype=np.float64).round(2),  # float32 storage
+        "churn_probability": (np.asarray(probs, dtype=np.float64) * 100).round(2),
+        "risk_level": levels,
+        "risk_timeframe": timeframes,
+        "risk_color": colors,
+        "primary_reason": explain_churn(df_eng, mean_charges),
+        "contract_type": df_eng['Contract'].astype(str).to_numpy(dtype=object),
+    }, columns=OUTPUT_COLUMNS)
+
+
+def prediction_records(frame):
+    """Row dicts with native Python scalars, ready for the JSON encoder."""
+    return frame.to_dict(orient="records")
+
+
+class SummaryAccumulator:
+    """Builds the response 'summary' block incrementally, chunk by chunk."""
+
+    def __init__(self):
+        self.counts = dict.fromkeys(SUMMARY_COUNTS.values(), 0)
+        self.total = 0
+        self.probability_sum = 0.0
+        self._probs = []
+
+    def update(self, frame, probs):
+        for level, n in frame['risk_level'].value_counts().items():
+            self.counts[SUMMARY_COUNTS[level]] += int(n)
+        self.total += len(frame)
+        self.probability_sum += float(frame['churn_probability'].sum())
+        self._probs.append(np.asarray(probs, dtype=np.float64))
+
+    @property
+    def probs(self):
+        return np.concatenate(self._probs) if self._probs else np.empty(0)
+
+    def result(self):
+        probs = self.probs
+        return {
+            "total_customers": self.total,
+            **self.counts,
+            "prediction_variance": float(np.var(probs)) if self.total else float("nan"),
+            "average_probability": self.probability_sum / self.total if self.total else float("nan"),
+        }
+
+
+def score_chunks(df_eng, predict_proba, chunk_rows=None, summary=None):
+    """
+    Scores `df_eng` in slices of `chunk_rows`, yielding (prediction frame, probabilities)
+    as soon as each slice is done. The 'High charges' baseline is the whole-upload mean,
+    so reasons match the non-streaming response exactly.
+    """
+    chunk_rows = chunk_rows or Config.STREAM_CHUNK_ROWS
+    mean_charges = float(df_eng['MonthlyCharges'].mean())
+    for start in range(0, len(df_eng), chunk_rows):
+        part = df_eng.iloc[start:start + chunk_rows]
+        probs = predict_proba(part)
+        frame = prediction_frame(part, probs, mean_charges)
+        if summary is not None:
+            summary.update(frame, probs)
+        yield frame, probs
+
+
+def iter_ndjson(chunks, summary, header=None):
+    """NDJSON body: an optional header line, one line per prediction, then {"summary": ...}."""
+    if header:
+        yield dumps(header) + b"\n"
+    for frame, _ in chunks:
+        yield b"".join(dumps(row) + b"\n" for row in prediction_records(frame))
+    yield dumps({"summary": summary.result()}) + b"\n"
+
+
+def _arrow_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ("customer_id", pa.string()), ("tenure_months", pa.int64()), ("monthly_charges", pa.float64()),
+        ("churn_probability", pa.float64()), ("risk_level", pa.string()), ("risk_timeframe", pa.string()),
+        ("risk_color", pa.string()), ("primary_reason", pa.string()), ("contract_type", pa.string()),
+    ])
+
+
+def iter_arrow(chunks, summary, header=None):
+    """
+    Arrow IPC stream body: one record batch per scored chunk. The summary (and header
+    fields) travel as custom metadata on a final, empty batch.
+    """
+    import pyarrow as pa
+
+    schema = _arrow_schema()
+    sink = io.BytesIO()
+
+    def take():
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    writer = pa.ipc.new_stream(sink, schema)
+    for frame, _ in chunks:
+        writer.write_batch(pa.RecordBatch.from_pandas(frame, schema=schema, preserve_index=False))
+        yield take()
+
+    metadata = {"summary": dumps(summary.result())}
+    metadata.update({key: str(value) for key, value in (header or {}).items()})
+    writer.write_batch(pa.RecordBatch.from_pylist([], schema=schema), custom_metadata=metadata)
+    writer.close()
+    yield take()
+
+
+def gzip_stream(body, level=6):
+    """Gzip-compresses an iterable of byte chunks on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in body:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def negotiate(accept):
+    """Response mode from the Accept header: 'ndjson', 'arrow' or the default 'json'."""
+    accept = (accept or "").lower()
+    if NDJSON_MEDIA_TYPE in accept or "application/ndjson" in accept:
+        return "ndjson"
+    if ARROW_MEDIA_TYPE in accept:
+        return "arrow"
+    return "json"
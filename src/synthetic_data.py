@@ -0,0 +1,211 @@
+import argparse
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.data_loader import load_data
+
+logger = logging.getLogger(__name__)
+
+TENURE_BUCKETS = [-1, 12, 24, 48, 72]
+ADDON_SERVICES = ['OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies']
+# Columns sampled conditionally on (Contract, Churn): keeps the churn signal of each attribute
+ACCOUNT_COLUMNS = ['gender', 'SeniorCitizen', 'Partner', 'Dependents', 'PhoneService',
+                   'InternetService', 'PaperlessBilling', 'PaymentMethod']
+COLUMN_ORDER = ['customerID', 'gender', 'SeniorCitizen', 'Partner', 'Dependents', 'tenure', 'PhoneService',
+                'MultipleLines', 'InternetService', 'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+                'TechSupport', 'StreamingTV', 'StreamingMovies', 'Contract', 'PaperlessBilling',
+                'PaymentMethod', 'MonthlyCharges', 'TotalCharges', 'Churn']
+
+
+def _conditional_table(df, col, given):
+    """{given-key tuple: (values, probabilities)} of `col` conditioned on the `given` columns."""
+    counts = df.groupby(given + [col], observed=True).size()
+    table = {}
+    for key, sub in counts.groupby(level=list(range(len(given))), observed=True):
+        table[key] = (np.asarray(sub.index.get_level_values(col), dtype=object), sub.to_numpy() / sub.sum())
+    return table
+
+
+def _sample_conditional(rng, frame, table, given):
+    out = np.empty(len(frame), dtype=object)
+    for key, idx in frame.groupby(given, observed=True).indices.items():
+        values, p = table[key]
+        out[idx] = values[rng.choice(len(values), size=len(idx), p=p)]
+    return out
+
+
+def _charge_design(frame):
+    cols = [frame['InternetService'] == 'DSL', frame['InternetService'] == 'Fiber optic',
+            frame['PhoneService'] == 'Yes', frame['MultipleLines'] == 'Yes']
+    cols += [frame[s] == 'Yes' for s in ADDON_SERVICES]
+    return np.column_stack([np.ones(len(frame))] + [np.asarray(c, dtype=float) for c in cols])
+
+
+def _customer_ids(i):
+    """Unique IDs in the raw 'NNNN-XXXXX' layout for row numbers up to ~1.2e11."""
+    i = np.asarray(i, dtype=np.int64)
+    ids = np.char.zfill((i % 10000).astype(str), 4)
+    rest = i // 10000
+    letters = []
+    for _ in range(5):
+        letters.append(np.char.mod('%c', 65 + rest % 26))
+        rest //= 26
+    suffix = letters[4]
+    for part in letters[3::-1]:
+        suffix = np.char.add(suffix, part)
+    return np.char.add(np.char.add(ids, '-'), suffix).astype(object)
+
+
+class TelcoSynthesizer:
+    """
+    Learns Telco marginals and the key joint structure from the raw file:
+    (Contract, tenure bucket, Churn) jointly, account attributes given (Contract, Churn),
+    add-on services given (InternetService, Churn), and MonthlyCharges as a linear
+    function of the subscribed services. Sampling is vectorized per chunk.
+    """
+
+    def fit(self, df):
+        df = df.copy()
+        df['_bucket'] = pd.cut(df['tenure'], bins=TENURE_BUCKETS, labels=False)
+
+        joint = df.groupby(['Contract', '_bucket', 'Churn'], observed=True).size()
+        self.cells_ = list(joint.index)
+        self.cell_p_ = joint.to_numpy() / joint.sum()
+        self.cell_tenure_ = {
+            key: grp['tenure'].to_numpy() for key, grp in df.groupby(['Contract', '_bucket', 'Churn'], observed=True)
+        }
+
+        self.account_ = {c: _conditional_table(df, c, ['Contract', 'Churn']) for c in ACCOUNT_COLUMNS}
+        self.addons_ = {c: _conditional_table(df, c, ['InternetService', 'Churn']) for c in ADDON_SERVICES}
+        self.lines_ = _conditional_table(df, 'MultipleLines', ['PhoneService', 'Churn'])
+
+        X = _charge_design(df)
+        y = df['MonthlyCharges'].to_numpy(dtype=float)
+        self.charge_coef_, *_ = np.linalg.lstsq(X, y, rcond=None)
+        self.charge_std_ = float(np.std(y - X @ self.charge_coef_))
+        self.charge_range_ = (float(y.min()), float(y.max()))
+
+        billed = df[(df['tenure'] > 0) & df['TotalCharges'].notna()]
+        self.total_ratio_ = (billed['TotalCharges'] / (billed['tenure'] * billed['MonthlyCharges'])).to_numpy()
+        return self
+
+    def sample(self, n, rng, start_id=0, drift=0.0):
+        """Draws `n` customers. `drift` in [0, 1] shifts the mix toward month-to-month and raises prices."""
+        p = self.cell_p_
+        if drift:
+            p = p * np.array([1 + drift if c[0] == 'Month-to-month' else 1.0 for c in self.cells_])
+            p = p / p.sum()
+
+        cell_idx = rng.choice(len(self.cells_), size=n, p=p)
+        frame = pd.DataFrame({
+            'Contract': np.array([c[0] for c in self.cells_], dtype=object)[cell_idx],
+            'Churn': np.array([c[2] for c in self.cells_], dtype=object)[cell_idx],
+        })
+
+        tenure = np.empty(n, dtype=np.int64)
+        for i in np.unique(cell_idx):
+            idx = np.flatnonzero(cell_idx == i)
+            pool = self.cell_tenure_[self.cells_[i]]
+            tenure[idx] = pool[rng.integers(0, len(pool), size=len(idx))]
+        frame['tenure'] = tenure
+
+        for col, table in self.account_.items():
+            frame[col] = _sample_conditional(rng, frame, table, ['Contract', 'Churn'])
+        for col, table in self.addons_.items():
+            frame[col] = _sample_conditional(rng, frame, table, ['InternetService', 'Churn'])
+        frame['MultipleLines'] = _sample_conditional(rng, frame, self.lines_, ['PhoneService', 'Churn'])
+        frame['SeniorCitizen'] = frame['SeniorCitizen'].astype(np.int64)
+
+        charges = _charge_design(frame) @ self.charge_coef_ + rng.normal(0, self.charge_std_, n)
+        charges = np.clip(charges * (1 + 0.15 * drift), *self.charge_range_).round(2)
+        frame['MonthlyCharges'] = charges
+
+        ratio = self.total_ratio_[rng.integers(0, len(self.total_ratio_), size=n)]
+        total = (tenure * charges * ratio).round(2)
+        frame['TotalCharges'] = np.where(tenure > 0, total, np.nan)  # raw file leaves new customers blank
+
+        frame['customerID'] = _customer_ids(np.arange(start_id, start_id + n))
+        return frame[COLUMN_ORDER]
+
+
+def stream_synthetic(n_rows, chunk_size=100_000, seed=Config.RANDOM_STATE, source_path=Config.RAW_DATA_PATH,
+                     blank_total_charges=0.0, duplicate_ids=0.0, drift=0.0):
+    """
+    Yields Telco-shaped chunks totalling `n_rows`; memory is bounded by `chunk_size`.
+    Dirty-data knobs: fraction of blank TotalCharges, fraction of re-used customer IDs, and a
+    drift level that ramps linearly from 0 at the first row to `drift` at the last.
+    """
+    rng = np.random.default_rng(seed)
+    synth = TelcoSynthesizer().fit(load_data(source_path, compact=False))
+    emitted = 0
+    while emitted < n_rows:
+        n = min(chunk_size, n_rows - emitted)
+        level = drift * (emitted + n / 2) / n_rows
+        chunk = synth.sample(n, rng, start_id=emitted, drift=level)
+
+        if blank_total_charges:
+            chunk.loc[rng.random(n) < blank_total_charges, 'TotalCharges'] = np.nan
+        if duplicate_ids:
+            dup = np.flatnonzero(rng.random(n) < duplicate_ids)
+            # Re-issue the ID of a customer written earlier in the stream (or earlier in this chunk)
+            source = rng.integers(0, np.maximum(emitted + dup, 1))
+            chunk.loc[dup, 'customerID'] = _customer_ids(source)
+
+        emitted += n
+        yield chunk
+
+
+def write_synthetic(output_path, n_rows, chunk_size=100_000, **kwargs):
+    """Streams a synthetic dataset to CSV (optionally .gz) or Parquet, chosen by extension."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    is_parquet = output_path.endswith(".parquet")
+    writer = None
+
+    try:
+        for i, chunk in enumerate(stream_synthetic(n_rows, chunk_size, **kwargs)):
+            if is_parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema, compression="zstd")
+                writer.write_table(table)
+            else:
+                # Blank TotalCharges are written as a single space, exactly like the raw export
+                chunk.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False, na_rep=" ")
+            logger.info("🧬 Synthetic rows written: %d / %d", min((i + 1) * chunk_size, n_rows), n_rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return output_path
+
+
+def main():
+    from src.logging_config import configure_logging
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Synthetic Telco-shaped data generator")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--output", required=True, help=".csv, .csv.gz or .parquet")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=Config.RANDOM_STATE)
+    parser.add_argument("--blank-total-charges", type=float, default=0.0)
+    parser.add_argument("--duplicate-ids", type=float, default=0.0)
+    parser.add_argument("--drift", type=float, default=0.0)
+    args = parser.parse_args()
+
+    write_synthetic(args.output, args.rows, args.chunk_size, seed=args.seed,
+                    blank_total_charges=args.blank_total_charges,
+                    duplicate_ids=args.duplicate_ids, drift=args.drift)
+    print(f"✅ {args.rows} synthetic customers written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,31 @@ import pandas as pd
 import time
 from sklearn.metrics import accuracy_score, roc_auc_score
 from src.models_factory import get_algorithm_suite
+from src.early_stopping import ValidationSplit, fit_model
+from src.model_costs import FitMeter, measure_inference, select_champion, within_budget
 from src.config import Config
 
+# Report labels of the resource measurements (src/model_costs.py)
+RESOURCE_LABELS = {
+    "latency_row_ms": "Latency Row (ms)", "latency_batch_ms": "Latency Batch (ms)",
+    "peak_train_rss_mb": "Peak Train RSS (MB)", "model_size_mb": "Model Size (MB)", "cpu_time_s": "CPU Time (s)",
+}
+
 def train_and_benchmark(X_train, X_test, y_train, y_test, feature_names):
     """Benchmarks 20 algorithms and saves the best one."""
     logging.info(f"Starting benchmark of 20 algorithms on {len(X_train)} samples...")
     
     models = get_algorithm_suite(Config.RANDOM_STATE)
     results = []
-    best_auc = 0
-    best_model_obj = None
-    best_model_name = ""
+    candidates = []
+    # Boosters stop on the AUC of a validation split carved from the training partition
+    split = ValidationSplit(X_train, y_train) if Config.EARLY_STOPPING else None
 
     for name, model in models.items():
         start_time = time.time()
         try:
-            model.fit(X_train, y_train)
+            with FitMeter() as meter:
+                rounds = fit_model(name, model, X_train, y_train, split)
             y_pred = model.predict(X_test)
             
             if hasattr(model, "predict_proba"):
@@ -30,31 +39,42 @@ def train_and_benchmark(X_train, X_test, y_train, y_test, feature_names):
             
             acc = accuracy_score(y_test, y_pred)
             elapsed = time.time() - start_time
+            costs = {"cpu_time_s": round(meter.cpu_time_s, 3), "peak_train_rss_mb": meter.peak_train_rss_mb,
+                     **measure_inference(model, X_test)}
             
             results.append({
                 "Algorithm": name,
                 "ROC-AUC": auc,
                 "Accuracy": acc,
-                "Training Time (s)": elapsed
+                "Training Time (s)": elapsed,
+                "Best Iteration": rounds,
+                **{RESOURCE_LABELS[column]: value for column, value in costs.items()},
+                "Within Budget": within_budget(costs)
             })
+            candidates.append({"algorithm": name, "roc_auc": auc, "model": model, "best_iteration": rounds, **costs})
             
-            logging.info(f"✅ {name:20} | AUC: {auc:.4f}")
+            logging.info(f"✅ {name:20} | AUC: {auc:.4f} | {costs['latency_row_ms']:.3f} ms/row")
             
-            if auc > best_auc:
-                best_auc = auc
-                best_model_obj = model
-                best_model_name = name
-                
         except Exception as e:
             logging.error(f"❌ {name} failed: {e}")
 
+    # Best AUC within the latency / memory budgets (Config.CHAMPION_MAX_*)
+    champion, selection = select_champion(candidates)
+    best_model_name, best_auc = champion["algorithm"], champion["roc_auc"]
+    for row in results:
+        row["Is Champion"] = row["Algorithm"] == best_model_name
+
     results_df = pd.DataFrame(results).sort_values(by="ROC-AUC", ascending=False)
+    results_df["Best Iteration"] = results_df["Best Iteration"].astype("Int64")
     results_df.to_csv(Config.BENCHMARK_REPORT_PATH, index=False)
     
     payload = {
-        'model': best_model_obj,
+        'model': champion["model"],
         'model_name': best_model_name,
         'auc': best_auc,
+        'best_iteration': champion["best_iteration"],
+        'resources': {column: champion[column] for column in RESOURCE_LABELS},
+        'selection': selection,
         'feature_names': feature_names
     }
     joblib.dump(payload, Config.BEST_MODEL_PATH)
@@ -3,8 +3,7 @@ from pandera import Check, Column, DataFrameSchema
 import pandas as pd
 import logging
 
-# Configure Enterprise Logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Handlers are installed by the entry point (see src/logging_config.py)
 logger = logging.getLogger(__name__)
 
 class DataValidator:
@@ -13,13 +12,18 @@ class DataValidator:
     Implements Schema Validation, Duplicate Detection, and Null Policy auditing.
     """
     
+    # Dtype-family checks: compact frames (int16 / float32 / category) validate like wide ones
+    # (float32 passes IS_FLOAT as float64 does; integer charges fail it, as Column(float) did)
+    IS_INTEGER = Check(lambda s: pd.api.types.is_integer_dtype(s.dtype), error="expected integer dtype")
+    IS_FLOAT = Check(lambda s: pd.api.types.is_float_dtype(s.dtype), error="expected float dtype")
+
     # Institutional Schema Definition
     SCHEMA = DataFrameSchema({
         "customerID": Column(str, unique=True, required=False),
-        "tenure": Column(int, Check.greater_than_or_equal_to(0), required=False),
-        "MonthlyCharges": Column(float, Check.in_range(0, 1000), required=False),
-        "TotalCharges": Column(float, nullable=True, required=False),
-        "Churn": Column(str, Check.isin(["Yes", "No"]), required=False)
+        "tenure": Column(checks=[IS_INTEGER, Check.greater_than_or_equal_to(0)], required=False),
+        "MonthlyCharges": Column(checks=[IS_FLOAT, Check.in_range(0, 1000)], required=False),
+        "TotalCharges": Column(checks=[IS_FLOAT], nullable=True, required=False),
+        "Churn": Column(checks=[Check.isin(["Yes", "No"])], required=False)
     })
 
     @staticmethod
@@ -27,7 +31,7 @@ class DataValidator:
         """
         Executes the full validation suite. Returns (is_valid, error_message).
         """
-        logger.info(f"🛡️ Initializing {context} Data Validation Protocol...")
+        logger.info("🛡️ Initializing %s Data Validation Protocol...", context)
         
         # 1. Schema Validation (Pandera)
         try:
@@ -35,9 +39,9 @@ class DataValidator:
             logger.info("✅ Schema Validation: SUCCESS")
         except pa.errors.SchemaErrors as err:
             err_msg = f"Schema mapping violation: {str(err)}"
-            logger.error(f"❌ Schema Validation: FAILED\n{err_msg}")
+            logger.error("❌ Schema Validation: FAILED\n%s", err_msg)
             # Format error message to be more human readable if it's a type error
-            if "expected series" in err_msg and "TotalCharges" in err_msg:
+            if "TotalCharges" in err_msg and ("expected series" in err_msg or "expected float dtype" in err_msg):
                 err_msg = "Critical Type Skew: 'TotalCharges' contains non-numeric characters (e.g. spaces). Ensure data is cleaned."
             return False, err_msg
 
@@ -46,7 +50,7 @@ class DataValidator:
             duplicates = df.duplicated("customerID").sum()
             if duplicates > 0:
                 err_msg = f"Institutional Safety violation: {duplicates} non-unique customer instances detected."
-                logger.error(f"❌ Duplicate Detection: FAILED ({err_msg})")
+                logger.error("❌ Duplicate Detection: FAILED (%s)", err_msg)
                 return False, err_msg
         logger.info("✅ Duplicate Detection: SUCCESS")
 
@@ -57,7 +61,7 @@ class DataValidator:
         
         if critical_nulls:
             err_msg = f"Data Quality violation: Features {critical_nulls} exceed the 25% null threshold."
-            logger.error(f"❌ Null Policy Audit: FAILED ({err_msg})")
+            logger.error("❌ Null Policy Audit: FAILED (%s)", err_msg)
             return False, err_msg
             
         logger.info("✅ Null Policy Audit: COMPLETE")
@@ -1,29 +1,138 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import hashlib
+import json
 import os
+
+import numpy as np
+import pandas as pd
 from src.config import Config
 
-def generate_production_figures(data_path):
-    """Generates premium EDA figures for the production report."""
-    if not os.path.exists(data_path):
+FIGURE_FILES = ["retention_overview.png", "tenure_risk_distribution.png"]
+FIGURE_COLUMNS = ['tenure', 'Churn']
+
+
+def input_hash(data_path):
+    """sha256 of the input file's bytes (streamed)."""
+    digest = hashlib.sha256()
+    with open(data_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _iter_figure_columns(data_path):
+    """Yields frames holding only tenure and Churn: columnar files decode just those, CSVs stream in chunks."""
+    from src.io_formats import COLUMNAR_FORMATS, read_columnar, sniff_file
+
+    fmt = sniff_file(data_path)
+    if fmt in COLUMNAR_FORMATS:
+        df = read_columnar(data_path, fmt, columns=FIGURE_COLUMNS)
+        yield df.rename(columns={c: w for c in df.columns for w in FIGURE_COLUMNS
+                                 if str(c).strip().lower() == w.lower()})
         return
-        
-    df = pd.read_csv(data_path)
+    compression = fmt if fmt in ('gzip', 'zstd') else None
+    yield from pd.read_csv(data_path, usecols=FIGURE_COLUMNS, dtype={'Churn': 'category'},
+                           compression=compression, chunksize=Config.FIGURE_CHUNK_ROWS)
+
+
+def compute_figure_aggregates(data_path):
+    """
+    One streaming pass: churn counts and, per churn label, a histogram of tenure in whole
+    months. This is everything both figures need, whatever the size of the input.
+    """
+    churn_counts = {}
+    tenure_hist = {}
+    for chunk in _iter_figure_columns(data_path):
+        churn = chunk['Churn'].astype(str).to_numpy()
+        tenure = pd.to_numeric(chunk['tenure'], errors='coerce').to_numpy(dtype=np.float64)
+        valid = ~np.isnan(tenure)
+        months = np.clip(np.rint(tenure[valid]), 0, None).astype(np.int64)
+        labels, counts = np.unique(churn, return_counts=True)
+        # First-appearance order, as pandas/seaborn would order the hue levels
+        for label in pd.unique(churn):
+            churn_counts[label] = churn_counts.get(label, 0) + int(counts[labels == label][0])
+            hist = np.bincount(months[churn[valid] == label])
+            previous = np.asarray(tenure_hist.get(label, []), dtype=np.int64)
+            size = max(len(previous), len(hist))
+            tenure_hist[label] = (np.pad(previous, (0, size - len(previous)))
+                                  + np.pad(hist, (0, size - len(hist)))).tolist()
+    return {"churn_counts": churn_counts, "tenure_hist": tenure_hist}
+
+
+def tenure_sample(tenure_hist, max_points=None):
+    """
+    Rebuilds the tenure column from its histogram for the KDE. Inputs above `max_points`
+    rows are downsampled deterministically in proportion to every (label, month) bin.
+    """
+    max_points = max_points or Config.FIGURE_KDE_MAX_POINTS
+    total = sum(sum(counts) for counts in tenure_hist.values())
+    scale = min(1.0, max_points / total) if total else 1.0
+    frames = []
+    for label, counts in tenure_hist.items():
+        counts = np.asarray(counts, dtype=np.int64)
+        if scale < 1.0:
+            counts = np.rint(counts * scale).astype(np.int64)
+        tenure = np.repeat(np.arange(len(counts)), counts)
+        frames.append(pd.DataFrame({'tenure': tenure, 'Churn': label}))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=FIGURE_COLUMNS)
+
+
+def render_figures(aggregates, dpi=None):
+    """Draws both PNGs from the aggregates."""
+    # Plotting stack is imported on demand (it dominates import time of any caller)
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    dpi = dpi or Config.FIGURE_DPI
+    os.makedirs(Config.FIGURES_DIR, exist_ok=True)
     sns.set_theme(style="whitegrid", palette="muted")
-    
+
     # Figure 1: Risk Distribution
     plt.figure(figsize=(10, 6))
-    df['Churn'].value_counts().plot(kind='pie', autopct='%1.1f%%', colors=['#45B39D', '#EC7063'])
+    counts = pd.Series(aggregates["churn_counts"], name='count').sort_values(ascending=False, kind='stable')
+    counts.plot(kind='pie', autopct='%1.1f%%', colors=['#45B39D', '#EC7063'])
     plt.title("Customer Retention Overview", fontsize=14, fontweight='bold')
-    plt.savefig(os.path.join(Config.FIGURES_DIR, "retention_overview.png"), dpi=300)
+    plt.savefig(os.path.join(Config.FIGURES_DIR, FIGURE_FILES[0]), dpi=dpi)
     plt.close()
 
     # Figure 2: Tenure Risk
     plt.figure(figsize=(10, 6))
-    sns.kdeplot(data=df, x='tenure', hue='Churn', fill=True, palette=['#45B39D', '#EC7063'])
+    sns.kdeplot(data=tenure_sample(aggregates["tenure_hist"]), x='tenure', hue='Churn', fill=True,
+                palette=['#45B39D', '#EC7063'])
     plt.title("Churn Risk vs. Tenure (Months)", fontsize=14, fontweight='bold')
-    plt.savefig(os.path.join(Config.FIGURES_DIR, "tenure_risk_distribution.png"), dpi=300)
+    plt.savefig(os.path.join(Config.FIGURES_DIR, FIGURE_FILES[1]), dpi=dpi)
     plt.close()
-    
+
+
+def generate_production_figures(data_path):
+    """
+    Generates premium EDA figures for the production report. Rendering is skipped when the
+    input and settings match the last render; a settings-only change reuses the cached
+    aggregates instead of re-reading the data. Returns True when the PNGs were redrawn.
+    """
+    if not os.path.exists(data_path):
+        return False
+
+    digest = input_hash(data_path)
+    settings = {"dpi": Config.FIGURE_DPI, "kde_max_points": Config.FIGURE_KDE_MAX_POINTS}
+    cache = {}
+    if os.path.exists(Config.FIGURE_CACHE_PATH):
+        with open(Config.FIGURE_CACHE_PATH) as f:
+            cache = json.load(f)
+
+    figures_exist = all(os.path.exists(os.path.join(Config.FIGURES_DIR, name)) for name in FIGURE_FILES)
+    if cache.get("input_hash") == digest and cache.get("settings") == settings and figures_exist:
+        print(f"♻️ Figures up to date in {Config.FIGURES_DIR} (input unchanged)")
+        return False
+
+    if cache.get("input_hash") == digest and "aggregates" in cache:
+        aggregates = cache["aggregates"]
+    else:
+        aggregates = compute_figure_aggregates(data_path)
+    render_figures(aggregates, settings["dpi"])
+
+    with open(Config.FIGURE_CACHE_PATH, 'w') as f:
+        json.dump({"input_hash": digest, "settings": settings, "aggregates": aggregates}, f)
     print(f"✅ Figures generated in {Config.FIGURES_DIR}")
+    return True
@@ -0,0 +1,700 @@
+import os
+import sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.perf_utils import latency_summary, find_regressions
+
+
+def test_latency_summary_percentiles():
+    stats = latency_summary([0.001 * i for i in range(1, 101)])
+
+    assert stats["count"] == 100
+    assert round(stats["p50_ms"], 1) == 50.5
+    assert stats["p99_ms"] <= stats["max_ms"] == 100.0
+    assert latency_summary([])["p95_ms"] is None
+
+
+def test_find_regressions_respects_direction():
+    baseline = {"overall": {"p95_ms": 100.0, "requests_per_s": 50.0}}
+    faster = {"overall": {"p95_ms": 80.0, "requests_per_s": 70.0}}
+    slower = {"overall": {"p95_ms": 130.0, "requests_per_s": 30.0}}
+    kwargs = dict(lower_is_better=("p95_ms",), higher_is_better=("requests_per_s",))
+
+    assert find_regressions(faster, baseline, 0.15, **kwargs) == []
+    assert len(find_regressions(slower, baseline, 0.15, **kwargs)) == 2
+
+
+def test_request_log_sampling_drops_unsampled_debug():
+    import logging
+    from src.logging_config import _RequestSamplingFilter, sample_request_logs
+
+    debug = logging.LogRecord("api", logging.DEBUG, __file__, 1, "cols %s", (["a"],), None)
+    error = logging.LogRecord("api", logging.ERROR, __file__, 1, "boom", None, None)
+    sampling = _RequestSamplingFilter()
+
+    assert sample_request_logs(rate=0.0) is False
+    assert not sampling.filter(debug)
+    assert sampling.filter(error)
+
+    assert sample_request_logs(rate=1.0) is True
+    assert sampling.filter(debug)
+
+
+def test_synthetic_generator_preserves_churn_structure():
+    import pandas as pd
+    from src.config import Config
+    from src.data_loader import load_data
+    from src.synthetic_data import stream_synthetic
+
+    raw = load_data(Config.RAW_DATA_PATH, compact=False)
+    chunks = list(stream_synthetic(20_000, chunk_size=5_000, blank_total_charges=0.01, duplicate_ids=0.01))
+    synth = pd.concat(chunks, ignore_index=True)
+
+    assert len(chunks) == 4 and len(synth) == 20_000
+    assert list(synth.columns) == list(raw.columns)
+
+    churn_by_contract = lambda df: df.groupby('Contract')['Churn'].apply(lambda s: (s == 'Yes').mean())
+    assert (churn_by_contract(synth) - churn_by_contract(raw)).abs().max() < 0.03
+    assert abs(synth['tenure'].mean() - raw['tenure'].mean()) < 2
+
+    assert synth['customerID'].duplicated().sum() > 0
+    assert synth['TotalCharges'].isna().mean() > 0.005
+
+
+def test_out_of_core_training_streams_chunks(tmp_path, monkeypatch):
+    import numpy as np
+    from sklearn.metrics import roc_auc_score
+    from src.config import Config
+    from src.incremental_training import (
+        BoosterClassifier, StreamingAUC, iter_engineered_chunks, run_out_of_core_training, split_xy
+    )
+    from src.synthetic_data import write_synthetic
+
+    rng = np.random.default_rng(0)
+    y, scores = rng.integers(0, 2, 5_000), rng.random(5_000)
+    scores[y == 1] += 0.3
+    metric = StreamingAUC()
+    metric.update(y[:2_500], scores[:2_500])
+    metric.update(y[2_500:], scores[2_500:])
+    assert abs(metric.auc() - roc_auc_score(y, scores)) < 1e-3
+
+    data_path = str(tmp_path / "synthetic.csv")
+    write_synthetic(data_path, 12_000, chunk_size=4_000)
+    monkeypatch.setattr(Config, "MODELS_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(Config, "PRODUCTION_BUNDLE_PATH", str(tmp_path / "models" / "production_bundle"))
+    monkeypatch.setattr(Config, "BENCHMARK_REPORT_PATH", str(tmp_path / "benchmark.csv"))
+
+    pipeline, bundle_path = run_out_of_core_training(data_path, chunksize=4_000)
+    X, y = split_xy(next(iter_engineered_chunks(data_path, 1_000)))
+    assert roc_auc_score(y, pipeline.predict_proba(X)[:, 1]) > 0.75
+    assert os.path.exists(bundle_path)
+
+    Xp = pipeline.named_steps['prep'].transform(X)
+    for backend in ("xgboost", "lightgbm"):
+        booster = BoosterClassifier(backend=backend, num_boost_round=20).fit(Xp, y)
+        assert roc_auc_score(y, booster.predict_proba(Xp)[:, 1]) > 0.75
+
+
+def test_model_registry_routes_and_shadows(tmp_path):
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+    from src.model_registry import ModelRegistry, parse_traffic_split
+
+    X = pd.DataFrame({'tenure': np.arange(40.0)})
+    y = (X['tenure'] < 20).astype(int)
+    (tmp_path / "registry").mkdir()
+    joblib.dump({'pipeline': LogisticRegression().fit(X, y), 'metadata': {}}, tmp_path / "production_pipeline_bundle.joblib")
+    joblib.dump({'pipeline': LogisticRegression(C=0.01).fit(X, y), 'metadata': {}}, tmp_path / "registry" / "challenger.joblib")
+
+    assert parse_traffic_split("production=90, challenger=10") == {'production': 0.9, 'challenger': 0.1}
+    registry = ModelRegistry(str(tmp_path), str(tmp_path / "registry"), traffic_split="challenger=1",
+                             shadow_version="challenger", shadow_sample_rate=1.0, shadow_max_pending=1)
+    assert registry.route() == "challenger"
+    assert registry.route("production") == "production"
+    try:
+        registry.route("missing")
+        assert False, "unknown versions must be rejected"
+    except KeyError:
+        pass
+
+    # The directory listing is cached, and refreshed when a bundle is added
+    assert set(registry.paths()) == {"production", "challenger"}
+    joblib.dump({'pipeline': LogisticRegression().fit(X, y), 'metadata': {}}, tmp_path / "registry" / "next.joblib")
+    assert registry.route("next") == "next"
+
+    probs = registry.predict_proba("production", X)
+    registry.maybe_shadow("production", X, probs).result()
+    registry._shadow_slots.acquire()  # every slot busy: the request is not shadowed
+    assert registry.maybe_shadow("production", X, probs) is None and registry.describe()['shadow']['dropped'] == 1
+    registry._shadow_slots.release()
+    registry.shutdown()
+
+    comparison = registry.describe()['shadow']['comparisons'][0]
+    assert comparison['rows'] == 40 and comparison['failures'] == 0
+    assert 0.5 <= comparison['label_agreement'] <= 1.0
+
+
+def test_worker_memory_probes_and_mmap_registry(tmp_path):
+    import subprocess
+    import joblib
+    import numpy as np
+    from src.model_registry import ModelRegistry
+    from src.perf_utils import child_pids, current_rss_mb, pss_mb
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        import pytest
+        pytest.skip("needs Linux /proc")
+
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        assert child.pid in child_pids(os.getpid())
+        assert 0 < pss_mb(child.pid) <= current_rss_mb(child.pid)
+    finally:
+        child.kill()
+        child.wait()
+
+    joblib.dump({'pipeline': None, 'weights': np.arange(100_000.0)}, tmp_path / "production_pipeline_bundle.joblib")
+    registry = ModelRegistry(str(tmp_path), str(tmp_path / "registry"), mmap_mode="r")
+    assert registry.preload() == ["production"]
+    assert isinstance(registry.get()['weights'], np.memmap)
+
+
+def test_upload_formats_detected_from_magic_bytes():
+    import gzip
+    import io
+    import pandas as pd
+    from src.io_formats import decompress, read_columnar, sniff_format
+
+    df = pd.DataFrame({'customerID': ['A', 'B'], 'Tenure ': [1, 2], 'Contract': ['One year', 'Two year']})
+    parquet = io.BytesIO()
+    df.to_parquet(parquet)
+    feather = io.BytesIO()
+    df.to_feather(feather)
+    csv = df.to_csv(index=False).encode()
+
+    assert sniff_format(csv) == "csv"
+    assert sniff_format(parquet.getvalue()) == "parquet"
+    assert sniff_format(feather.getvalue()) == "arrow"
+    assert decompress(gzip.compress(csv), sniff_format(gzip.compress(csv))) == csv
+
+    for payload, fmt in [(parquet.getvalue(), "parquet"), (feather.getvalue(), "arrow")]:
+        projected = read_columnar(payload, fmt, ['customerID', 'tenure'])
+        assert list(projected.columns) == ['customerID', 'Tenure ']
+        assert isinstance(projected['Tenure '].dtype, pd.ArrowDtype)
+
+
+def test_streamed_predictions_match_single_document():
+    import json
+    import numpy as np
+    import pandas as pd
+    from src.serving import (SummaryAccumulator, iter_ndjson, negotiate, prediction_frame,
+                             prediction_records, score_chunks)
+
+    df = pd.DataFrame({
+        'customerID': ['a', 'b', 'c', 'd', 'e'],
+        'tenure': [1, 30, 3, 70, 12],
+        'MonthlyCharges': np.array([99.5, 20.0, 70.0, 25.0, 50.0], dtype=np.float32),
+        'Contract': pd.Categorical(['Month-to-month', 'Two year', 'Month-to-month', 'One year', 'One year']),
+        'PaymentMethod': ['Electronic check', 'Mailed check', 'Mailed check', 'Electronic check', 'Mailed check'],
+    })
+    probs = np.array([0.9, 0.1, 0.7, 0.3, 0.6])
+    frame = prediction_frame(df, probs)
+    assert frame['risk_level'].tolist() == ['Critical', 'Loyal', 'At-Risk', 'Stable', 'Stable']
+    assert frame['primary_reason'].tolist() == [
+        'High-risk monthly contract + Unstable payment', 'Stable profile',
+        'High-risk monthly contract + High charges', 'Unstable payment', 'Stable profile']
+
+    whole = SummaryAccumulator()
+    whole.update(frame, probs)
+    streamed = SummaryAccumulator()
+    chunks = score_chunks(df, lambda part: probs[part.index], chunk_rows=2, summary=streamed)
+    lines = [json.loads(line) for line in b"".join(iter_ndjson(chunks, streamed)).splitlines()]
+
+    assert lines[:-1] == prediction_records(frame)
+    assert lines[-1]['summary'] == whole.result()
+    assert negotiate("application/x-ndjson") == "ndjson" and negotiate(None) == "json"
+
+
+def test_result_store_pages_filters_and_evicts():
+    import numpy as np
+    import pandas as pd
+    from src.result_store import ResultStore
+
+    n = 250
+    frame = pd.DataFrame({
+        'customer_id': [f"C{i:04d}" for i in range(n)],
+        'churn_probability': np.linspace(0, 99, n),
+        'risk_level': np.where(np.arange(n) % 2 == 0, 'Critical', 'Loyal'),
+        'contract_type': np.where(np.arange(n) % 5 == 0, 'Two year', 'Month-to-month'),
+    })
+    store = ResultStore(max_results=2)
+    result = store.put(frame, {'total_customers': n}, 'production')
+
+    seen, cursor = [], None
+    while True:
+        page = result.page(cursor, limit=100, risk_level='critical')
+        seen += [row['churn_probability'] for row in page['predictions']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert len(seen) == 125 and seen == sorted(seen, reverse=True)
+    assert result.page(risk_level='CRITICAL', contract='two year')['total_matching'] == 25
+    assert result.page(search='c0249')['predictions'][0]['customer_id'] == 'C0249'
+
+    store.put(frame, {}, 'production')
+    store.put(frame, {}, 'production')
+    assert store.get(result.result_id) is None and store.stats()['results'] == 2
+
+
+def test_api_import_stays_lazy():
+    from benchmarks.startup import measure
+    from src.models_factory import ALGORITHM_SPECS, get_algorithm
+
+    result = measure("app", repeat=1)
+    assert result["forbidden_imports"] == []
+    assert result["slowest_direct_imports"]
+
+    assert len(ALGORITHM_SPECS) == 20
+    assert get_algorithm("Random Forest", random_state=7).random_state == 7
+
+
+def test_cpu_budget_divides_cores(monkeypatch):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from src import cpu_budget
+    from src.config import Config
+    from src.models_factory import get_algorithm
+
+    monkeypatch.setattr(Config, "CPU_LIMIT", 8)
+    assert cpu_budget.threads_per_task() == 8
+    assert cpu_budget.threads_per_task(parallel_tasks=2, processes=2) == 2
+    assert cpu_budget.threads_per_task(parallel_tasks=16) == 1
+
+    assert get_algorithm("Random Forest").n_jobs == 8
+    assert get_algorithm("CatBoost", n_jobs=3).get_params()["thread_count"] == 3
+    pipe = cpu_budget.apply_estimator_threads(
+        Pipeline([("prep", StandardScaler()), ("clf", get_algorithm("XGBoost"))]), 4)
+    assert pipe.named_steps["clf"].n_jobs == 4
+
+
+def test_incremental_scoring_rescores_only_changed_rows(tmp_path, monkeypatch):
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+    from src.config import Config
+    from src.data_loader import load_data
+    from src.incremental_scoring import incremental_churn_report
+    from src.preprocess import inference_features
+
+    df = load_data(Config.RAW_DATA_PATH).head(400)
+    df['TotalCharges'] = df['TotalCharges'].astype(str).str.strip().replace('', '0').astype(float)
+    X = pd.get_dummies(df.drop(columns=['customerID', 'Churn']), drop_first=True)
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression(max_iter=500).fit(scaler.transform(X), df['Churn'] == 'Yes')
+    monkeypatch.setattr(Config, "BEST_MODEL_PATH", str(tmp_path / "best_model.joblib"))
+    monkeypatch.setattr(Config, "SCALER_PATH", str(tmp_path / "scaler.joblib"))
+    monkeypatch.setattr(Config, "SCORE_INDEX_PATH", str(tmp_path / "score_index.parquet"))
+    joblib.dump({'model': model, 'model_name': 'LR'}, Config.BEST_MODEL_PATH)
+    joblib.dump(scaler, Config.SCALER_PATH)
+
+    _, stats = incremental_churn_report(df)
+    assert stats["full_rescore"] and stats["rescored"] == 400
+
+    changed = df.copy()
+    changed.loc[changed.index[:5], 'MonthlyCharges'] += 10
+    report, stats = incremental_churn_report(changed.iloc[:-3])
+    assert (stats["rescored"], stats["reused"]) == (5, 392)
+    expected = model.predict_proba(inference_features(changed.iloc[:-3], scaler))[:, 1]
+    assert np.allclose(report['ConfidenceScore'].to_numpy(), expected)
+
+    joblib.dump({'model': model, 'model_name': 'LR v2'}, Config.BEST_MODEL_PATH)
+    _, stats = incremental_churn_report(changed)
+    assert stats["full_rescore"] and stats["rescored"] == 400
+
+
+def test_incremental_scoring_matches_full_report(tmp_path, monkeypatch):
+    import joblib
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from src.config import Config
+    from src.data_loader import load_data
+    from src.incremental_scoring import incremental_churn_report
+    from src.predict import generate_churn_report
+    from src.preprocess import inference_features, prepare_data
+
+    monkeypatch.setattr(Config, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "BEST_MODEL_PATH", str(tmp_path / "best_model.joblib"))
+    monkeypatch.setattr(Config, "SCALER_PATH", str(tmp_path / "scaler.joblib"))
+    monkeypatch.setattr(Config, "SCORE_INDEX_PATH", str(tmp_path / "score_index.parquet"))
+    raw_df = load_data(Config.RAW_DATA_PATH)
+
+    # The --mode predict path: prepare_data winsorizes the extract in place, then scores all of it
+    full_df = raw_df.copy()
+    X_train, _, y_train, _, _, _, scaler = prepare_data(full_df)
+    joblib.dump({'model': LogisticRegression(max_iter=500).fit(X_train, y_train), 'model_name': 'LR'},
+                Config.BEST_MODEL_PATH)
+    full = generate_churn_report(inference_features(full_df, scaler), full_df['customerID'])
+
+    # The --incremental path sees the extract as delivered and clips with the saved bounds
+    incremental, stats = incremental_churn_report(raw_df)
+    assert stats["full_rescore"]
+    assert np.allclose(incremental['ConfidenceScore'].to_numpy(), full['ConfidenceScore'].to_numpy())
+    assert (incremental['RiskLevel'].to_numpy() == full['RiskLevel'].to_numpy()).all()
+
+
+def test_figures_from_aggregates_skip_unchanged_input(tmp_path, monkeypatch):
+    import pandas as pd
+    from src import visualization
+    from src.config import Config
+
+    data = tmp_path / "customers.csv"
+    pd.read_csv(Config.RAW_DATA_PATH).head(300).to_csv(data, index=False)
+    monkeypatch.setattr(Config, "FIGURES_DIR", str(tmp_path / "figures"))
+    monkeypatch.setattr(Config, "FIGURE_CACHE_PATH", str(tmp_path / "figures" / "cache.json"))
+    monkeypatch.setattr(Config, "FIGURE_CHUNK_ROWS", 64)
+    monkeypatch.setattr(Config, "FIGURE_DPI", 20)
+
+    raw = pd.read_csv(data)
+    aggregates = visualization.compute_figure_aggregates(str(data))
+    assert aggregates["churn_counts"] == raw['Churn'].value_counts().to_dict()
+    sample = visualization.tenure_sample(aggregates["tenure_hist"])
+    assert sorted(sample['tenure']) == sorted(raw['tenure'])
+    assert len(visualization.tenure_sample(aggregates["tenure_hist"], max_points=30)) <= 35
+
+    assert visualization.generate_production_figures(str(data)) is True
+    assert visualization.generate_production_figures(str(data)) is False
+    monkeypatch.setattr(Config, "FIGURE_DPI", 30)
+    assert visualization.generate_production_figures(str(data)) is True
+
+
+def test_bundle_manifest_lazy_payload_and_legacy_fallback(tmp_path):
+    import os
+    import threading
+    import joblib
+    import numpy as np
+    import pytest
+    from sklearn.linear_model import LogisticRegression
+    from src.bundle_io import BundleIntegrityError, bundle_metadata, load_bundle, save_bundle
+    from src.model_registry import ModelRegistry
+
+    X, y = np.random.RandomState(0).rand(200, 3), np.arange(200) % 2
+    model = LogisticRegression().fit(X, y)
+    (tmp_path / "registry").mkdir()
+    joblib.dump({'pipeline': model, 'metadata': {'engine': 'legacy'}}, tmp_path / "production_pipeline_bundle.joblib")
+    registry = ModelRegistry(models_dir=str(tmp_path), registry_dir=str(tmp_path / "registry"))
+    assert registry.get()['metadata']['engine'] == 'legacy'
+
+    path = save_bundle(str(tmp_path / "production_bundle"),
+                       {'pipeline': model, 'auc_score': 0.9, 'metadata': {'engine': 'LR', 'features': ['a', 'b', 'c']}})
+    assert bundle_metadata(path) == {'engine': 'LR', 'features': ['a', 'b', 'c']}
+    registry = ModelRegistry(models_dir=str(tmp_path), registry_dir=str(tmp_path / "registry"), mmap_mode='r')
+    bundle = registry.get()
+    assert bundle['auc_score'] == 0.9 and not bundle.loaded
+    assert np.allclose(registry.predict_proba('production', X), model.predict_proba(X)[:, 1])
+    assert isinstance(bundle['pipeline'].coef_, np.memmap)
+
+    with open(tmp_path / "production_bundle" / "payload.joblib", "r+b") as f:
+        f.seek(-1, 2)
+        f.write(b"\0")
+    with pytest.raises(BundleIntegrityError):
+        load_bundle(path)['pipeline']
+
+    # Manifest read before a rewrite, payload loaded after it: the new bundle loads
+    stale = load_bundle(path)
+    retrained = LogisticRegression(C=0.01).fit(X, y)
+    save_bundle(path, {'pipeline': retrained, 'auc_score': 0.95, 'metadata': {'engine': 'LR v2'}})
+    assert np.allclose(stale['pipeline'].coef_, retrained.coef_) and stale['metadata']['engine'] == 'LR v2'
+
+    # A registry scan between write_bundle's two renames waits for the new directory and
+    # never caches the legacy file it falls back to while the swap is unfinished
+    os.replace(path, f"{path}.old-1")
+    threading.Timer(0.02, os.replace, (f"{path}.old-1", path)).start()
+    registry = ModelRegistry(models_dir=str(tmp_path), registry_dir=str(tmp_path / "registry"))
+    assert registry.get()['metadata']['engine'] == 'LR v2'
+    os.replace(path, f"{path}.old-1")
+    registry = ModelRegistry(models_dir=str(tmp_path), registry_dir=str(tmp_path / "registry"))
+    assert registry.get()['metadata']['engine'] == 'legacy' and 'production' not in registry._bundles
+    os.replace(f"{path}.old-1", path)
+    assert registry.get()['metadata']['engine'] == 'LR v2'
+
+
+def test_response_cache_bounds_and_sample_hits(tmp_path):
+    import asyncio
+    import app
+    from src.response_cache import FileDigest, ResponseCache, cache_key, upload_digest
+
+    cache = ResponseCache(max_bytes=250, max_entries=10)
+    for i in range(3):
+        cache.put(cache_key(upload_digest(b"%d" % i), "m1"), b"x" * 100)
+    assert cache.get(cache_key(upload_digest(b"0"), "m1")) is None
+    assert cache.get(cache_key(upload_digest(b"2"), "m1")).body == b"x" * 100
+    assert cache.get(cache_key(upload_digest(b"2"), "m2")) is None
+    assert cache.put("big", b"x" * 300) is None and cache.stats()["bytes"] == 200
+
+    sample = tmp_path / "sample.csv"
+    sample.write_bytes(b"a,b\n1,2\n")
+    digest = FileDigest(str(sample))
+    assert digest.get() == upload_digest(sample.read_bytes())
+    sample.write_bytes(b"a,b\n1,3\n")
+    assert digest.get() == upload_digest(b"a,b\n1,3\n")
+
+    call = lambda: asyncio.run(app.test_sample_data(top_n=None, x_model_version=None, accept=None, accept_encoding=None))
+    first, second = call(), call()
+    assert second.headers.get("x-cache") == "hit" and second.body == first.body
+
+
+def test_admission_queues_smallest_first_and_sheds():
+    import asyncio
+    import threading
+    import pytest
+    from fastapi import HTTPException
+    import app
+    from src.admission import AdmissionController, Overloaded, estimate_rows
+
+    assert estimate_rows(b"a,b\n1,2\n3,4\n", "csv") == 3
+
+    async def scenario():
+        ctl = AdmissionController(max_rows=100, max_bytes=10**9, queue_size=2, queue_timeout_s=5, workers=1)
+        held = await ctl.acquire(90, 1)
+        order = []
+
+        async def wait(rows):
+            ticket = await ctl.acquire(rows, 1)
+            order.append(rows)
+            return ticket
+
+        bulk = asyncio.create_task(wait(80))
+        small = asyncio.create_task(wait(20))
+        await asyncio.sleep(0.01)
+        with pytest.raises(Overloaded) as shed:
+            await ctl.acquire(50, 1)
+        assert shed.value.retry_after >= 1
+        # Budgets may be returned from a threadpool thread (streamed responses)
+        threading.Thread(target=ctl.release, args=(held,)).start()
+        ticket = await small
+        ctl.release(ticket)
+        ctl.release(await bulk)
+        assert order == [20, 80]
+        stats = ctl.stats()
+        assert stats["rows_in_flight"] == 0 and stats["shed_queue_full"] == 1
+
+        timed_out = AdmissionController(max_rows=10, queue_size=1, queue_timeout_s=0.05, workers=1)
+        await timed_out.acquire(10, 1)
+        with pytest.raises(Overloaded):
+            await timed_out.acquire(5, 1)
+        assert timed_out.stats()["queue_depth"] == 0
+
+    asyncio.run(scenario())
+
+    original = app._ADMISSION
+    app._ADMISSION = AdmissionController(max_rows=10, queue_size=0, workers=1)
+    try:
+        app._ADMISSION._take(10, 1)
+        with pytest.raises(HTTPException) as rejected:
+            asyncio.run(app._admit(b"a\n1\n", "csv"))
+        assert rejected.value.status_code == 429 and "Retry-After" in rejected.value.headers
+    finally:
+        app._ADMISSION = original
+
+
+def test_customer_store_lookup_and_atomic_swap(tmp_path):
+    import pandas as pd
+    import pytest
+    from src.customer_store import COLUMN_NAMES, CustomerStore, write_store
+
+    def frame(ids, prob):
+        return pd.DataFrame({name: ["x"] * len(ids) for name in COLUMN_NAMES}).assign(
+            customer_id=ids, tenure_months=3, monthly_charges=70.5, churn_probability=prob)
+
+    path = str(tmp_path / "customers.sqlite")
+    store = CustomerStore(path)
+    with pytest.raises(FileNotFoundError):
+        store.lookup("A")
+
+    assert write_store([frame(["A", "B"], 10.0), frame(["B"], 20.0)], path, model_version="v1") == 2
+    assert store.lookup("B")["churn_probability"] == 20.0
+    assert store.lookup("A")["tenure_months"] == 3 and store.lookup("Z") is None
+
+    # A new run replaces the file; open readers switch to it on their next lookup
+    write_store([frame(["A"], 90.0)], path, model_version="v2")
+    customer = store.lookup("A")
+    assert customer["churn_probability"] == 90.0 and customer["model_version"] == "v2"
+    assert store.lookup("B") is None and store.stats()["rows"] == 1
+    assert store.stats()["lookups"] == 5 and store.stats()["misses"] == 2
+
+
+def test_sampling_profiler_writes_speedscope_and_hot_spots(tmp_path, monkeypatch):
+    import json
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from src.config import Config
+    from src.profiling import profile_requested, profile_stage
+
+    def spin(seconds):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+    @profile_stage("stage")
+    def stage():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(spin, 0.1).result()
+        spin(0.1)
+        return "done"
+
+    monkeypatch.setattr(Config, "PROFILE_DIR", str(tmp_path))
+    assert stage() == "done" and not list(tmp_path.iterdir())
+    monkeypatch.setattr(Config, "PROFILE_STAGES", True)
+    assert stage() == "done"
+
+    profile = json.loads(next(tmp_path.glob("stage-*.speedscope.json")).read_text())
+    assert len(profile["profiles"]) == 2  # the caller and the pool thread it started
+    names = {frame["name"].rsplit(".", 1)[-1] for frame in profile["shared"]["frames"]}
+    assert {"spin", "stage"} <= names
+    assert "<locals>.spin (" in next(tmp_path.glob("stage-*.hotspots.txt")).read_text().splitlines()[2]
+
+    monkeypatch.setattr(Config, "PROFILE_ADMIN_TOKEN", "token")
+    assert profile_requested("token") and not profile_requested("other") and not profile_requested(None)
+
+
+def test_early_stopping_truncates_boosters():
+    import numpy as np
+    from sklearn.datasets import make_classification
+    from sklearn.ensemble import AdaBoostClassifier, GradientBoostingClassifier
+    from sklearn.linear_model import LogisticRegression
+    from src.early_stopping import ValidationSplit, fit_model
+
+    X, y = make_classification(n_samples=600, n_features=8, flip_y=0.3, random_state=0)
+    split = ValidationSplit(X, y, fraction=0.25, random_state=0)
+
+    gb = GradientBoostingClassifier(n_estimators=300, learning_rate=0.5, random_state=0)
+    rounds = fit_model("Gradient Boosting", gb, X, y, split, patience=10)
+    assert 0 < rounds < 300 and len(gb.estimators_) == gb.n_estimators == rounds
+
+    ada = AdaBoostClassifier(n_estimators=100, random_state=0)
+    rounds = fit_model("AdaBoost", ada, X, y, split, patience=10)
+    assert len(ada.estimators_) == len(ada.estimator_weights_) == rounds <= 100
+    assert np.allclose(ada.predict_proba(X).sum(axis=1), 1.0)
+
+    assert fit_model("Logistic Regression", LogisticRegression(), X, y, split) is None
+    assert fit_model("AdaBoost", AdaBoostClassifier(n_estimators=5), X, y) is None
+
+
+def test_resource_benchmark_and_budgeted_champion(monkeypatch):
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from src.config import Config
+    from src.model_costs import FitMeter, measure_inference, select_champion, within_budget
+
+    X = np.random.default_rng(0).normal(size=(200, 5))
+    y = (X[:, 0] > 0).astype(int)
+    with FitMeter() as meter:
+        model = LogisticRegression().fit(X, y)
+    assert meter.cpu_time_s >= 0
+    costs = measure_inference(model, X, batch_rows=1000, repeats=3)
+    assert costs["latency_row_ms"] > 0 and costs["latency_batch_ms"] > 0 and 0 < costs["model_size_mb"] < 1
+
+    results = [
+        {"algorithm": "SVC (RBF)", "roc_auc": 0.85, "latency_row_ms": 5.0, "model_size_mb": 40.0},
+        {"algorithm": "Logistic Regression", "roc_auc": 0.84, "latency_row_ms": 0.1, "model_size_mb": 0.01},
+        {"algorithm": "KNN", "roc_auc": 0.84, "latency_row_ms": 0.3, "model_size_mb": 0.9},
+    ]
+    assert select_champion(results, budgets={})[0]["algorithm"] == "SVC (RBF)"
+    champion, selection = select_champion(results, budgets={"latency_row_ms": 1.0})
+    assert champion["algorithm"] == "Logistic Regression" and selection["eligible"] == ["Logistic Regression", "KNN"]
+    champion, selection = select_champion(results, budgets={"model_size_mb": 0.001})
+    assert champion["algorithm"] == "SVC (RBF)" and selection["fallback_to_best_auc"]
+
+    monkeypatch.setattr(Config, "CHAMPION_MAX_ROW_LATENCY_MS", 1.0)
+    assert not within_budget(results[0]) and within_budget({"latency_row_ms": None})
+
+
+def test_distillation_gates_the_student(monkeypatch, tmp_path):
+    import json
+    import numpy as np
+    from scipy import sparse
+    from sklearn.datasets import make_classification
+    from sklearn.ensemble import RandomForestClassifier
+    from src.config import Config
+    from src.distillation import distill, run_distillation, soft_label_set
+
+    monkeypatch.setattr(Config, "BENCHMARK_BATCH_ROWS", 500)
+    monkeypatch.setattr(Config, "BENCHMARK_LATENCY_REPEATS", 5)
+    X, y = make_classification(n_samples=800, n_features=8, random_state=0)
+    teacher = RandomForestClassifier(n_estimators=200, random_state=0).fit(X[:600], y[:600])
+
+    X_twice, labels, weights = soft_label_set(X[:3], [0.9, 0.2, 1.5])
+    assert X_twice.shape == (6, 8) and labels.tolist() == [1, 1, 1, 0, 0, 0]
+    assert np.allclose(weights, [0.9, 0.2, 1.0, 0.1, 0.8, 0.0])
+
+    report_path = tmp_path / "distillation.json"
+    student, report = run_distillation("Random Forest", teacher, X[:600], X[600:], y[600:],
+                                       tolerance=0.05, report_path=str(report_path))
+    assert student is not None and report["serving_model"] == "Distilled GBM"
+    assert report["student"]["best_iteration"] == student.n_iter_
+    assert report["speedup_row"] > 1 and report["fidelity_corr"] > 0.8
+    assert json.loads(report_path.read_text())["student"]["roc_auc"] == report["student"]["roc_auc"]
+
+    student, report = run_distillation("Random Forest", teacher, X[:600], X[600:], y[600:], student="logistic",
+                                       tolerance=-1.0, report_path=str(report_path))
+    assert student is None and report["serving_model"] == "Random Forest"
+    assert report["student"]["best_iteration"] is None
+
+    # HistGradientBoosting cannot take sparse rows: the logistic student is used instead
+    assert distill(teacher, sparse.csr_matrix(X[:600]), "gbm")[0] == "Distilled Logistic Regression"
+
+
+def test_segment_cube_moves_rescored_customers(tmp_path):
+    import numpy as np
+    import pandas as pd
+    import pytest
+    from features.feature_engineering import engineer_enterprise_features
+    from src.segment_cube import SegmentCube
+    from src.serving import prediction_frame, score_chunks
+
+    df = engineer_enterprise_features(pd.DataFrame({
+        "customerID": ["a", "b", "c", "d"],
+        "Contract": ["Month-to-month", "Month-to-month", "Two year", "Month-to-month"],
+        "PaymentMethod": ["Electronic check", "Mailed check", "Electronic check", "Electronic check"],
+        "InternetService": ["Fiber optic", "DSL", "No", "Fiber optic"],
+        "tenure": [2, 30, 70, 0], "MonthlyCharges": [90.0, 50.0, 20.0, 80.0], "TotalCharges": [180, 1500, 1400, 0],
+    }))
+    cube = SegmentCube()
+    probs = {"a": 0.9, "b": 0.3, "c": 0.1, "d": 0.5}
+    chunks = list(cube.track(score_chunks(df, lambda part: part["customerID"].map(probs).to_numpy(), chunk_rows=2), df))
+    assert len(chunks) == 2 and cube.stats()["customers"] == 4
+
+    result = cube.query(["contract"], payment_method="ELECTRONIC CHECK")
+    assert result["total"] == {"customers": 3, "average_probability": 50.0, "high_risk_count": 1,
+                               "high_risk_rate": 33.33}
+    assert [s["contract"] for s in result["segments"]] == ["Month-to-month", "Two year"]
+    segments = cube.query(["tenure_bin"], contract="month-to-month")["segments"]
+    assert [s["tenure_bin"] for s in segments] == ["New", "Unknown", "Middle"]  # tenure 0 has no bin
+
+    # Customer 'a' is scored again on a new contract: it moves, nobody is counted twice
+    moved = df.iloc[[0]].assign(Contract="One year")
+    cube.update(moved, prediction_frame(moved, [0.2]))
+    by_contract = {s["contract"]: s for s in cube.query(["contract"])["segments"]}
+    assert cube.query()["total"]["customers"] == 4 and by_contract["One year"]["customers"] == 1
+    assert by_contract["Month-to-month"]["customers"] == 2 and cube.query()["total"]["high_risk_count"] == 0
+
+    snapshot = SegmentCube(str(tmp_path / "cube.parquet"))
+    cube.save(snapshot.path, model_version="production")
+    assert snapshot.refresh() and not snapshot.refresh()
+    assert snapshot.query(["contract"]) == {**cube.query(["contract"]), "source": snapshot.meta}
+    snapshot.update(moved, prediction_frame(moved, [0.95]))
+    assert snapshot.query()["total"]["high_risk_count"] == 1 and snapshot.meta["model_version"] == "production"
+    with pytest.raises(ValueError):
+        cube.query(["region"])
+
+    # Full cube: rescored customers still move, new ones are counted as dropped
+    extra = df.iloc[[0, 1]].assign(customerID=["a", "e"])
+    snapshot.update(extra, prediction_frame(extra, [0.1, 0.5]), max_customers=4)
+    assert snapshot.stats()["customers"] == 4 and snapshot.stats()["rows_dropped"] == 1
+    assert snapshot.query()["total"]["high_risk_count"] == 0
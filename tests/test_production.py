@@ -2,7 +2,6 @@ import pytest
 import pandas as pd
 import numpy as np
 import os
-import joblib
 import sys
 
 # Ensure project root is in path
@@ -11,6 +10,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from features.feature_engineering import engineer_enterprise_features
 from training_pipeline import run_production_training
 from src.config import Config
+from src.bundle_io import load_bundle
 
 def test_feature_engineering_robustness():
     # Create sample data with potential issues
@@ -39,18 +39,48 @@ def test_feature_engineering_robustness():
     assert not df_eng['TotalCharges'].isna().any()
     assert df_eng.loc[1, 'TotalCharges'] == 0 # 0 * 20.0
 
-def test_pipeline_training():
+def test_category_code_encoder_matches_one_hot():
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+    from preprocessing_pipeline import CategoryCodeEncoder
+
+    train = pd.DataFrame({
+        'Contract': ['Month-to-month', 'One year', 'Two year', None],
+        'SeniorCitizen': [0, 1, 0, 1]
+    })
+    test = pd.DataFrame({
+        'Contract': ['Two year', 'Unseen plan', None, 'One year'],
+        'SeniorCitizen': [1, 0, 1, 0]
+    })
+    reference = Pipeline([
+        ('impute', SimpleImputer(strategy='constant', fill_value='missing')),
+        ('ohe', OneHotEncoder(handle_unknown='ignore', drop='first'))
+    ]).fit(train)
+
+    for frame in (test, test.astype({'Contract': 'category'})):
+        encoder = CategoryCodeEncoder().fit(train.astype({'Contract': 'category'}))
+        expected = reference.transform(test).toarray()
+        assert np.array_equal(encoder.transform(frame).toarray(), expected)
+
+def test_pipeline_training(tmp_path, monkeypatch):
     # Only run if raw data exists
     if not os.path.exists(Config.RAW_DATA_PATH):
         pytest.skip("Raw data not found")
-        
+
+    # Keep the trained bundle out of models/: the registry would serve it over the shipped one
+    monkeypatch.setattr(Config, "MODELS_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(Config, "PRODUCTION_BUNDLE_PATH", str(tmp_path / "models" / "production_bundle"))
+    monkeypatch.setattr(Config, "MODEL_REGISTRY_DIR", str(tmp_path / "models" / "registry"))
+    monkeypatch.setattr(Config, "BENCHMARK_REPORT_PATH", str(tmp_path / "benchmark.csv"))
+
     pipeline, bundle_path = run_production_training()
     
     assert pipeline is not None
     assert os.path.exists(bundle_path)
     
     # Load and check
-    payload = joblib.load(bundle_path)
+    payload = load_bundle(bundle_path)
     assert 'pipeline' in payload
     assert 'auc_score' in payload
 
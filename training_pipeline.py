@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
-import joblib
 import os
 import logging
+import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import roc_auc_score, accuracy_score, f1_score
@@ -12,20 +13,22 @@ from scipy.stats import ks_2samp
 from features.feature_engineering import engineer_enterprise_features
 from preprocessing_pipeline import get_preprocessing_pipeline
 from src.config import Config
+from src.bundle_io import save_bundle
+from src.data_loader import load_data
 from src.models_factory import get_algorithm_suite
-
-# Setup Logging
-os.makedirs(Config.REPORTS_DIR, exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s | %(levelname)s | %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(Config.REPORTS_DIR, "training.log")),
-        logging.StreamHandler()
-    ]
+from src.early_stopping import ValidationSplit, fit_model
+from src.distillation import run_distillation
+from src.model_costs import (
+    RESOURCE_COLUMNS, FitMeter, active_budgets, measure_inference, predict_scores, select_champion, within_budget
 )
+from src.cpu_budget import configure_threads
+from src.logging_config import configure_logging
+from src.profiling import profile_stage
+
+# Logging is configured by the entry point (below, or the importing one), not on import
 logger = logging.getLogger("UNIFIED-TRAINER")
 
+@profile_stage("training")
 def run_production_training():
     """
     1. Ingest Data
@@ -41,9 +44,8 @@ def run_production_training():
         logger.error(f"🛑 Raw data missing at {Config.RAW_DATA_PATH}")
         return None, None
 
-    # 1. Ingest
-    df_raw = pd.read_csv(Config.RAW_DATA_PATH)
-    df_raw['TotalCharges'] = pd.to_numeric(df_raw['TotalCharges'], errors='coerce')
+    # 1. Ingest (categorical / downcast dtypes, see src/data_loader.py)
+    df_raw = load_data(Config.RAW_DATA_PATH)
     
     # 2. Split FIRST (Zero Leakage)
     train_df, test_df = train_test_split(
@@ -56,16 +58,16 @@ def run_production_training():
     test_eng = engineer_enterprise_features(test_df)
     
     # Define Features
-    num_features = ['tenure', 'MonthlyCharges', 'TotalCharges', 'clv_proxy', 'price_sensitivity', 'service_count']
-    cat_features = ['gender', 'SeniorCitizen', 'Partner', 'Dependents', 'Contract', 'PaymentMethod', 'tenure_bin']
+    num_features = Config.NUM_FEATURES
+    cat_features = Config.CAT_FEATURES
     
     # 4. Preprocessing Pipeline
     preprocessor = get_preprocessing_pipeline(num_features, cat_features)
     
     X_train = train_eng.drop('Churn', axis=1)
-    y_train = train_eng['Churn'].map({'Yes': 1, 'No': 0})
+    y_train = (train_eng['Churn'] == 'Yes').astype(int)
     X_test = test_eng.drop('Churn', axis=1)
-    y_test = test_eng['Churn'].map({'Yes': 1, 'No': 0})
+    y_test = (test_eng['Churn'] == 'Yes').astype(int)
 
     # Prepare data for benchmarking (Sklearn models need numerical input)
     # We use the preprocessor to transform data once for benchmarking
@@ -74,52 +76,77 @@ def run_production_training():
     X_test_proc = preprocessor.transform(X_test)
     
     # 5. Benchmark 20 Algorithms
-    logger.info("🚀 Starting Benchmark of 20 Algorithms...")
-    suite = get_algorithm_suite(Config.RANDOM_STATE)
-    benchmark_results = []
-    
-    best_auc = 0
-    champion_model = None
-    champion_name = ""
+    # Cores are split between the models fitted at once; each model's n_jobs / thread_count
+    # and the BLAS pools get their share so concurrent fits do not oversubscribe the CPU
+    parallel = max(1, Config.BENCHMARK_PARALLEL_MODELS)
+    n_threads = configure_threads("training", parallel_tasks=parallel)
+    logger.info(f"🚀 Starting Benchmark of 20 Algorithms ({parallel} in parallel, {n_threads} thread(s) each)...")
+    suite = get_algorithm_suite(Config.RANDOM_STATE, n_jobs=n_threads)
+    # Boosters stop on the AUC of a validation split carved from the training partition
+    split = ValidationSplit(X_train_proc, y_train) if Config.EARLY_STOPPING else None
+    if split is not None:
+        logger.info(f"⏱️ Early stopping on {split.fraction:.0%} of the training set "
+                    f"(patience {Config.EARLY_STOPPING_ROUNDS} rounds)")
 
-    for name, model in suite.items():
+    def benchmark(name, model):
         start = time.time()
         try:
-            model.fit(X_train_proc, y_train)
-            
-            if hasattr(model, "predict_proba"):
-                probs = model.predict_proba(X_test_proc)[:, 1]
-            else:
-                probs = model.predict(X_test_proc)
-                
+            with FitMeter(concurrent=parallel > 1) as meter:
+                best_iteration = fit_model(name, model, X_train_proc, y_train, split)
+            probs = predict_scores(model, X_test_proc)
+
             auc = roc_auc_score(y_test, probs)
             acc = accuracy_score(y_test, (probs > 0.5).astype(int))
             elapsed = time.time() - start
-            
-            benchmark_results.append({
+            rounds = f" | Rounds: {best_iteration}" if best_iteration is not None else ""
+            logger.info(f"✅ {name:25} | AUC: {auc:.4f} | Time: {elapsed:.2f}s{rounds}")
+            return {
                 "algorithm": name,
                 "roc_auc": float(auc),
                 "accuracy": float(acc),
-                "training_time": float(elapsed)
-            })
-            
-            logger.info(f"✅ {name:25} | AUC: {auc:.4f} | Time: {elapsed:.2f}s")
-            
-            if auc > best_auc:
-                best_auc = auc
-                champion_model = model
-                champion_name = name
-                
+                "training_time": float(elapsed),
+                "best_iteration": best_iteration,
+                "cpu_time_s": round(meter.cpu_time_s, 3),
+                "peak_train_rss_mb": meter.peak_train_rss_mb
+            }
         except Exception as e:
             logger.error(f"❌ {name} failed: {str(e)}")
+            return None
+
+    if parallel > 1:
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            outcomes = list(pool.map(lambda item: benchmark(*item), suite.items()))
+    else:
+        outcomes = [benchmark(name, model) for name, model in suite.items()]
 
-    # Save Results
+    benchmark_results = [result for result in outcomes if result is not None]
+    # Serving costs are measured one model at a time after every fit, so parallel fits never skew them
+    budgets = active_budgets()
+    for result in benchmark_results:
+        try:
+            result.update(measure_inference(suite[result["algorithm"]], X_test_proc))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not measure serving costs of {result['algorithm']}: {e}")
+        result["within_budget"] = within_budget(result, budgets)
+
+    # Best AUC within the latency / memory budgets; walks the suite order, so parallel runs pick the same winner
+    champion, selection = select_champion(benchmark_results, budgets)
+    best_auc = champion["roc_auc"]
+    champion_model = suite[champion["algorithm"]]
+    champion_name = champion["algorithm"]
+    champion_iteration = champion["best_iteration"]
+    for result in benchmark_results:
+        result["is_champion"] = result is champion
+
+    # Save Results (best_iteration: boosting rounds kept by early stopping, empty otherwise)
     results_df = pd.DataFrame(benchmark_results).sort_values(by="roc_auc", ascending=False)
+    results_df["best_iteration"] = results_df["best_iteration"].astype("Int64")
     results_df.to_csv(Config.BENCHMARK_REPORT_PATH, index=False)
     logger.info(f"📊 Benchmark Report Saved to {Config.BENCHMARK_REPORT_PATH}")
 
     # 6. Serializing Champion Bundle
-    logger.info(f"🏆 CHAMPION IDENTIFIED: {champion_name} (AUC: {best_auc:.4f})")
+    logger.info(f"🏆 CHAMPION IDENTIFIED: {champion_name} (AUC: {best_auc:.4f}, "
+                f"{champion.get('latency_row_ms')} ms/row, {champion.get('model_size_mb')} MB)")
     
     # Re-wrap the best model into a full Pipeline for production
     # This ensures deployment only needs raw data
@@ -128,31 +155,84 @@ def run_production_training():
         ('clf', champion_model)
     ])
     
-    # Calculate KS Stat for the champion
+    # Optional distillation: a compact student fitted on the champion's probabilities serves
+    # instead when its AUC is within tolerance; the champion stays in the registry as the teacher
+    distillation = None
+    serving_name, serving_auc = champion_name, best_auc
+    serving_iteration, serving_costs = champion_iteration, champion
+    teacher_path = os.path.join(Config.MODEL_REGISTRY_DIR, Config.DISTILLATION_TEACHER_VERSION)
+    student = None
+    if Config.DISTILLATION:
+        student, distillation = run_distillation(champion_name, champion_model, X_train_proc, X_test_proc, y_test)
+    if student is not None:
+        os.makedirs(Config.MODEL_REGISTRY_DIR, exist_ok=True)
+        save_bundle(teacher_path, {'pipeline': production_pipeline, 'auc_score': float(best_auc),
+                                   'metadata': {'auc_score': float(best_auc), 'engine': champion_name,
+                                                'last_updated': time.strftime("%Y-%m-%d")}})
+        production_pipeline = Pipeline([('prep', preprocessor), ('clf', student)])
+        serving_name = f"{distillation['student']['algorithm']} (distilled from {champion_name})"
+        serving_auc = distillation['student']['roc_auc']
+        serving_iteration, serving_costs = distillation['student']['best_iteration'], distillation['student']
+        logger.info(f"🎓 Serving the distilled student; {champion_name} kept as registry version "
+                    f"'{Config.DISTILLATION_TEACHER_VERSION}'")
+    elif os.path.isdir(teacher_path):
+        # The champion serves itself: a teacher left by an earlier distilled run must not stay routable
+        shutil.rmtree(teacher_path)
+        logger.info(f"🧹 Removed the stale '{Config.DISTILLATION_TEACHER_VERSION}' registry version")
+
+    # Calculate KS Stat for the serving model
     champion_probs = production_pipeline.predict_proba(X_test)[:, 1]
     ks_stat, _ = ks_2samp(champion_probs[y_test == 1], champion_probs[y_test == 0])
 
     bundle = {
         'pipeline': production_pipeline,
-        'auc_score': float(best_auc),
+        'auc_score': float(serving_auc),
         'ks_stat': float(ks_stat),
         'metadata': {
-            'auc_score': float(best_auc),
+            'auc_score': float(serving_auc),
             'ks_stat': float(ks_stat),
-            'engine': champion_name,
+            'engine': serving_name,
             'version': "2.5.0",
             'last_updated': time.strftime("%Y-%m-%d"),
-            'features': X_train.columns.tolist()
+            'features': X_train.columns.tolist(),
+            'best_iteration': serving_iteration,
+            'resources': {column: serving_costs.get(column) for column in RESOURCE_COLUMNS},
+            'selection': selection,
+            'distillation': distillation,
+            'early_stopping': {'validation_fraction': split.fraction,
+                               'patience': Config.EARLY_STOPPING_ROUNDS} if split is not None else None
         }
     }
     
     os.makedirs(Config.MODELS_DIR, exist_ok=True)
-    bundle_path = os.path.join(Config.MODELS_DIR, "production_pipeline_bundle.joblib")
-    joblib.dump(bundle, bundle_path)
+    bundle_path = save_bundle(Config.PRODUCTION_BUNDLE_PATH, bundle)
     
     logger.info(f"⛳️ Production Bundle Serialized: {bundle_path}")
     logger.info("✨ Unified Training Pipeline Complete.")
     return production_pipeline, bundle_path
 
 if __name__ == "__main__":
-    run_production_training()
+    import argparse
+    parser = argparse.ArgumentParser(description="Unified production training")
+    parser.add_argument("--out-of-core", action="store_true", help="Stream the dataset in chunks (larger-than-memory data)")
+    parser.add_argument("--data", default=Config.RAW_DATA_PATH, help="CSV or Parquet dataset for --out-of-core")
+    parser.add_argument("--chunksize", type=int, default=Config.OOC_CHUNK_SIZE)
+    parser.add_argument("--profile", action="store_true", help="Profile the run (outputs/reports/profiles)")
+    parser.add_argument("--early-stopping", action="store_true",
+                        help="Stop boosted models when validation AUC plateaus")
+    parser.add_argument("--distill", action="store_true",
+                        help="Distill the champion into a compact student that serves if its AUC is within tolerance")
+    args = parser.parse_args()
+    configure_logging(Config.TRAINING_LOG_PATH)
+    if args.early_stopping:
+        Config.EARLY_STOPPING = True
+    if args.distill:
+        Config.DISTILLATION = True
+    if args.profile:
+        Config.PROFILE_STAGES = True
+
+    if args.out_of_core:
+        from src.incremental_training import run_out_of_core_training
+        run_out_of_core_training(args.data, args.chunksize)
+    else:
+        run_production_training()